@@ -1,11 +1,13 @@
 """
 API dependencies for authentication and common functionality
 """
-from fastapi import Depends, HTTPException, status
+from email.utils import format_datetime
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.services.auth_service import AuthService
+from app.services.versao_service import VersaoService, nao_modificado
 from app.models.funcionario import TblFuncionarios
 
 security = HTTPBearer()
@@ -18,4 +20,35 @@ async def get_current_user(
     Dependency para obter usuário autenticado em rotas protegidas
     """
     auth_service = AuthService(db)
-    return auth_service.get_current_user(credentials.credentials)
\ No newline at end of file
+    return auth_service.get_current_user(credentials.credentials)
+
+
+def versionado(*modelos):
+    """
+    Dependency de requisições condicionais para as leituras de um router.
+
+    Em GET, calcula o ETag/Last-Modified a partir das versões das tabelas dos
+    modelos e responde 304 sem executar a rota quando a cópia do cliente
+    ainda vale. Outros métodos passam direto.
+    """
+    tabelas = tuple(modelo.__tablename__ for modelo in modelos)
+
+    async def verificar(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        current_user: TblFuncionarios = Depends(get_current_user)
+    ) -> None:
+        if request.method not in ("GET", "HEAD"):
+            return
+        etag, ultima_alteracao = VersaoService(db).validadores(tabelas)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(ultima_alteracao, usegmt=True),
+            "Cache-Control": "private, no-cache",
+        }
+        if nao_modificado(etag, ultima_alteracao, request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return verificar
@@ -0,0 +1,47 @@
+"""
+Rotas do agendador de tarefas
+"""
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.api.dependencies import get_current_user
+from app.models.funcionario import TblFuncionarios
+from app.schemas.agendador import TarefaAgendadaResponse
+from app.services.agendador_service import agendador
+
+router = APIRouter(prefix="/agendador", tags=["agendador"])
+
+
+@router.get("/tarefas", response_model=List[TarefaAgendadaResponse], summary="Situação das tarefas agendadas")
+async def listar_tarefas(
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Retorna a última execução, duração e próxima execução prevista de cada tarefa
+    """
+    return agendador.listar(db)
+
+
+@router.post("/tarefas/{nome}/executar", response_model=TarefaAgendadaResponse, summary="Executar tarefa agora")
+async def executar_tarefa(
+    nome: str,
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Executa a tarefa imediatamente, se nenhum outro processo estiver executando
+    """
+    if nome not in agendador.tarefas:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tarefa não encontrada"
+        )
+
+    resultado = agendador.executar(nome, forcar=True)
+    if resultado is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Tarefa em execução por outro processo"
+        )
+    return resultado
@@ -1,28 +1,31 @@
 """
 Rotas de autenticação
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.services.auth_service import AuthService
 from app.schemas.auth import LoginRequest, LoginResponse, UserInfo
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, security
 from app.models.funcionario import TblFuncionarios
 
 router = APIRouter(prefix="/auth", tags=["autenticação"])
 
 @router.post("/login", response_model=LoginResponse, summary="Login de usuário")
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, request: Request, db: Session = Depends(get_db)):
     """
     Endpoint de login usando credenciais da tabela tbl_Funcionarios
     
     - **login**: Login do funcionário
     - **senha**: Senha do funcionário (ou senha master)
     
-    Retorna token JWT e informações do usuário autenticado.
+    Retorna token JWT e informações do usuário autenticado. Após seguidas
+    falhas de senha para o mesmo login, novas tentativas recebem 429.
     """
     auth_service = AuthService(db)
-    return await auth_service.authenticate_user(login_data)
+    client_ip = request.client.host if request.client else "desconhecido"
+    return await auth_service.authenticate_user(login_data, client_ip)
 
 @router.get("/me", response_model=UserInfo, summary="Informações do usuário logado")
 async def get_current_user_info(
@@ -42,11 +45,15 @@ async def get_current_user_info(
     )
 
 @router.post("/logout", summary="Logout do usuário")
-async def logout(current_user: TblFuncionarios = Depends(get_current_user)):
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: TblFuncionarios = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
-    Endpoint de logout (em uma implementação completa, o token seria 
-    adicionado a uma blacklist usando Redis)
+    Endpoint de logout: o token é revogado até o seu vencimento
     """
+    AuthService(db).logout(credentials.credentials)
     return {
         "message": f"Logout realizado com sucesso para o usuário {current_user.Login}",
         "status": "success"
@@ -0,0 +1,28 @@
+"""
+Rotas de autocomplete para os seletores do frontend
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Literal
+from app.core.database import get_db
+from app.api.dependencies import get_current_user
+from app.models.funcionario import TblFuncionarios
+from app.schemas.autocomplete import AutocompleteItem
+from app.services.autocomplete_service import AutocompleteService
+
+router = APIRouter(prefix="/autocomplete", tags=["autocomplete"])
+
+
+@router.get("/{entity}", response_model=List[AutocompleteItem], summary="Sugestões de autocomplete")
+async def autocomplete(
+    entity: Literal["favorecidos", "clientes", "categorias"],
+    q: str = Query(..., min_length=1, max_length=100, description="Prefixo digitado"),
+    limit: int = Query(10, ge=1, le=50, description="Limite de sugestões"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Retorna id e label dos registros cujo nome começa com o prefixo informado
+    """
+    service = AutocompleteService(db)
+    return service.search(entity, q, limit)
@@ -5,12 +5,13 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, versionado
 from app.models.funcionario import TblFuncionarios
+from app.models import Banco
 from app.schemas.banco import BancoCreate, BancoUpdate, BancoResponse
 from app.services.banco_service import BancoService
 
-router = APIRouter(prefix="/bancos", tags=["bancos"])
+router = APIRouter(prefix="/bancos", tags=["bancos"], dependencies=[Depends(versionado(Banco))])
 
 
 @router.get("/", response_model=List[BancoResponse], summary="Listar bancos")
@@ -5,12 +5,13 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, versionado
 from app.models.funcionario import TblFuncionarios
+from app.models import Categoria
 from app.schemas.categoria import CategoriaCreate, CategoriaUpdate, CategoriaResponse
 from app.services.categoria_service import CategoriaService
 
-router = APIRouter(prefix="/categorias", tags=["categorias"])
+router = APIRouter(prefix="/categorias", tags=["categorias"], dependencies=[Depends(versionado(Categoria))])
 
 @router.get("/", response_model=List[CategoriaResponse], summary="Listar categorias")
 async def listar_categorias(
@@ -0,0 +1,47 @@
+"""
+Rotas de conciliação bancária
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.api.dependencies import get_current_user
+from app.models.funcionario import TblFuncionarios
+from app.schemas.conciliacao import ConciliacaoRequest, ConciliacaoResponse, ConciliacaoConfirmarRequest
+from app.services.conciliacao_service import ConciliacaoService
+
+router = APIRouter(prefix="/conciliacao", tags=["conciliacao"])
+
+
+@router.post("/executar", response_model=ConciliacaoResponse, summary="Conciliar extratos com lançamentos")
+async def executar_conciliacao(
+    request: ConciliacaoRequest,
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Associa as linhas de extrato pendentes aos lançamentos em aberto do período
+    """
+    service = ConciliacaoService(db)
+    return service.conciliar(
+        request.data_inicio,
+        request.data_fim,
+        current_user,
+        conta_id=request.id_conta,
+        tolerancia_dias=request.tolerancia_dias,
+        score_auto=request.score_auto,
+        auto_confirmar=request.auto_confirmar
+    )
+
+
+@router.post("/confirmar", summary="Confirmar pares propostos")
+async def confirmar_conciliacao(
+    request: ConciliacaoConfirmarRequest,
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Confirma os pares propostos e os lançamentos correspondentes
+    """
+    service = ConciliacaoService(db)
+    total = service.confirmar(request.ids, current_user)
+    return {"message": f"{total} conciliações confirmadas", "confirmados": total}
@@ -3,14 +3,25 @@ Routes for Conta (Bank Account) module
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date
+from decimal import Decimal
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, versionado
 from app.models.funcionario import TblFuncionarios
-from app.schemas.conta import ContaCreate, ContaUpdate, ContaResponse
+from app.models import Conta, Banco, Empresa, Lancamento, SaldoDia
+from app.schemas.conta import ContaCreate, ContaUpdate, ContaResponse, SaldoContaResponse, SaldoHistoricoResponse
 from app.services.conta_service import ContaService
+from app.services.saldo_service import SaldoService
 
-router = APIRouter(prefix="/contas", tags=["contas"])
+router = APIRouter(
+    prefix="/contas",
+    tags=["contas"],
+    # ETag das leituras: muda quando alguma destas tabelas é alterada
+    dependencies=[Depends(versionado(
+        Conta, Banco, Empresa, Lancamento, SaldoDia
+    ))]
+)
 
 
 @router.get("/", response_model=List[ContaResponse], summary="Listar contas")
@@ -98,4 +109,50 @@ async def excluir_conta(
     """
     service = ContaService(db)
     service.delete_conta(conta_id, current_user)
-    return {"message": f"Conta {conta_id} excluída com sucesso"}
\ No newline at end of file
+    return {"message": f"Conta {conta_id} excluída com sucesso"}
+
+
+@router.get("/{conta_id}/saldo", response_model=SaldoContaResponse, summary="Saldo da conta em uma data")
+async def obter_saldo_conta(
+    conta_id: int,
+    data: Optional[date] = Query(None, description="Data de referência (padrão: hoje)"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Obtém o saldo da conta ao final da data informada a partir dos snapshots diários
+    """
+    ContaService(db).get_conta_by_id(conta_id)
+    data = data or date.today()
+    saldo = SaldoService(db).get_saldo(conta_id, data)
+    return {"idConta": conta_id, "data": data, "saldo": saldo}
+
+
+@router.get("/{conta_id}/saldo/historico", response_model=SaldoHistoricoResponse, summary="Histórico de saldos da conta")
+async def obter_historico_saldo(
+    conta_id: int,
+    data_inicio: date = Query(..., description="Data inicial"),
+    data_fim: date = Query(..., description="Data final"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Obtém a evolução do saldo da conta no período (dias com movimento)
+    """
+    ContaService(db).get_conta_by_id(conta_id)
+    return SaldoService(db).get_historico(conta_id, data_inicio, data_fim)
+
+
+@router.post("/{conta_id}/saldo/recalcular", response_model=SaldoContaResponse, summary="Recalcular saldos da conta")
+async def recalcular_saldo_conta(
+    conta_id: int,
+    saldo_abertura: Decimal = Query(Decimal("0"), description="Saldo de abertura anterior ao primeiro lançamento"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Reconstrói os snapshots diários a partir dos lançamentos confirmados
+    """
+    ContaService(db).get_conta_by_id(conta_id)
+    saldo = SaldoService(db).rebuild(conta_id, saldo_abertura)
+    return {"idConta": conta_id, "data": date.today(), "saldo": saldo}
@@ -16,6 +16,7 @@ from app.schemas.conta_pagar import (
     AccountsPayablePaymentUpdate,
     AccountsPayablePaymentResponse
 )
+from app.schemas.baixa_lote import BaixaLoteRequest, BaixaLoteResponse
 from app.services.conta_pagar_service import ContaPagarService
 
 router = APIRouter(prefix="/contas-pagar", tags=["contas a pagar"])
@@ -77,6 +78,18 @@ async def listar_contas_pagar(
     )
     return [map_accounts_payable_to_response(conta) for conta in contas]
 
+@router.post("/pagar-lote", response_model=BaixaLoteResponse, summary="Registrar pagamentos em lote")
+async def pagar_lote(
+    lote: BaixaLoteRequest,
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Registra os pagamentos de vários títulos em uma única transação e retorna o resultado de cada item
+    """
+    service = ContaPagarService(db)
+    return service.pay_lote(lote, current_user)
+
 @router.get("/{conta_pagar_id}", response_model=AccountsPayableResponse, summary="Obter conta a pagar por ID")
 async def obter_conta_pagar(
     conta_pagar_id: int,
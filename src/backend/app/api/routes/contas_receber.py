@@ -16,6 +16,7 @@ from app.schemas.conta_receber import (
     AccountsReceivablePaymentUpdate,
     AccountsReceivablePaymentResponse
 )
+from app.schemas.baixa_lote import BaixaLoteRequest, BaixaLoteResponse
 from app.services.conta_receber_service import ContaReceberService
 
 router = APIRouter(prefix="/contas-receber", tags=["contas a receber"])
@@ -47,6 +48,19 @@ async def listar_contas_receber(
     )
     return [AccountsReceivableResponse.model_validate(conta) for conta in contas]
 
+@router.post("/receber-lote", response_model=BaixaLoteResponse, summary="Registrar recebimentos em lote")
+async def receber_lote(
+    lote: BaixaLoteRequest,
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Registra os recebimentos de vários títulos (ex.: retorno CNAB) em uma única transação,
+    com multa, juros, desconto e recebimentos parciais, e retorna o resultado de cada item
+    """
+    service = ContaReceberService(db)
+    return service.receive_lote(lote, current_user)
+
 @router.get("/{conta_receber_id}", response_model=AccountsReceivableResponse, summary="Obter conta a receber por ID")
 async def obter_conta_receber(
     conta_receber_id: int,
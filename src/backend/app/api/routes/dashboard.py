@@ -3,18 +3,32 @@ Rotas para dashboard e relatórios
 """
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Literal, Optional
+from datetime import date
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, versionado
 from app.models.funcionario import TblFuncionarios
+from app.models import (
+    Lancamento, AccountsPayable, AccountsPayablePayment, AccountsReceivable, AccountsReceivablePayment,
+    Favorecido, Cliente, Categoria, Empresa, Conta, PeriodoFechado, FechamentoTotal
+)
 from app.services.dashboard_service import DashboardService
 
-router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["dashboard"],
+    # ETag das leituras: muda quando alguma destas tabelas é alterada
+    dependencies=[Depends(versionado(
+        Lancamento, AccountsPayable, AccountsPayablePayment, AccountsReceivable,
+        AccountsReceivablePayment, Favorecido, Cliente, Categoria, Empresa, Conta,
+        PeriodoFechado, FechamentoTotal
+    ))]
+)
 
 
 
 @router.get("/resumo", summary="Resumo financeiro")
-async def resumo_financeiro(
+def resumo_financeiro(
     empresa_id: Optional[int] = Query(None, description="Filtrar por empresa"),
     db: Session = Depends(get_db),
     current_user: TblFuncionarios = Depends(get_current_user)
@@ -22,6 +36,7 @@ async def resumo_financeiro(
     """
     Retorna resumo financeiro com indicadores principais
     """
+    # Rota síncrona: roda no threadpool, onde aberturas simultâneas são coalescidas
     service = DashboardService(db)
     return service.get_financial_summary(empresa_id)
 
@@ -38,6 +53,23 @@ async def fluxo_caixa(
     service = DashboardService(db)
     return service.get_cash_flow(months, empresa_id)
 
+@router.get("/fluxo-caixa/previsao", summary="Previsão de fluxo de caixa")
+async def previsao_fluxo_caixa(
+    meses: int = Query(12, ge=1, le=24, description="Meses à frente"),
+    meses_historico: int = Query(3, ge=0, le=24, description="Meses de histórico realizado"),
+    granularidade: Literal["diario", "semanal", "mensal"] = Query("mensal", description="Agrupamento dos períodos"),
+    empresa_id: Optional[int] = Query(None, description="Filtrar por empresa"),
+    conta_id: Optional[int] = Query(None, description="Filtrar por conta"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Retorna realizado e previsto (lançamentos, contas a pagar/receber e recorrências) por conta e período,
+    com o saldo projetado ao fim de cada período
+    """
+    service = DashboardService(db)
+    return service.get_cash_flow_forecast(meses, meses_historico, granularidade, empresa_id, conta_id)
+
 @router.get("/categorias", summary="Resumo por categorias")
 async def resumo_categorias(
     tipo: str = Query("E", description="Tipo: E=Receitas, S=Despesas"),
@@ -65,6 +97,22 @@ async def resumo_vencimentos(
     service = DashboardService(db)
     return service.get_overdue_summary(empresa_id)
 
+@router.get("/aging", summary="Aging de contas a pagar/receber")
+async def aging_contas(
+    tipo: Literal["receber", "pagar"] = Query("receber", description="Contas a receber ou a pagar"),
+    agrupar_por: Literal["cliente", "empresa"] = Query("cliente", description="Agrupar por cliente/fornecedor ou empresa"),
+    empresa_id: Optional[int] = Query(None, description="Filtrar por empresa"),
+    data_base: Optional[date] = Query(None, description="Data de referência (padrão: hoje)"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Retorna valores e quantidades em aberto por faixa de atraso (a vencer, 1-30, 31-60, 61-90, 90+)
+    """
+    service = DashboardService(db)
+    account_type = 'payable' if tipo == 'pagar' else 'receivable'
+    return service.get_aging_report(account_type, agrupar_por, empresa_id, data_base)
+
 @router.get("/favorecidos", summary="Top favorecidos")
 async def top_favorecidos(
     tipo: str = Query("S", description="Tipo: E=Receitas, S=Despesas"),
@@ -0,0 +1,44 @@
+"""
+Rotas do índice de documentos (CPF/CNPJ)
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from app.core.database import get_db
+from app.api.dependencies import get_current_user
+from app.models.funcionario import TblFuncionarios
+from app.schemas.documento import DocumentoLookup, DocumentoDuplicado
+from app.services.documento_service import DocumentoIndexService, normalize_documento
+
+router = APIRouter(prefix="/documentos", tags=["documentos"])
+
+
+@router.get("/buscar", response_model=DocumentoLookup, summary="Buscar registros por CPF/CNPJ")
+async def buscar_documento(
+    entidade: Literal["favorecido", "cliente", "empresa"],
+    documento: str = Query(..., min_length=1, max_length=18, description="CPF/CNPJ com ou sem máscara"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Retorna os códigos dos registros com o documento informado
+    """
+    service = DocumentoIndexService(db)
+    return {
+        "entidade": entidade,
+        "documento": normalize_documento(documento) or "",
+        "codigos": service.lookup(entidade, documento)
+    }
+
+
+@router.get("/duplicados", response_model=List[DocumentoDuplicado], summary="Relatório de documentos duplicados")
+async def listar_duplicados(
+    entidade: Optional[Literal["favorecido", "cliente", "empresa"]] = None,
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Lista os documentos cadastrados em mais de um registro
+    """
+    service = DocumentoIndexService(db)
+    return service.duplicate_report(entidade)
@@ -0,0 +1,38 @@
+"""
+Rotas da DRE (demonstração do resultado)
+"""
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.api.dependencies import get_current_user
+from app.models.funcionario import TblFuncionarios
+from app.services.dre_service import DREService
+
+router = APIRouter(prefix="/dre", tags=["dre"])
+
+MES_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def _mes(valor: str):
+    ano, mes = valor.split("-")
+    return int(ano), int(mes)
+
+
+@router.get("/", summary="DRE por plano de contas")
+async def obter_dre(
+    inicio: str = Query(..., pattern=MES_PATTERN, description="Mês inicial (AAAA-MM)"),
+    fim: str = Query(..., pattern=MES_PATTERN, description="Mês final (AAAA-MM)"),
+    regime: Literal["caixa", "competencia"] = Query("caixa", description="Regime de caixa ou de competência"),
+    comparar: Optional[Literal["periodo_anterior", "ano_anterior"]] = Query(None, description="Período comparativo"),
+    empresa_id: Optional[int] = Query(None, description="Filtrar por empresa"),
+    centro_custo_id: Optional[int] = Query(None, description="Filtrar por centro de custo"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Retorna o resultado mensal por conta do plano de contas (com subtotais dos nós pais),
+    por centro de custo e os totais do período, opcionalmente com o período comparativo
+    """
+    service = DREService(db)
+    return service.relatorio(_mes(inicio), _mes(fim), regime, empresa_id, centro_custo_id, comparar)
@@ -5,12 +5,13 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, versionado
 from app.models.funcionario import TblFuncionarios
+from app.models import Empresa
 from app.schemas.empresa import EmpresaCreate, EmpresaUpdate, EmpresaResponse
 from app.services.empresa_service import EmpresaService
 
-router = APIRouter(prefix="/empresas", tags=["empresas"])
+router = APIRouter(prefix="/empresas", tags=["empresas"], dependencies=[Depends(versionado(Empresa))])
 
 
 @router.get("/", response_model=List[EmpresaResponse], summary="Listar empresas")
@@ -0,0 +1,45 @@
+"""
+Rotas de importação de extratos bancários (OFX/CNAB)
+"""
+import io
+import logging
+from fastapi import APIRouter, Depends, File, Form, UploadFile
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.database import get_db
+from app.api.dependencies import get_current_user
+from app.models.funcionario import TblFuncionarios
+from app.schemas.extrato import ExtratoImportResponse
+from app.services.extrato_service import ExtratoService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/extratos", tags=["extratos"])
+
+
+@router.post("/importar", response_model=ExtratoImportResponse, summary="Importar extrato OFX/CNAB")
+async def importar_extrato(
+    arquivo: UploadFile = File(..., description="Arquivo OFX, CNAB 240 ou CNAB 400"),
+    id_conta: Optional[int] = Form(None, description="Conta do extrato (padrão: identificada pelo arquivo)"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Importa um extrato bancário, ignorando transações já importadas para a conta
+    """
+    def progresso(linhas_lidas: int, importadas: int, duplicadas: int):
+        logger.debug(f"Extrato {arquivo.filename}: {linhas_lidas} linhas lidas, {importadas} importadas, {duplicadas} duplicadas")
+
+    # Leitura em streaming do arquivo temporário do upload
+    stream = io.TextIOWrapper(arquivo.file, encoding="cp1252", errors="replace", newline="")
+    try:
+        service = ExtratoService(db)
+        return service.importar(
+            stream,
+            arquivo.filename,
+            current_user,
+            conta_id=id_conta,
+            progresso=progresso
+        )
+    finally:
+        stream.detach()
@@ -0,0 +1,78 @@
+"""
+Rotas do fechamento mensal de lançamentos
+"""
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.api.dependencies import get_current_user
+from app.models.funcionario import TblFuncionarios
+from app.schemas.fechamento import FechamentoRequest, PeriodoFechadoResponse, FechamentoTotalResponse
+from app.services.fechamento_service import FechamentoService
+
+router = APIRouter(prefix="/fechamentos", tags=["fechamentos"])
+
+
+def _periodo(periodo) -> dict:
+    return {
+        "ano": periodo.Ano,
+        "mes": periodo.Mes,
+        "data_fechamento": periodo.DatFechamento,
+        "usuario": periodo.NomUsuario,
+    }
+
+
+@router.get("/", response_model=List[PeriodoFechadoResponse], summary="Listar meses fechados")
+async def listar_fechamentos(
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Lista os meses fechados, do mais recente para o mais antigo
+    """
+    service = FechamentoService(db)
+    return [_periodo(periodo) for periodo in service.listar()]
+
+
+@router.post("/", response_model=List[PeriodoFechadoResponse], status_code=status.HTTP_201_CREATED, summary="Fechar mês")
+async def fechar_mes(
+    fechamento: FechamentoRequest,
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Fecha o mês (e os meses anteriores ainda abertos), gravando os totais por
+    categoria, favorecido, conta e empresa e bloqueando os seus lançamentos
+    """
+    service = FechamentoService(db)
+    return [_periodo(periodo) for periodo in service.fechar(fechamento.ano, fechamento.mes, current_user)]
+
+
+@router.delete("/{ano}/{mes}", status_code=status.HTTP_204_NO_CONTENT, summary="Reabrir mês")
+async def reabrir_mes(
+    ano: int,
+    mes: int,
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Reabre o último mês fechado
+    """
+    service = FechamentoService(db)
+    service.reabrir(ano, mes)
+
+
+@router.get("/{ano}/{mes}/totais", response_model=List[FechamentoTotalResponse], summary="Totais do mês fechado")
+async def obter_totais(
+    ano: int,
+    mes: int,
+    dimensao: Literal["categoria", "favorecido", "conta", "empresa"] = Query("conta", description="Dimensão dos totais"),
+    empresa_id: Optional[int] = Query(None, description="Filtrar por empresa"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Retorna os totais de entradas e saídas gravados no fechamento do mês
+    """
+    service = FechamentoService(db)
+    return service.totais(ano, mes, dimensao, empresa_id)
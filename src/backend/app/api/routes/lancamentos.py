@@ -5,20 +5,31 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, versionado
 from app.models.funcionario import TblFuncionarios
+from app.models import Lancamento, Favorecido, Categoria, Conta, Empresa, FormaPagamento
 from app.schemas.lancamento import (
     LancamentoCreate, 
     LancamentoUpdate, 
     LancamentoResponse, 
     LancamentoFilter,
     LancamentoConfirm,
-    LancamentosPaginatedResponse
+    LancamentosPaginatedResponse,
+    LancamentoSerieCreate,
+    LancamentoSerieResponse
 )
 from datetime import date
 from app.services.lancamento_service import LancamentoService
+from app.services.parcelamento_service import ParcelamentoService
 
-router = APIRouter(prefix="/lancamentos", tags=["lançamentos"])
+router = APIRouter(
+    prefix="/lancamentos",
+    tags=["lançamentos"],
+    # ETag das leituras: muda quando alguma destas tabelas é alterada
+    dependencies=[Depends(versionado(
+        Lancamento, Favorecido, Categoria, Conta, Empresa, FormaPagamento
+    ))]
+)
 
 @router.get("/", response_model=LancamentosPaginatedResponse, summary="Listar lançamentos")
 async def listar_lancamentos(
@@ -148,52 +159,16 @@ async def obter_lancamentos_dia(
     }
 
 @router.get("/filtro-opcoes", summary="Obter opções para filtros")
-async def obter_filtro_opcoes(
+def obter_filtro_opcoes(
     db: Session = Depends(get_db),
     current_user: TblFuncionarios = Depends(get_current_user)
 ):
     """
     Obtém as opções disponíveis para os filtros (favorecidos, categorias, etc.)
     """
-    from app.models.favorecido import Favorecido
-    from app.models.categoria import Categoria
-    from app.models.conta import Conta
-    from app.models.forma_pagamento import FormaPagamento
-    from app.models.empresa import Empresa
-    
-    # Buscar favorecidos
-    favorecidos = db.query(Favorecido).all()
-    favorecidos_opcoes = [{'value': f.CodFavorecido, 'label': f.DesFavorecido} for f in favorecidos]
-    
-    # Buscar categorias
-    categorias = db.query(Categoria).filter(Categoria.FlgAtivo == 'S').all()
-    categorias_opcoes = [{'value': c.CodCategoria, 'label': c.DesCategoria} for c in categorias]
-    
-    # Buscar contas
-    contas = db.query(Conta).all()  # Assumindo que não há campo FlgAtivo em Conta
-    contas_opcoes = [{'value': c.idConta, 'label': getattr(c, 'Nome', f'Conta {c.idConta}')} for c in contas]
-    
-    # Buscar formas de pagamento
-    try:
-        formas_pagamento = db.query(FormaPagamento).all()
-        formas_pagamento_opcoes = [{'value': fp.CodFormaPagto, 'label': getattr(fp, 'NomFormaPagto', f'Forma {fp.CodFormaPagto}')} for fp in formas_pagamento]
-    except:
-        formas_pagamento_opcoes = []
-    
-    # Buscar empresas
-    try:
-        empresas = db.query(Empresa).all()
-        empresas_opcoes = [{'value': e.CodEmpresa, 'label': getattr(e, 'NomEmpresa', f'Empresa {e.CodEmpresa}')} for e in empresas]
-    except:
-        empresas_opcoes = []
-    
-    return {
-        'favorecidos': favorecidos_opcoes,
-        'categorias': categorias_opcoes,
-        'contas': contas_opcoes,
-        'formas_pagamento': formas_pagamento_opcoes,
-        'empresas': empresas_opcoes
-    }
+    # Rota síncrona: roda no threadpool, onde aberturas simultâneas são coalescidas
+    service = LancamentoService(db)
+    return service.get_filtro_opcoes()
 
 @router.get("/{lancamento_id}", response_model=LancamentoResponse, summary="Obter lançamento por ID")
 async def obter_lancamento(
@@ -221,6 +196,31 @@ async def criar_lancamento(
     novo_lancamento = service.create_lancamento(lancamento, current_user.CodFuncionario)
     return LancamentoResponse.from_orm_with_relations(novo_lancamento)
 
+@router.post("/serie", response_model=LancamentoSerieResponse, status_code=status.HTTP_201_CREATED, summary="Criar lançamentos parcelados ou recorrentes")
+async def criar_serie_lancamentos(
+    serie: LancamentoSerieCreate,
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Gera as parcelas (valor dividido) ou recorrências (valor repetido) de um lançamento
+    """
+    service = ParcelamentoService(db)
+    return service.criar_serie(serie, current_user)
+
+@router.post("/recorrencias/materializar", summary="Materializar recorrências")
+async def materializar_recorrencias(
+    ate: date = Query(..., description="Gravar ocorrências até esta data"),
+    db: Session = Depends(get_db),
+    current_user: TblFuncionarios = Depends(get_current_user)
+):
+    """
+    Grava as ocorrências de lançamentos recorrentes até a data informada
+    """
+    service = ParcelamentoService(db)
+    total = service.materializar_recorrencias(ate, current_user.Login)
+    return {"message": f"{total} lançamentos gerados", "gerados": total}
+
 @router.put("/{lancamento_id}", response_model=LancamentoResponse, summary="Atualizar lançamento")
 async def atualizar_lancamento(
     lancamento_id: int,
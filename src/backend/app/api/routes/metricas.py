@@ -0,0 +1,29 @@
+"""
+Rotas de métricas internas do processo
+"""
+from fastapi import APIRouter, Depends
+from app.api.dependencies import get_current_user
+from app.models.funcionario import TblFuncionarios
+from app.core import singleflight
+from app.core.compressao import metricas_compressao
+from app.services.autocomplete_service import autocomplete_cache
+
+router = APIRouter(prefix="/metricas", tags=["métricas"])
+
+
+@router.get("/", summary="Métricas do processo")
+async def obter_metricas(current_user: TblFuncionarios = Depends(get_current_user)):
+    """
+    Contadores do worker que atendeu a requisição: chamadas coalescidas
+    (single-flight) por método, acertos do cache de autocomplete e bytes
+    economizados pela compressão das respostas
+    """
+    return {
+        "single_flight": singleflight.metricas(),
+        "autocomplete_cache": {
+            "hits": autocomplete_cache.hits,
+            "refinements": autocomplete_cache.refinements,
+            "misses": autocomplete_cache.misses,
+        },
+        "compressao": metricas_compressao.como_dict(),
+    }
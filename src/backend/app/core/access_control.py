@@ -0,0 +1,253 @@
+"""
+Revogação de tokens e limitação de taxa sem acesso ao banco
+
+Os dados ficam em memória no processo ou no Redis (RATE_LIMIT_BACKEND =
+"redis", usando REDIS_URL), quando há mais de um worker e a revogação e os
+limites precisam valer para todos. As operações são O(1) por requisição
+(amortizado) e não consultam o banco.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+class MemoryBackend:
+    """
+    Backend em memória do processo.
+
+    Cada estrutura é um LRU limitado a max_keys chaves, para que uma
+    avalanche de logins/IPs diferentes não cresça a memória sem limite.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._revoked: "OrderedDict[str, float]" = OrderedDict()
+        self._windows: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoga o token até o seu vencimento (epoch em segundos)"""
+        with self._lock:
+            self._revoked[jti] = expires_at
+            self._revoked.move_to_end(jti)
+            # Revogações mais antigas tendem a vencer antes: descarta as da frente já vencidas
+            now = time.time()
+            while self._revoked and (next(iter(self._revoked.values())) <= now or len(self._revoked) > self.max_keys):
+                self._revoked.popitem(last=False)
+
+    def is_revoked(self, jti: str) -> bool:
+        with self._lock:
+            expires_at = self._revoked.get(jti)
+            return expires_at is not None and expires_at > time.time()
+
+    def hit(self, key: str, window: float) -> int:
+        """Registra um evento na janela deslizante e retorna o total de eventos na janela"""
+        now = time.monotonic()
+        with self._lock:
+            events = self._windows.get(key)
+            if events is None:
+                events = self._windows[key] = deque()
+            self._windows.move_to_end(key)
+            events.append(now)
+            self._expire(events, now - window)
+            if len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+            return len(events)
+
+    def count(self, key: str, window: float) -> Tuple[int, float]:
+        """Eventos na janela e segundos até o mais antigo sair dela"""
+        now = time.monotonic()
+        with self._lock:
+            events = self._windows.get(key)
+            if not events:
+                return 0, 0.0
+            self._expire(events, now - window)
+            if not events:
+                del self._windows[key]
+                return 0, 0.0
+            return len(events), events[0] + window - now
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._windows.pop(key, None)
+
+    def take(self, key: str, capacity: int, rate: float) -> Tuple[bool, float]:
+        """Consome uma ficha do balde; retorna (permitido, segundos até a próxima ficha)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+            self._windows.clear()
+            self._buckets.clear()
+
+    @staticmethod
+    def _expire(events: Deque[float], limit: float) -> None:
+        while events and events[0] <= limit:
+            events.popleft()
+
+
+# Balde de fichas atômico: KEYS[1] = balde, ARGV = capacidade, taxa, agora
+_TAKE_SCRIPT = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBackend:
+    """Backend Redis, compartilhado entre workers e instâncias"""
+
+    def __init__(self, url: str, prefix: str = "locador"):
+        import redis
+
+        self.redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.redis.register_script(_TAKE_SCRIPT)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            self.redis.set(f"{self.prefix}:revoked:{jti}", 1, ex=ttl)
+
+    def is_revoked(self, jti: str) -> bool:
+        return bool(self.redis.exists(f"{self.prefix}:revoked:{jti}"))
+
+    def hit(self, key: str, window: float) -> int:
+        now = time.time()
+        name = f"{self.prefix}:window:{key}"
+        pipe = self.redis.pipeline()
+        pipe.zremrangebyscore(name, 0, now - window)
+        pipe.zadd(name, {f"{now}:{uuid.uuid4().hex[:8]}": now})
+        pipe.zcard(name)
+        pipe.expire(name, int(window) + 1)
+        return pipe.execute()[2]
+
+    def count(self, key: str, window: float) -> Tuple[int, float]:
+        now = time.time()
+        name = f"{self.prefix}:window:{key}"
+        pipe = self.redis.pipeline()
+        pipe.zremrangebyscore(name, 0, now - window)
+        pipe.zrange(name, 0, 0, withscores=True)
+        pipe.zcard(name)
+        _, oldest, total = pipe.execute()
+        if not total:
+            return 0, 0.0
+        return total, oldest[0][1] + window - now
+
+    def reset(self, key: str) -> None:
+        self.redis.delete(f"{self.prefix}:window:{key}")
+
+    def take(self, key: str, capacity: int, rate: float) -> Tuple[bool, float]:
+        allowed, tokens = self._take(keys=[f"{self.prefix}:bucket:{key}"], args=[capacity, rate, time.time()])
+        return bool(allowed), 0.0 if allowed else (1 - float(tokens)) / rate
+
+    def clear(self) -> None:
+        for name in self.redis.scan_iter(f"{self.prefix}:*"):
+            self.redis.delete(name)
+
+
+def create_backend():
+    """Backend configurado em RATE_LIMIT_BACKEND ("memory" ou "redis")"""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisBackend(settings.REDIS_URL)
+    return MemoryBackend()
+
+
+class TokenRevocation:
+    """Lista de tokens revogados (jti) até o vencimento de cada token"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def revoke(self, payload: Dict) -> None:
+        jti = payload.get("jti")
+        if jti:
+            self.backend.revoke(jti, float(payload.get("exp") or time.time() + settings.ACCESS_TOKEN_EXPIRE_HOURS * 3600))
+
+    def is_revoked(self, payload: Dict) -> bool:
+        jti = payload.get("jti")
+        return bool(jti) and self.backend.is_revoked(jti)
+
+
+class LoginRateLimiter:
+    """
+    Limites do login, verificados antes de consultar o banco.
+
+    - falhas de senha por login e IP: RATE_LIMIT_REQUESTS falhas em
+      RATE_LIMIT_WINDOW segundos (janela deslizante) bloqueiam novas
+      tentativas até a falha mais antiga sair da janela;
+    - tentativas por IP: balde de RATE_LIMIT_LOGIN_BURST fichas reposto a
+      RATE_LIMIT_LOGIN_RATE por segundo, contra rajadas de logins.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def check(self, ip: str, login: str) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        failures, retry_after = self.backend.count(self._key(ip, login), settings.RATE_LIMIT_WINDOW)
+        if failures >= settings.RATE_LIMIT_REQUESTS:
+            self._reject("Muitas tentativas de login inválidas. Tente novamente mais tarde", retry_after)
+
+        allowed, retry_after = self.backend.take(f"login:{ip}", settings.RATE_LIMIT_LOGIN_BURST, settings.RATE_LIMIT_LOGIN_RATE)
+        if not allowed:
+            self._reject("Muitas requisições de login. Tente novamente em instantes", retry_after)
+
+    def failure(self, ip: str, login: str) -> None:
+        if settings.RATE_LIMIT_ENABLED:
+            self.backend.hit(self._key(ip, login), settings.RATE_LIMIT_WINDOW)
+
+    def success(self, ip: str, login: str) -> None:
+        if settings.RATE_LIMIT_ENABLED:
+            self.backend.reset(self._key(ip, login))
+
+    @staticmethod
+    def _key(ip: str, login: str) -> str:
+        return f"falhas:{ip}:{login.strip().lower()}"
+
+    @staticmethod
+    def _reject(detail: str, retry_after: float) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(int(retry_after + 0.999), 1))}
+        )
+
+
+# Instâncias compartilhadas pelo processo
+access_backend = create_backend()
+token_revocation = TokenRevocation(access_backend)
+login_rate_limiter = LoginRateLimiter(access_backend)
@@ -0,0 +1,195 @@
+"""
+Compressão das respostas HTTP (gzip e brotli)
+
+Middleware ASGI: a codificação é escolhida pelo Accept-Encoding do cliente
+(brotli tem preferência quando o pacote brotli está instalado). Respostas
+menores que COMPRESSAO_MINIMO_BYTES, já codificadas ou de tipos que não
+ganham com compressão (imagens, PDF, ZIP) passam sem alteração.
+
+Respostas em partes (StreamingResponse) são comprimidas parte a parte, com
+flush a cada parte: o cliente recebe os dados conforme são gerados, sem que
+a exportação inteira fique em memória.
+"""
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pacote opcional: sem ele só gzip
+    brotli = None
+
+# Tipos comprimidos; outros (imagens, PDF, ZIP) já são compactados
+TIPOS_COMPRIMIVEIS = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+)
+
+
+def codificacoes_disponiveis() -> tuple:
+    """Codificações suportadas, em ordem de preferência"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def escolher_codificacao(accept_encoding: str) -> Optional[str]:
+    """Codificação com maior peso (q) no Accept-Encoding; None se nenhuma é aceita"""
+    pesos: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        nome, _, parametros = item.partition(";")
+        peso = 1.0
+        parametro = parametros.strip()
+        if parametro.startswith("q="):
+            try:
+                peso = float(parametro[2:])
+            except ValueError:
+                peso = 0.0
+        if nome.strip():
+            pesos[nome.strip().lower()] = peso
+
+    escolhida, maior = None, 0.0
+    for codificacao in codificacoes_disponiveis():
+        peso = pesos.get(codificacao, pesos.get("*", 0.0))
+        if peso > maior:
+            escolhida, maior = codificacao, peso
+    return escolhida
+
+
+def _comprimivel(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    tipo = headers.get("content-type", "").lower()
+    return tipo.startswith(TIPOS_COMPRIMIVEIS) or "+json" in tipo or "+xml" in tipo
+
+
+class _Compressor:
+    """Interface comum para gzip (zlib) e brotli"""
+
+    def __init__(self, codificacao: str):
+        if codificacao == "br":
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSAO_NIVEL_BROTLI)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(settings.COMPRESSAO_NIVEL_GZIP, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def parte(self, dados: bytes) -> bytes:
+        """Comprime e libera tudo que já pode ser enviado"""
+        if self._brotli is not None:
+            return self._brotli.process(dados) + self._brotli.flush()
+        return self._zlib.compress(dados) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def final(self, dados: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(dados) + self._brotli.finish()
+        return self._zlib.compress(dados) + self._zlib.flush()
+
+
+class MetricasCompressao:
+    """Bytes antes e depois da compressão, por codificação"""
+
+    def __init__(self):
+        self.ignoradas = 0
+        self.por_codificacao: Dict[str, Dict[str, int]] = {}
+
+    def registrar(self, codificacao: str, originais: int, enviados: int) -> None:
+        contadores = self.por_codificacao.setdefault(
+            codificacao, {"respostas": 0, "bytes_originais": 0, "bytes_enviados": 0}
+        )
+        contadores["respostas"] += 1
+        contadores["bytes_originais"] += originais
+        contadores["bytes_enviados"] += enviados
+
+    def como_dict(self) -> Dict:
+        codificacoes = {
+            codificacao: {**contadores, "bytes_economizados": contadores["bytes_originais"] - contadores["bytes_enviados"]}
+            for codificacao, contadores in sorted(self.por_codificacao.items())
+        }
+        return {
+            "ignoradas": self.ignoradas,
+            "bytes_economizados": sum(c["bytes_economizados"] for c in codificacoes.values()),
+            "codificacoes": codificacoes,
+        }
+
+
+metricas_compressao = MetricasCompressao()
+
+
+class _RespostaComprimida:
+    """Intercepta as mensagens de uma resposta e decide se comprime no primeiro corpo"""
+
+    def __init__(self, send: Send, codificacao: str, minimo: int, metricas: MetricasCompressao):
+        self.send = send
+        self.codificacao = codificacao
+        self.minimo = minimo
+        self.metricas = metricas
+        self.inicio: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.repassar = False
+        self.originais = 0
+        self.enviados = 0
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.inicio = message
+            return
+        if message["type"] != "http.response.body" or self.repassar:
+            await self.send(message)
+            return
+
+        corpo = message.get("body", b"")
+        mais = message.get("more_body", False)
+        if self.compressor is None:
+            headers = MutableHeaders(raw=list(self.inicio["headers"]))
+            if not _comprimivel(headers) or (not mais and len(corpo) < self.minimo):
+                self.repassar = True
+                self.metricas.ignoradas += 1
+                await self.send(self.inicio)
+                await self.send(message)
+                return
+
+            self.compressor = _Compressor(self.codificacao)
+            headers["Content-Encoding"] = self.codificacao
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            if not mais:
+                comprimido = self.compressor.final(corpo)
+                headers["Content-Length"] = str(len(comprimido))
+                self.metricas.registrar(self.codificacao, len(corpo), len(comprimido))
+                await self.send({**self.inicio, "headers": headers.raw})
+                await self.send({"type": "http.response.body", "body": comprimido})
+                return
+            await self.send({**self.inicio, "headers": headers.raw})
+
+        # Resposta em partes: cada parte sai comprimida assim que chega
+        comprimido = self.compressor.parte(corpo) if mais else self.compressor.final(corpo)
+        self.originais += len(corpo)
+        self.enviados += len(comprimido)
+        if not mais:
+            self.metricas.registrar(self.codificacao, self.originais, self.enviados)
+        await self.send({"type": "http.response.body", "body": comprimido, "more_body": mais})
+
+
+class CompressaoMiddleware:
+    """Comprime respostas com gzip ou brotli conforme o Accept-Encoding"""
+
+    def __init__(self, app: ASGIApp, minimo: Optional[int] = None, metricas: Optional[MetricasCompressao] = None):
+        self.app = app
+        self.minimo = settings.COMPRESSAO_MINIMO_BYTES if minimo is None else minimo
+        self.metricas = metricas or metricas_compressao
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        codificacao = escolher_codificacao(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacao is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _RespostaComprimida(send, codificacao, self.minimo, self.metricas))
@@ -43,8 +43,44 @@ class Settings(BaseSettings):
     
     # Configurações de Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
-    RATE_LIMIT_REQUESTS: int = 5
+    RATE_LIMIT_BACKEND: str = "memory"  # memory ou redis (REDIS_URL), para vários workers
+    RATE_LIMIT_REQUESTS: int = 5  # falhas de login por login e IP na janela
     RATE_LIMIT_WINDOW: int = 60  # seconds
+    RATE_LIMIT_LOGIN_BURST: int = 30  # tentativas de login por IP em rajada
+    RATE_LIMIT_LOGIN_RATE: float = 2.0  # tentativas de login por IP repostas por segundo
+    
+    # Configurações de Requisições Condicionais (ETag/Last-Modified)
+    ETAG_JANELA: int = 300  # seconds; prazo máximo para refletir alterações feitas fora da API (0 desativa)
+    
+    # Configurações de Compressão de Respostas (gzip; brotli se o pacote estiver instalado)
+    COMPRESSAO_ENABLED: bool = True
+    COMPRESSAO_MINIMO_BYTES: int = 1024  # respostas menores saem sem compressão
+    COMPRESSAO_NIVEL_GZIP: int = 6  # 1 (rápido) a 9 (menor)
+    COMPRESSAO_NIVEL_BROTLI: int = 4  # 0 (rápido) a 11 (menor)
+
+    # Configurações de Autocomplete
+    AUTOCOMPLETE_CACHE_SIZE: int = 2048  # prefixos mantidos em memória
+    AUTOCOMPLETE_CACHE_TTL: int = 60  # seconds
+    AUTOCOMPLETE_CANDIDATE_LIMIT: int = 200  # candidatos buscados por prefixo
+    
+    # Configurações de Importação de Extratos
+    EXTRATO_IMPORT_CHUNK_SIZE: int = 1000  # linhas por INSERT em lote
+    
+    # Configurações de Conciliação Bancária
+    CONCILIACAO_TOLERANCIA_DIAS: int = 3  # janela de datas entre extrato e lançamento
+    CONCILIACAO_SCORE_AUTO: float = 0.8  # pontuação mínima para confirmar automaticamente
+    
+    # Configurações de Parcelamento e Recorrência
+    LANCAMENTO_MAX_PARCELAS: int = 360
+    LANCAMENTO_RECORRENCIA_HORIZONTE_DIAS: int = 90  # recorrências gravadas antecipadamente
+    
+    # Configurações do Agendador
+    AGENDADOR_ENABLED: bool = True
+    AGENDADOR_TICK: int = 60  # seconds entre verificações
+    AGENDADOR_LEASE: int = 600  # seconds de exclusividade do líder por execução
+    AGENDADOR_INTERVALO_STATUS_TITULOS: int = 3600  # seconds
+    AGENDADOR_INTERVALO_RECORRENCIAS: int = 21600  # seconds
+    STATUS_TITULOS_CHUNK_SIZE: int = 5000  # títulos por lote de atualização
     
     class Config:
         env_file = ".env"
@@ -2,6 +2,7 @@
 Security utilities for authentication and authorization
 """
 import hashlib
+import uuid
 import jwt
 import base64
 from datetime import datetime, timedelta
@@ -50,7 +51,8 @@ class JWTUtil:
         else:
             expire = datetime.utcnow() + timedelta(hours=settings.ACCESS_TOKEN_EXPIRE_HOURS)
         
-        to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+        # jti identifica o token para revogação no logout
+        to_encode.update({"exp": expire, "iat": datetime.utcnow(), "jti": uuid.uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
     
@@ -0,0 +1,104 @@
+"""
+Coalescência de leituras idênticas concorrentes (single-flight)
+
+Quando várias requisições pedem o mesmo cálculo ao mesmo tempo (o resumo do
+dashboard na abertura do expediente, por exemplo), só a primeira executa; as
+demais aguardam e recebem o mesmo resultado, ou a mesma exceção. Não é um
+cache: terminada a execução, a chamada seguinte calcula de novo.
+
+A coalescência vale dentro do processo, entre as threads que atendem rotas
+síncronas. O resultado é compartilhado entre as chamadas e não deve conter
+objetos ligados à sessão de quem executou (use dicts/valores simples).
+"""
+import functools
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Chamada:
+    __slots__ = ("evento", "resultado", "erro")
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+        self.erro = None
+
+
+class SingleFlight:
+    """Grupo de chamadas coalescidas por chave, com contadores"""
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self._chamadas: Dict[Hashable, _Chamada] = {}
+        self._lock = threading.Lock()
+        self.chamadas = 0
+        self.execucoes = 0
+        self.coalescidas = 0
+
+    def executar(self, chave: Hashable, funcao: Callable[[], Any]) -> Any:
+        """Executa funcao, ou aguarda a execução em andamento com a mesma chave"""
+        with self._lock:
+            self.chamadas += 1
+            chamada = self._chamadas.get(chave)
+            lider = chamada is None
+            if lider:
+                chamada = self._chamadas[chave] = _Chamada()
+                self.execucoes += 1
+            else:
+                self.coalescidas += 1
+
+        if not lider:
+            chamada.evento.wait()
+            if chamada.erro is not None:
+                raise chamada.erro
+            return chamada.resultado
+
+        try:
+            chamada.resultado = funcao()
+            return chamada.resultado
+        except BaseException as e:
+            chamada.erro = e
+            raise
+        finally:
+            with self._lock:
+                del self._chamadas[chave]
+            chamada.evento.set()
+
+    def metricas(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "chamadas": self.chamadas,
+                "execucoes": self.execucoes,
+                "coalescidas": self.coalescidas,
+                "em_andamento": len(self._chamadas),
+            }
+
+
+# Grupos criados pelo decorator, por nome do método
+grupos: Dict[str, SingleFlight] = {}
+
+
+def single_flight(funcao: Callable) -> Callable:
+    """
+    Decorator para métodos de serviço: chamadas concorrentes com os mesmos
+    argumentos (sem contar self) compartilham uma única execução.
+    Argumentos não hasheáveis desativam a coalescência naquela chamada.
+    """
+    grupo = grupos.setdefault(funcao.__qualname__, SingleFlight(funcao.__qualname__))
+
+    @functools.wraps(funcao)
+    def wrapper(self, *args, **kwargs):
+        chave = (args, tuple(sorted(kwargs.items())))
+        try:
+            hash(chave)
+        except TypeError:
+            return funcao(self, *args, **kwargs)
+        return grupo.executar(chave, lambda: funcao(self, *args, **kwargs))
+
+    wrapper.single_flight = grupo
+    return wrapper
+
+
+def metricas() -> Dict[str, Dict[str, int]]:
+    """Contadores de todos os grupos"""
+    return {nome: grupo.metricas() for nome, grupo in sorted(grupos.items())}
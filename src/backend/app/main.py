@@ -4,14 +4,21 @@ FastAPI application main module for Financial Web Application
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import auth, lancamentos, contas_pagar, contas_receber, categorias, dashboard, empresas, bancos, contas, clientes, favorecidos
+from app.api.routes import auth, lancamentos, contas_pagar, contas_receber, categorias, dashboard, empresas, bancos, contas, clientes, favorecidos, autocomplete, documentos, extratos, conciliacao, agendador, dre, fechamentos, metricas
 from app.core.config import settings
+from app.core.compressao import CompressaoMiddleware
+from app.core.database import SessionLocal
 from app.services.ip_service import print_external_ip
+from app.services.agendador_service import agendador as agendador_tarefas
+from app.services.versao_service import registrar_versionamento
 
 # Configuração de logging
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+# Versões por tabela para os ETags das rotas de leitura
+registrar_versionamento(SessionLocal)
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.PROJECT_DESCRIPTION,
@@ -30,8 +37,20 @@ async def startup_event():
     # Consulta e exibe o IP externo
     await print_external_ip()
     
+    # Tarefas de manutenção (status de títulos, recorrências)
+    if settings.AGENDADOR_ENABLED:
+        agendador_tarefas.iniciar()
+    
     logger.info("Sistema inicializado com sucesso!")
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Evento executado no encerramento da aplicação
+    """
+    await agendador_tarefas.parar()
+
 # Configuração de CORS
 app.add_middleware(
     CORSMiddleware,
@@ -42,6 +61,10 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+# Compressão das respostas (adicionado por último: envolve os demais middlewares)
+if settings.COMPRESSAO_ENABLED:
+    app.add_middleware(CompressaoMiddleware)
+
 # Inclusão dos routers
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(lancamentos.router, prefix=settings.API_V1_STR)
@@ -54,6 +77,14 @@ app.include_router(bancos.router, prefix=settings.API_V1_STR)
 app.include_router(contas.router, prefix=settings.API_V1_STR)
 app.include_router(clientes.router, prefix=settings.API_V1_STR)
 app.include_router(favorecidos.router, prefix=settings.API_V1_STR)
+app.include_router(autocomplete.router, prefix=settings.API_V1_STR)
+app.include_router(documentos.router, prefix=settings.API_V1_STR)
+app.include_router(extratos.router, prefix=settings.API_V1_STR)
+app.include_router(conciliacao.router, prefix=settings.API_V1_STR)
+app.include_router(agendador.router, prefix=settings.API_V1_STR)
+app.include_router(dre.router, prefix=settings.API_V1_STR)
+app.include_router(fechamentos.router, prefix=settings.API_V1_STR)
+app.include_router(metricas.router, prefix=settings.API_V1_STR)
 
 @app.get("/")
 async def root():
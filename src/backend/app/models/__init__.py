@@ -13,6 +13,15 @@ from .conta import Conta
 from .cliente import Cliente
 from .accounts_payable import AccountsPayable, AccountsPayablePayment
 from .accounts_receivable import AccountsReceivable, AccountsReceivablePayment
+from .documento_indice import DocumentoIndice
+from .saldo_dia import SaldoDia
+from .extrato import OfxFile, OfxDados
+from .situacao_titulo import SituacaoTitulo
+from .tarefa_agendada import TarefaAgendada
+from .plano_contas import ChartOfAccounts, CostCenter
+from .dre import DREMes, DREMensal
+from .fechamento import PeriodoFechado, FechamentoTotal
+from .versao_tabela import VersaoTabela
 
 __all__ = [
     "TblFuncionarios",
@@ -28,5 +37,18 @@ __all__ = [
     "AccountsPayable",
     "AccountsPayablePayment",
     "AccountsReceivable",
-    "AccountsReceivablePayment"
+    "AccountsReceivablePayment",
+    "DocumentoIndice",
+    "SaldoDia",
+    "OfxFile",
+    "OfxDados",
+    "SituacaoTitulo",
+    "TarefaAgendada",
+    "ChartOfAccounts",
+    "CostCenter",
+    "DREMes",
+    "DREMensal",
+    "PeriodoFechado",
+    "FechamentoTotal",
+    "VersaoTabela"
 ]
\ No newline at end of file
@@ -68,29 +68,19 @@ class AccountsPayable(Base):
 class AccountsPayablePayment(Base):
     """Modelo para registrar pagamentos das contas a pagar"""
     
-    __tablename__ = "tbl_AccountsPayablePayments"
+    __tablename__ = "tbl_AccountsPayablePayment"
 
-    CodPayment = Column(Integer, primary_key=True, index=True)
-    CodAccountsPayable = Column(Integer, ForeignKey("tbl_AccountsPayable.id"), nullable=False)
-    idConta = Column(Integer, ForeignKey("tbl_Conta.idConta"), comment="Conta bancária do pagamento")
-    CodFormaPagto = Column(Integer, ForeignKey("tbl_FINFormaPagamento.CodFormaPagto"), comment="Forma de pagamento")
-    
-    DataPagamento = Column(DateTime, nullable=False, default=datetime.now, comment="Data do pagamento")
-    ValorPago = Column(Numeric(18, 2), nullable=False, comment="Valor do pagamento")
-    Desconto = Column(Numeric(18, 2), default=0, comment="Desconto concedido")
-    Juros = Column(Numeric(18, 2), default=0, comment="Juros cobrados")
-    Multa = Column(Numeric(18, 2), default=0, comment="Multa cobrada")
-    
-    NumeroDocumento = Column(String(50), comment="Número do documento de pagamento")
-    Observacao = Column(Text, comment="Observações do pagamento")
-    
-    # Campos de auditoria
-    IdUserCreate = Column(Integer, nullable=False, comment="Usuário criação")
-    IdUserAlter = Column(Integer, comment="Usuário alteração")
-    DateCreate = Column(DateTime, nullable=False, default=datetime.now, comment="Data criação")
-    DateUpdate = Column(DateTime, comment="Data alteração")
-    
-    # Relacionamentos removidos temporariamente para evitar erros de configuração
+    # Campos baseados na estrutura real do banco
+    id = Column(Integer, primary_key=True, name='IdPayment')
+    id_accounts_payable = Column(Integer, ForeignKey('tbl_AccountsPayable.IdAccountsPayable'), name='IdAccountsPayable', nullable=False)
+    id_payment_method = Column(Integer, ForeignKey('tbl_FINFormaPagamento.CodFormaPagto'), name='IdPaymentMethod', nullable=False)
+    id_bank_account = Column(Integer, ForeignKey('tbl_Conta.idConta'), name='IdBankAccount')
+    date = Column(Date, name='Date', nullable=False)
+    amount = Column(Numeric(19,4), name='Amount', nullable=False)
+    id_user_create = Column(Integer, name='IdUserCreate', nullable=False)
+    id_user_alter = Column(Integer, name='IdUserAlter')
+    date_create = Column(DateTime, name='DateCreate', nullable=False, default=datetime.now)
+    date_update = Column(DateTime, name='DateUpdate')
     
     def __repr__(self):
-        return f"<AccountsPayablePayment(CodPayment={self.CodPayment}, ValorPago={self.ValorPago})>"
\ No newline at end of file
+        return f"<AccountsPayablePayment(id={self.id}, id_accounts_payable={self.id_accounts_payable}, amount={self.amount})>"
@@ -73,29 +73,19 @@ class AccountsReceivable(Base):
 class AccountsReceivablePayment(Base):
     """Modelo para registrar recebimentos das contas a receber"""
     
-    __tablename__ = "tbl_AccountsReceivablePayments"
+    __tablename__ = "tbl_AccountsReceivablePayment"
 
-    CodPayment = Column(Integer, primary_key=True, index=True)
-    CodAccountsReceivable = Column(Integer, ForeignKey("tbl_AccountsReceivable.id"), nullable=False)
-    idConta = Column(Integer, ForeignKey("tbl_Conta.idConta"), comment="Conta bancária do recebimento")
-    CodFormaPagto = Column(Integer, ForeignKey("tbl_FINFormaPagamento.CodFormaPagto"), comment="Forma de recebimento")
-    
-    DataRecebimento = Column(DateTime, nullable=False, default=datetime.now, comment="Data do recebimento")
-    ValorRecebido = Column(Numeric(18, 2), nullable=False, comment="Valor do recebimento")
-    Desconto = Column(Numeric(18, 2), default=0, comment="Desconto concedido")
-    Juros = Column(Numeric(18, 2), default=0, comment="Juros recebidos")
-    Multa = Column(Numeric(18, 2), default=0, comment="Multa recebida")
-    
-    NumeroDocumento = Column(String(50), comment="Número do documento de recebimento")
-    Observacao = Column(Text, comment="Observações do recebimento")
-    
-    # Campos de auditoria
-    IdUserCreate = Column(Integer, nullable=False, comment="Usuário criação")
-    IdUserAlter = Column(Integer, comment="Usuário alteração")
-    DateCreate = Column(DateTime, nullable=False, default=datetime.now, comment="Data criação")
-    DateUpdate = Column(DateTime, comment="Data alteração")
-    
-    # Relacionamentos removidos temporariamente para evitar erros de configuração
+    # Campos baseados na estrutura real do banco
+    id = Column(Integer, primary_key=True, name='IdPayment')
+    id_accounts_receivable = Column(Integer, ForeignKey('tbl_AccountsReceivable.IdAccountsReceivable'), name='IdAccountsReceivable', nullable=False)
+    id_payment_method = Column(Integer, ForeignKey('tbl_FINFormaPagamento.CodFormaPagto'), name='IdPaymentMethod', nullable=False)
+    id_bank_account = Column(Integer, ForeignKey('tbl_Conta.idConta'), name='IdBankAccount')
+    date = Column(Date, name='Date', nullable=False)
+    amount = Column(Numeric(19,4), name='Amount', nullable=False)
+    id_user_create = Column(Integer, name='IdUserCreate', nullable=False)
+    id_user_alter = Column(Integer, name='IdUserAlter')
+    date_create = Column(DateTime, name='DateCreate', nullable=False, default=datetime.now)
+    date_update = Column(DateTime, name='DateUpdate')
     
     def __repr__(self):
-        return f"<AccountsReceivablePayment(CodPayment={self.CodPayment}, ValorRecebido={self.ValorRecebido})>"
\ No newline at end of file
+        return f"<AccountsReceivablePayment(id={self.id}, id_accounts_receivable={self.id_accounts_receivable}, amount={self.amount})>"
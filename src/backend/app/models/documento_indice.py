@@ -0,0 +1,32 @@
+"""
+Modelo do índice de documentos (CPF/CNPJ) normalizados
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+
+
+class DocumentoIndice(Base):
+    """
+    Índice de CPF/CNPJ armazenados apenas com dígitos.
+
+    As tabelas de origem guardam os documentos em formatos mistos (com e sem
+    máscara), o que impede buscas indexadas. Cada linha aponta para o registro
+    de origem (Entidade + CodEntidade) e é mantida pelos serviços de escrita.
+    """
+
+    __tablename__ = "tbl_FINDocumentoIndice"
+
+    IdDocumentoIndice = Column(Integer, primary_key=True, name='IdDocumentoIndice')
+    Entidade = Column(String(20), name='Entidade', nullable=False)  # favorecido, cliente, empresa
+    CodEntidade = Column(Integer, name='CodEntidade', nullable=False)
+    Documento = Column(String(14), name='Documento', nullable=False)  # apenas dígitos
+    DatAtualizacao = Column(DateTime, name='DatAtualizacao', default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('IX_FINDocumentoIndice_Documento', 'Entidade', 'Documento'),
+        Index('IX_FINDocumentoIndice_Entidade', 'Entidade', 'CodEntidade'),
+    )
+
+    def __repr__(self):
+        return f"<DocumentoIndice(Entidade='{self.Entidade}', CodEntidade={self.CodEntidade}, Documento='{self.Documento}')>"
@@ -0,0 +1,54 @@
+"""
+Modelos do cache mensal da DRE
+"""
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+
+
+class DREMes(Base):
+    """
+    Meses da DRE já calculados (tbl_FINDREMes).
+
+    Um mês fechado é calculado uma única vez por regime e passa a ser lido
+    de tbl_FINDREMensal; o mês corrente é sempre calculado a partir dos
+    lançamentos/títulos.
+    """
+
+    __tablename__ = "tbl_FINDREMes"
+
+    IdDREMes = Column(Integer, primary_key=True, name='IdDREMes')
+    Regime = Column(String(12), name='Regime', nullable=False)  # caixa, competencia
+    Ano = Column(Integer, name='Ano', nullable=False)
+    Mes = Column(Integer, name='Mes', nullable=False)
+    DatCalculo = Column(DateTime, name='DatCalculo', default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('IX_FINDREMes_Regime_Mes', 'Regime', 'Ano', 'Mes', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<DREMes(Regime='{self.Regime}', Ano={self.Ano}, Mes={self.Mes})>"
+
+
+class DREMensal(Base):
+    """Totais de um mês fechado por empresa, conta do plano e centro de custo (tbl_FINDREMensal)"""
+
+    __tablename__ = "tbl_FINDREMensal"
+
+    IdDREMensal = Column(Integer, primary_key=True, name='IdDREMensal')
+    Regime = Column(String(12), name='Regime', nullable=False)
+    Ano = Column(Integer, name='Ano', nullable=False)
+    Mes = Column(Integer, name='Mes', nullable=False)
+    IdCompany = Column(Integer, name='IdCompany')
+    IdChartOfAccounts = Column(Integer, name='IdChartOfAccounts')
+    IdCostCenter = Column(Integer, name='IdCostCenter')
+    Receitas = Column(Numeric(19,4), name='Receitas', default=0)
+    Despesas = Column(Numeric(19,4), name='Despesas', default=0)
+
+    __table_args__ = (
+        Index('IX_FINDREMensal_Regime_Mes', 'Regime', 'Ano', 'Mes'),
+    )
+
+    def __repr__(self):
+        return f"<DREMensal(Regime='{self.Regime}', Ano={self.Ano}, Mes={self.Mes}, IdChartOfAccounts={self.IdChartOfAccounts})>"
@@ -0,0 +1,75 @@
+"""
+Modelos de Extratos Bancários importados (OFX/CNAB)
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, Boolean, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+
+class OfxFile(Base):
+    """Modelo para arquivos de extrato importados"""
+
+    __tablename__ = "tbl_OfxFile"
+
+    IdOfxFile = Column(Integer, primary_key=True, name='IdOfxFile')
+    FileName = Column(String(100), name='FileName', nullable=False)
+    IdBankAccount = Column(Integer, name='IdBankAccount', nullable=False)  # tbl_Conta.idConta
+    InitialDate = Column(Date, name='InitialDate', nullable=False)
+    FinalDate = Column(Date, name='FinalDate', nullable=False)
+    IdUserCreate = Column(Integer, name='IdUserCreate', nullable=False)
+    IdUserAlter = Column(Integer, name='IdUserAlter')
+    DateCreate = Column(DateTime, name='DateCreate', default=datetime.utcnow, nullable=False)
+    DateUpdate = Column(DateTime, name='DateUpdate')
+
+    # Relacionamentos
+    linhas = relationship("OfxDados", back_populates="arquivo")
+
+    def __repr__(self):
+        return f"<OfxFile(IdOfxFile={self.IdOfxFile}, FileName='{self.FileName}', IdBankAccount={self.IdBankAccount})>"
+
+
+class OfxDados(Base):
+    """Modelo para as linhas (transações) de um extrato importado"""
+
+    __tablename__ = "tbl_OfxDados"
+
+    IdOfxDados = Column(Integer, primary_key=True, name='IdOfxDados')
+    IdOfxFile = Column(Integer, ForeignKey('tbl_OfxFile.IdOfxFile'), name='IdOfxFile', nullable=False)
+    TxType = Column(String(30), name='TxType')
+    DatePosted = Column(DateTime, name='DatePosted')
+    DateAvailable = Column(DateTime, name='DateAvailable')
+    DateUser = Column(DateTime, name='DateUser')
+    Amount = Column(Numeric(18,2), name='Amount')  # negativo = débito
+    FitId = Column(String(50), name='FitId')
+    Name = Column(String(100), name='Name')
+    Memo = Column(String(255), name='Memo')
+    Memo2 = Column(String(255), name='Memo2')
+    ChequeNumber = Column(String(50), name='ChequeNumber')
+    ReferenceNumber = Column(String(50), name='ReferenceNumber')
+    CorrectFitId = Column(String(20), name='CorrectFitId')
+    CorrectAction = Column(Integer, name='CorrectAction')
+    ServiceProviderName = Column(String(50), name='ServiceProviderName')
+    ServerTxId = Column(String(50), name='ServerTxId')
+    StandardIndustrialCode = Column(String(30), name='StandardIndustrialCode')
+    Payee = Column(String(255), name='Payee')
+    Currency = Column(String(10), name='Currency')
+    OriginalCurrency = Column(String(10), name='OriginalCurrency')
+    MovimentType = Column(Integer, name='MovimentType')  # 1=Crédito, 2=Débito
+    IdEntry = Column(Integer, name='IdEntry')  # tbl_FINLancamentos.CodLancamento conciliado
+    IsValidated = Column(Boolean, name='IsValidated', default=False)
+    IdUserCreate = Column(Integer, name='IdUserCreate', nullable=False)
+    IdUserAlter = Column(Integer, name='IdUserAlter')
+    DateCreate = Column(DateTime, name='DateCreate', default=datetime.utcnow, nullable=False)
+    DateUpdate = Column(DateTime, name='DateUpdate')
+
+    __table_args__ = (
+        Index('IX_OfxDados_File_FitId', 'IdOfxFile', 'FitId'),
+        Index('IX_OfxDados_IdEntry', 'IdEntry'),
+    )
+
+    # Relacionamentos
+    arquivo = relationship("OfxFile", back_populates="linhas")
+
+    def __repr__(self):
+        return f"<OfxDados(IdOfxDados={self.IdOfxDados}, FitId='{self.FitId}', Amount={self.Amount})>"
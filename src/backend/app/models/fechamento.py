@@ -0,0 +1,60 @@
+"""
+Modelos do fechamento mensal de lançamentos
+"""
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Boolean, Index
+from datetime import datetime
+from app.core.database import Base
+
+
+class PeriodoFechado(Base):
+    """
+    Meses fechados (tbl_FINPeriodoFechado).
+
+    Os meses fechados são sempre contíguos a partir do início: fechar um mês
+    fecha também os meses anteriores ainda abertos, e só o último mês fechado
+    pode ser reaberto.
+    """
+
+    __tablename__ = "tbl_FINPeriodoFechado"
+
+    IdPeriodoFechado = Column(Integer, primary_key=True, name='IdPeriodoFechado')
+    Ano = Column(Integer, name='Ano', nullable=False)
+    Mes = Column(Integer, name='Mes', nullable=False)
+    DatFechamento = Column(DateTime, name='DatFechamento', default=datetime.now, nullable=False)
+    NomUsuario = Column(String(20), name='NomUsuario', nullable=False)
+
+    __table_args__ = (
+        Index('IX_FINPeriodoFechado_Mes', 'Ano', 'Mes', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<PeriodoFechado(Ano={self.Ano}, Mes={self.Mes})>"
+
+
+class FechamentoTotal(Base):
+    """
+    Totais dos lançamentos confirmados de um mês fechado (tbl_FINFechamentoTotal).
+
+    Cada linha agrega um mês por empresa, tipo de movimento e uma dimensão
+    (categoria, favorecido, conta ou empresa); CodReferencia é o código da
+    categoria/favorecido/conta/empresa conforme a dimensão.
+    """
+
+    __tablename__ = "tbl_FINFechamentoTotal"
+
+    IdFechamentoTotal = Column(Integer, primary_key=True, name='IdFechamentoTotal')
+    Ano = Column(Integer, name='Ano', nullable=False)
+    Mes = Column(Integer, name='Mes', nullable=False)
+    Dimensao = Column(String(12), name='Dimensao', nullable=False)
+    CodEmpresa = Column(Integer, name='CodEmpresa')
+    CodReferencia = Column(Integer, name='CodReferencia')
+    IndMov = Column(Boolean, name='IndMov', nullable=False)
+    Valor = Column(Numeric(19,4), name='Valor', nullable=False, default=0)
+    Quantidade = Column(Integer, name='Quantidade', nullable=False, default=0)
+
+    __table_args__ = (
+        Index('IX_FINFechamentoTotal_Dimensao_Mes', 'Dimensao', 'Ano', 'Mes'),
+    )
+
+    def __repr__(self):
+        return f"<FechamentoTotal(Ano={self.Ano}, Mes={self.Mes}, Dimensao='{self.Dimensao}', CodReferencia={self.CodReferencia})>"
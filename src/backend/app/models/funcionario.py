@@ -2,12 +2,22 @@
 Modelo do funcionário para autenticação
 """
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Numeric, Date
+from sqlalchemy.orm import deferred, undefer_group
 from datetime import datetime
 from .base import Base
 
+# Grupo das colunas grandes (imagens e configurações), fora das consultas por padrão
+BLOB_GROUP = "blobs"
+
 
 class TblFuncionarios(Base):
-    """Modelo da tabela tbl_Funcionarios para autenticação"""
+    """
+    Modelo da tabela tbl_Funcionarios para autenticação.
+
+    Foto, AssinaturaDigitalizada e Settings não são carregadas nas consultas
+    do modelo e o acesso sem carregá-las gera erro, em vez de uma consulta
+    extra por funcionário. Consultas que precisam delas usam with_blobs().
+    """
     
     __tablename__ = 'tbl_Funcionarios'
     
@@ -27,12 +37,12 @@ class TblFuncionarios(Base):
     Email = Column(String(100), name='Email')
     Login = Column(String(15), name='Login')
     Senha = Column(String(30), name='Senha')
-    AssinaturaDigitalizada = Column(Text, name='AssinaturaDigitalizada')  # image type
+    AssinaturaDigitalizada = deferred(Column(Text, name='AssinaturaDigitalizada'), group=BLOB_GROUP, raiseload=True)  # image type
     CodSetor = Column(Integer, name='CodSetor')
     CodFavorecido = Column(Integer, name='CodFavorecido')
     CodFuncao = Column(Integer, name='CodFuncao')
-    Settings = Column(Text, name='Settings')  # varchar(max)
-    Foto = Column(Text, name='Foto')  # image type
+    Settings = deferred(Column(Text, name='Settings'), group=BLOB_GROUP, raiseload=True)  # varchar(max)
+    Foto = deferred(Column(Text, name='Foto'), group=BLOB_GROUP, raiseload=True)  # image type
     DatCadastro = Column(DateTime, name='DatCadastro', nullable=False)
     NomUsuario = Column(String(15), name='NomUsuario', nullable=False)
     DatAlteracao = Column(DateTime, name='DatAlteracao')
@@ -43,4 +53,21 @@ class TblFuncionarios(Base):
         return self.DatDemissao is None
     
     def __repr__(self):
-        return f"<TblFuncionarios(CodFuncionario={self.CodFuncionario}, Login='{self.Login}', Nome='{self.Nome}')>"
\ No newline at end of file
+        return f"<TblFuncionarios(CodFuncionario={self.CodFuncionario}, Login='{self.Login}', Nome='{self.Nome}')>"
+
+
+# Colunas usadas na validação do token e pelas rotas via current_user
+AUTH_COLUMNS = (
+    TblFuncionarios.CodFuncionario,
+    TblFuncionarios.Login,
+    TblFuncionarios.Nome,
+    TblFuncionarios.Email,
+    TblFuncionarios.CodSetor,
+    TblFuncionarios.CodFuncao,
+    TblFuncionarios.DatDemissao,
+)
+
+
+def with_blobs():
+    """Opção de consulta que carrega foto, assinatura e configurações do funcionário"""
+    return undefer_group(BLOB_GROUP)
@@ -0,0 +1,51 @@
+"""
+Modelos de Plano de Contas e Centros de Custo
+"""
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+
+
+class ChartOfAccounts(Base):
+    """Modelo para o plano de contas (estrutura hierárquica por ParentId)"""
+    
+    __tablename__ = "tbl_ChartOfAccounts"
+
+    # Campos baseados na estrutura real do banco
+    id = Column(Integer, primary_key=True, name='IdChartOfAccounts')
+    id_company = Column(Integer, ForeignKey('tbl_Empresa.CodEmpresa'), name='IdCompany', default=1, nullable=False)
+    parent_id = Column(Integer, ForeignKey('tbl_ChartOfAccounts.IdChartOfAccounts'), name='ParentId')
+    account_name = Column(String(150), name='AccountName')
+    account_type = Column(String(50), name='AccountType')
+    is_active = Column(Boolean, name='IsActive', default=True, nullable=False)
+    is_payable = Column(Boolean, name='IsPayable', default=False, nullable=False)
+    id_user_create = Column(Integer, name='IdUserCreate', nullable=False)
+    id_user_alter = Column(Integer, name='IdUserAlter')
+    date_create = Column(DateTime, name='DateCreate', nullable=False, default=datetime.now)
+    date_update = Column(DateTime, name='DateUpdate')
+    
+    def __repr__(self):
+        return f"<ChartOfAccounts(id={self.id}, account_name='{self.account_name}', parent_id={self.parent_id})>"
+
+
+class CostCenter(Base):
+    """Modelo para centros de custo"""
+    
+    __tablename__ = "tbl_CostCenters"
+
+    # Campos baseados na estrutura real do banco
+    id = Column(Integer, primary_key=True, name='IdCostCenter')
+    id_company = Column(Integer, ForeignKey('tbl_Empresa.CodEmpresa'), name='IdCompany', default=1, nullable=False)
+    id_centers_manager = Column(Integer, name='IdCentersManager', default=1, nullable=False)
+    parent_id = Column(Integer, ForeignKey('tbl_CostCenters.IdCostCenter'), name='ParentId')
+    name = Column(String(100), name='Name', nullable=False)
+    description = Column(String(200), name='Description')
+    is_active = Column(Boolean, name='IsActive', default=True, nullable=False)
+    id_chart_of_accounts = Column(Integer, ForeignKey('tbl_ChartOfAccounts.IdChartOfAccounts'), name='IdChartOfAccounts')
+    id_user_create = Column(Integer, name='IdUserCreate', nullable=False)
+    id_user_alter = Column(Integer, name='IdUserAlter')
+    date_create = Column(DateTime, name='DateCreate', nullable=False, default=datetime.now)
+    date_update = Column(DateTime, name='DateUpdate')
+    
+    def __repr__(self):
+        return f"<CostCenter(id={self.id}, name='{self.name}')>"
@@ -0,0 +1,33 @@
+"""
+Modelo de Saldos Diários por Conta
+"""
+from sqlalchemy import Column, Integer, Numeric, Date, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+
+
+class SaldoDia(Base):
+    """
+    Snapshot diário do saldo de uma conta (tbl_FINSaldoDia).
+
+    Existe uma linha apenas para os dias com movimento confirmado:
+    SaldoFinal = SaldoInicial + SaldoDia, e o SaldoInicial de um dia é o
+    SaldoFinal do dia anterior com movimento.
+    """
+
+    __tablename__ = "tbl_FINSaldoDia"
+
+    idSaldoDia = Column(Integer, primary_key=True, name='idSaldoDia')
+    idConta = Column(Integer, name='idConta')
+    Data = Column(Date, name='Data')
+    SaldoInicial = Column(Numeric(19,4), name='SaldoInicial', default=0)
+    SaldoDia = Column(Numeric(19,4), name='SaldoDia', default=0)  # movimento líquido do dia
+    SaldoFinal = Column(Numeric(19,4), name='SaldoFinal', default=0)
+    DatProcessamento = Column(DateTime, name='DatProcessamento', default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('IX_FINSaldoDia_Conta_Data', 'idConta', 'Data'),
+    )
+
+    def __repr__(self):
+        return f"<SaldoDia(idConta={self.idConta}, Data={self.Data}, SaldoFinal={self.SaldoFinal})>"
@@ -0,0 +1,34 @@
+"""
+Modelo da situação calculada dos títulos a pagar/receber
+"""
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+
+
+class SituacaoTitulo(Base):
+    """
+    Situação (aberto/vencido) e dias de atraso dos títulos em aberto.
+
+    As tabelas tbl_AccountsPayable e tbl_AccountsReceivable não guardam a
+    situação do título; ela é recalculada periodicamente pelo agendador para
+    todos os títulos sem pagamento. Títulos pagos não possuem linha.
+    """
+
+    __tablename__ = "tbl_FINSituacaoTitulo"
+
+    IdSituacaoTitulo = Column(Integer, primary_key=True, name='IdSituacaoTitulo')
+    Tipo = Column(String(10), name='Tipo', nullable=False)  # pagar, receber
+    IdTitulo = Column(Integer, name='IdTitulo', nullable=False)
+    Status = Column(String(1), name='Status', nullable=False)  # A - Aberto, V - Vencido
+    DiasAtraso = Column(Integer, name='DiasAtraso', nullable=False, default=0)
+    DataBase = Column(Date, name='DataBase', nullable=False)  # data de referência do cálculo
+    DatAtualizacao = Column(DateTime, name='DatAtualizacao', default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('IX_FINSituacaoTitulo_Titulo', 'Tipo', 'IdTitulo', unique=True),
+        Index('IX_FINSituacaoTitulo_Status', 'Tipo', 'Status'),
+    )
+
+    def __repr__(self):
+        return f"<SituacaoTitulo(Tipo='{self.Tipo}', IdTitulo={self.IdTitulo}, Status='{self.Status}', DiasAtraso={self.DiasAtraso})>"
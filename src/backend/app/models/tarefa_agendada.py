@@ -0,0 +1,29 @@
+"""
+Modelo de controle das tarefas agendadas
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, Text, Boolean
+from app.core.database import Base
+
+
+class TarefaAgendada(Base):
+    """
+    Controle de execução das tarefas do agendador (tbl_FINTarefaAgendada).
+
+    A linha de cada tarefa funciona também como lease: apenas o processo
+    indicado em Lider pode executá-la até LeaseAte, o que evita execuções
+    duplicadas quando a API roda com vários workers.
+    """
+
+    __tablename__ = "tbl_FINTarefaAgendada"
+
+    Nome = Column(String(50), primary_key=True, name='Nome')
+    Lider = Column(String(100), name='Lider')  # processo que detém o lease
+    LeaseAte = Column(DateTime, name='LeaseAte')
+    UltimaExecucao = Column(DateTime, name='UltimaExecucao')
+    DuracaoSegundos = Column(Numeric(12,3), name='DuracaoSegundos')
+    Registros = Column(Integer, name='Registros')  # registros processados na última execução
+    Sucesso = Column(Boolean, name='Sucesso')
+    Erro = Column(Text, name='Erro')
+
+    def __repr__(self):
+        return f"<TarefaAgendada(Nome='{self.Nome}', UltimaExecucao={self.UltimaExecucao}, Lider='{self.Lider}')>"
@@ -0,0 +1,24 @@
+"""
+Modelo dos contadores de alteração por tabela
+"""
+from sqlalchemy import Column, String, DateTime, BigInteger
+from app.core.database import Base
+
+
+class VersaoTabela(Base):
+    """
+    Versão de cada tabela alterada pela API (tbl_FINVersaoTabela).
+
+    Versao é incrementada na mesma transação que insere, altera ou exclui
+    registros da tabela; DatAlteracao (UTC) é o instante do último incremento.
+    As versões compõem os ETags das rotas de leitura.
+    """
+
+    __tablename__ = "tbl_FINVersaoTabela"
+
+    Tabela = Column(String(64), primary_key=True, name='Tabela')
+    Versao = Column(BigInteger, name='Versao', nullable=False, default=0)
+    DatAlteracao = Column(DateTime, name='DatAlteracao', nullable=False)
+
+    def __repr__(self):
+        return f"<VersaoTabela(Tabela='{self.Tabela}', Versao={self.Versao})>"
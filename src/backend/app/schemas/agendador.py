@@ -0,0 +1,20 @@
+"""
+Schemas para o agendador de tarefas
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class TarefaAgendadaResponse(BaseModel):
+    """Situação de uma tarefa agendada"""
+    nome: str
+    descricao: str
+    intervalo_segundos: int
+    ultima_execucao: Optional[datetime] = None
+    proxima_execucao: Optional[datetime] = None
+    duracao_segundos: Optional[float] = None
+    registros: Optional[int] = None
+    sucesso: Optional[bool] = None
+    erro: Optional[str] = None
+    lider: Optional[str] = None
@@ -0,0 +1,10 @@
+"""
+Schemas para autocomplete
+"""
+from pydantic import BaseModel, Field
+
+
+class AutocompleteItem(BaseModel):
+    """Sugestão de autocomplete (apenas id e label)"""
+    id: int = Field(..., description="Código do registro")
+    label: str = Field(..., description="Texto exibido no seletor")
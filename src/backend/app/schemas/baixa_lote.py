@@ -0,0 +1,55 @@
+"""
+Schemas para baixa em lote de contas a pagar e a receber
+"""
+from pydantic import BaseModel, Field
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+
+class BaixaLoteItem(BaseModel):
+    """Pagamento/recebimento de um título do lote"""
+    id: int = Field(..., gt=0, description="Código do título")
+    valor: Decimal = Field(..., description="Valor pago/recebido")
+    data: date = Field(..., description="Data do pagamento/recebimento")
+    id_conta: Optional[int] = Field(None, gt=0, description="Conta bancária (padrão: conta do título)")
+    id_forma_pagamento: Optional[int] = Field(None, gt=0, description="Forma de pagamento (padrão: a do lote)")
+    multa: Decimal = Field(default=Decimal("0"), ge=0, description="Multa incluída no valor")
+    juros: Decimal = Field(default=Decimal("0"), ge=0, description="Juros incluídos no valor")
+    desconto: Decimal = Field(default=Decimal("0"), ge=0, description="Desconto concedido")
+
+
+class BaixaLoteRequest(BaseModel):
+    """Lote de pagamentos/recebimentos"""
+    itens: List[BaixaLoteItem] = Field(..., min_length=1, max_length=5000, description="Títulos a baixar")
+    id_forma_pagamento: Optional[int] = Field(None, gt=0, description="Forma de pagamento padrão dos itens")
+    tudo_ou_nada: bool = Field(default=False, description="Não processar nenhum item se algum for inválido")
+
+
+class BaixaLoteItemResult(BaseModel):
+    """Resultado de um item do lote"""
+    indice: int
+    id: int
+    sucesso: bool
+    mensagem: str
+    valor_pago: Optional[Decimal] = None
+    saldo: Optional[Decimal] = None
+    quitado: bool
+
+
+class BaixaLoteTituloResult(BaseModel):
+    """Situação final de um título baixado no lote"""
+    id: int
+    valor_devido: Decimal
+    valor_pago: Decimal
+    saldo: Decimal
+    quitado: bool
+
+
+class BaixaLoteResponse(BaseModel):
+    """Resultado do lote"""
+    total: int
+    processados: int
+    rejeitados: int
+    itens: List[BaixaLoteItemResult]
+    titulos: List[BaixaLoteTituloResult] = []
@@ -0,0 +1,38 @@
+"""
+Schemas para conciliação bancária
+"""
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import List, Optional
+
+
+class ConciliacaoRequest(BaseModel):
+    """Parâmetros da conciliação automática"""
+    data_inicio: date = Field(..., description="Início do período do extrato")
+    data_fim: date = Field(..., description="Fim do período do extrato")
+    id_conta: Optional[int] = Field(None, description="Conta (padrão: todas)")
+    tolerancia_dias: Optional[int] = Field(None, ge=0, le=30, description="Janela de datas em dias")
+    score_auto: Optional[float] = Field(None, ge=0, le=1, description="Pontuação mínima para confirmar automaticamente")
+    auto_confirmar: bool = Field(default=True, description="Confirmar automaticamente os pares com pontuação suficiente")
+
+
+class ConciliacaoPar(BaseModel):
+    """Par linha de extrato x lançamento"""
+    IdOfxDados: int
+    CodLancamento: int
+    score: float
+    confirmado: bool
+
+
+class ConciliacaoResponse(BaseModel):
+    """Resultado da conciliação automática"""
+    linhas_analisadas: int
+    propostos: int
+    confirmados: int
+    sem_correspondencia: int
+    pares: List[ConciliacaoPar]
+
+
+class ConciliacaoConfirmarRequest(BaseModel):
+    """Linhas de extrato com pares propostos a confirmar"""
+    ids: List[int] = Field(..., min_length=1, description="IdOfxDados a confirmar")
@@ -2,8 +2,8 @@
 Schemas for Conta (Bank Account) module
 """
 from pydantic import BaseModel, Field, validator
-from datetime import datetime
-from typing import Optional, Literal
+from datetime import date, datetime
+from typing import List, Optional, Literal
 from decimal import Decimal
 
 
@@ -97,4 +97,28 @@ class ContaResponse(ContaBase):
 
     def get_saldo_formatado(self) -> str:
         """Retorna saldo formatado em reais"""
-        return f"R$ {self.Saldo:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
\ No newline at end of file
+        return f"R$ {self.Saldo:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+
+class SaldoContaResponse(BaseModel):
+    """Schema for account balance at a date"""
+    idConta: int
+    data: date
+    saldo: Decimal
+
+
+class SaldoDiaResponse(BaseModel):
+    """Schema for a daily balance snapshot"""
+    data: date
+    saldo_inicial: Decimal
+    movimento: Decimal
+    saldo_final: Decimal
+
+
+class SaldoHistoricoResponse(BaseModel):
+    """Schema for account balance history"""
+    idConta: int
+    data_inicio: date
+    data_fim: date
+    saldo_inicial: Decimal = Field(..., description="Saldo no início do período")
+    saldo_final: Decimal = Field(..., description="Saldo no fim do período")
+    dias: List[SaldoDiaResponse] = Field(default_factory=list, description="Dias com movimento no período")
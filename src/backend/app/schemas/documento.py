@@ -0,0 +1,17 @@
+"""
+Schemas para o índice de documentos (CPF/CNPJ)
+"""
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class DocumentoLookup(BaseModel):
+    """Schema para resultado de busca por documento"""
+    entidade: str = Field(..., description="Entidade de origem")
+    documento: str = Field(..., description="Documento (apenas dígitos)")
+    codigos: List[int] = Field(..., description="Códigos dos registros com o documento")
+
+
+class DocumentoDuplicado(DocumentoLookup):
+    """Schema para documento presente em mais de um registro"""
+    pass
@@ -0,0 +1,18 @@
+"""
+Schemas para importação de extratos bancários
+"""
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import Optional
+
+
+class ExtratoImportResponse(BaseModel):
+    """Resumo da importação de um extrato"""
+    IdOfxFile: int = Field(..., description="Arquivo registrado")
+    idConta: int = Field(..., description="Conta do extrato")
+    formato: str = Field(..., description="OFX, CNAB240 ou CNAB400")
+    data_inicial: Optional[date] = Field(None, description="Início do período do extrato")
+    data_final: Optional[date] = Field(None, description="Fim do período do extrato")
+    linhas_lidas: int = Field(..., description="Linhas lidas do arquivo")
+    importadas: int = Field(..., description="Transações gravadas")
+    duplicadas: int = Field(..., description="Transações ignoradas por já terem sido importadas")
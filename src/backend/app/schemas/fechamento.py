@@ -0,0 +1,29 @@
+"""
+Schemas para o fechamento mensal de lançamentos
+"""
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional
+
+
+class FechamentoRequest(BaseModel):
+    """Mês a fechar (os meses anteriores ainda abertos também são fechados)"""
+    ano: int = Field(..., ge=1900, le=9999, description="Ano")
+    mes: int = Field(..., ge=1, le=12, description="Mês")
+
+
+class PeriodoFechadoResponse(BaseModel):
+    """Mês fechado"""
+    ano: int
+    mes: int
+    data_fechamento: datetime
+    usuario: str
+
+
+class FechamentoTotalResponse(BaseModel):
+    """Total gravado no fechamento para uma referência da dimensão"""
+    empresa_id: Optional[int] = None
+    referencia: Optional[int] = None
+    entrada: bool
+    valor: float
+    quantidade: int
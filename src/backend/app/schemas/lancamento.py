@@ -34,6 +34,21 @@ class LancamentoCreate(LancamentoBase):
     pass
 
 
+class LancamentoSerieCreate(LancamentoBase):
+    """Schema para criação de lançamentos parcelados ou recorrentes"""
+    tipo: Literal['parcelado', 'recorrente'] = Field(..., description="Parcelado divide o valor; recorrente repete o valor")
+    FlgFrequencia: int = Field(3, description="Código da frequência (padrão: mensal)")
+    qtd_parcelas: Optional[int] = Field(None, ge=1, description="Quantidade de parcelas/ocorrências (vazio = recorrência sem fim)")
+    ajustar_dia_util: bool = Field(default=False, description="Move vencimentos de sábado/domingo para a segunda-feira seguinte (apenas parcelamentos)")
+
+
+class LancamentoSerieResponse(BaseModel):
+    """Schema para resposta da geração de série"""
+    CodLancamentoOrigem: int = Field(..., description="Primeiro lançamento da série")
+    gerados: int = Field(..., description="Lançamentos gravados")
+    datas: List[date] = Field(..., description="Datas dos lançamentos gravados")
+
+
 class LancamentoUpdate(BaseModel):
     """Schema para atualização de lançamento"""
     Data: Optional[date] = Field(None, description="Data do lançamento")
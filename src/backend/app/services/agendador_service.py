@@ -0,0 +1,219 @@
+"""
+Agendador de tarefas de manutenção executado dentro do processo da API
+
+Cada worker do uvicorn roda o seu próprio laço, mas uma tarefa só é
+executada pelo worker que obtiver o lease na tbl_FINTarefaAgendada. O mesmo
+UPDATE que obtém o lease verifica se a tarefa está vencida, então workers
+diferentes não repetem uma execução recente.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select, update, insert, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.situacao_titulo import SituacaoTitulo
+from app.models.tarefa_agendada import TarefaAgendada
+from app.services.parcelamento_service import ParcelamentoService
+from app.services.status_titulo_service import StatusTituloService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Tarefa:
+    """Tarefa periódica: função que recebe a sessão e retorna os registros processados"""
+    nome: str
+    descricao: str
+    intervalo: int  # seconds
+    executar: Callable[[Session], int]
+
+
+def _materializar_recorrencias(db: Session) -> int:
+    ate = date.today() + timedelta(days=settings.LANCAMENTO_RECORRENCIA_HORIZONTE_DIAS)
+    return ParcelamentoService(db).materializar_recorrencias(ate)
+
+
+def tarefas_padrao() -> List[Tarefa]:
+    """Tarefas registradas no agendador da aplicação"""
+    return [
+        Tarefa(
+            nome="status_titulos",
+            descricao="Situação e dias de atraso das contas a pagar/receber",
+            intervalo=settings.AGENDADOR_INTERVALO_STATUS_TITULOS,
+            executar=lambda db: StatusTituloService(db).atualizar_todos(),
+        ),
+        Tarefa(
+            nome="recorrencias",
+            descricao="Materialização de lançamentos recorrentes",
+            intervalo=settings.AGENDADOR_INTERVALO_RECORRENCIAS,
+            executar=_materializar_recorrencias,
+        ),
+    ]
+
+
+class Agendador:
+    """Executa as tarefas periódicas com lease no banco para ter um único líder"""
+
+    def __init__(
+        self,
+        tarefas: Optional[List[Tarefa]] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        identidade: Optional[str] = None
+    ):
+        self.tarefas: Dict[str, Tarefa] = {t.nome: t for t in (tarefas if tarefas is not None else tarefas_padrao())}
+        self.session_factory = session_factory
+        self.identidade = identidade or f"{socket.gethostname()}:{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+
+    def iniciar(self) -> None:
+        """Inicia o laço do agendador no event loop atual"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def parar(self) -> None:
+        """Interrompe o laço (a execução em andamento termina na sua thread)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        await asyncio.to_thread(self.criar_tabelas)
+        while True:
+            for nome in self.tarefas:
+                try:
+                    await asyncio.to_thread(self.executar, nome)
+                except Exception as e:
+                    logger.error(f"Erro no agendador ({nome}): {e}")
+            await asyncio.sleep(settings.AGENDADOR_TICK)
+
+    def criar_tabelas(self) -> None:
+        """Cria as tabelas de controle se ainda não existirem"""
+        db = self.session_factory()
+        try:
+            bind = db.get_bind()
+            TarefaAgendada.__table__.create(bind=bind, checkfirst=True)
+            SituacaoTitulo.__table__.create(bind=bind, checkfirst=True)
+        finally:
+            db.close()
+
+    def executar(self, nome: str, forcar: bool = False) -> Optional[Dict]:
+        """
+        Executa a tarefa se este processo obtiver o lease.
+
+        Sem forcar, a tarefa só roda se o intervalo desde a última execução
+        já passou. Retorna a situação da tarefa, ou None se outro processo é
+        o líder ou a tarefa ainda não está vencida.
+        """
+        tarefa = self.tarefas[nome]
+        db = self.session_factory()
+        try:
+            if not self._adquirir_lease(db, tarefa, forcar):
+                return None
+
+            inicio = time.perf_counter()
+            registros = None
+            erro = None
+            try:
+                registros = tarefa.executar(db)
+            except Exception as e:
+                db.rollback()
+                erro = str(e)
+                logger.error(f"Tarefa {nome} falhou: {e}")
+            duracao = round(time.perf_counter() - inicio, 3)
+
+            agora = datetime.now()
+            db.execute(
+                update(TarefaAgendada).where(TarefaAgendada.Nome == nome).values(
+                    UltimaExecucao=agora,
+                    DuracaoSegundos=duracao,
+                    Registros=registros,
+                    Sucesso=erro is None,
+                    Erro=erro,
+                    LeaseAte=agora  # libera o lease
+                )
+            )
+            db.commit()
+            logger.info(f"Tarefa {nome} executada em {duracao}s ({registros} registros)")
+            return self._to_dict(tarefa, db.get(TarefaAgendada, nome))
+        finally:
+            db.close()
+
+    def listar(self, db: Session) -> List[Dict]:
+        """Situação de todas as tarefas registradas"""
+        controles = {
+            controle.Nome: controle
+            for controle in db.execute(
+                select(TarefaAgendada).where(TarefaAgendada.Nome.in_(list(self.tarefas)))
+            ).scalars()
+        }
+        return [self._to_dict(tarefa, controles.get(nome)) for nome, tarefa in self.tarefas.items()]
+
+    def _adquirir_lease(self, db: Session, tarefa: Tarefa, forcar: bool) -> bool:
+        agora = datetime.now()
+        condicoes = [
+            TarefaAgendada.Nome == tarefa.nome,
+            or_(
+                TarefaAgendada.LeaseAte.is_(None),
+                TarefaAgendada.LeaseAte <= agora,
+                TarefaAgendada.Lider == self.identidade
+            )
+        ]
+        if not forcar:
+            condicoes.append(or_(
+                TarefaAgendada.UltimaExecucao.is_(None),
+                TarefaAgendada.UltimaExecucao <= agora - timedelta(seconds=tarefa.intervalo)
+            ))
+
+        lease = agora + timedelta(seconds=settings.AGENDADOR_LEASE)
+        result = db.execute(
+            update(TarefaAgendada).where(*condicoes).values(Lider=self.identidade, LeaseAte=lease)
+        )
+        if result.rowcount == 1:
+            db.commit()
+            return True
+        db.rollback()
+
+        if db.get(TarefaAgendada, tarefa.nome) is not None:
+            return False
+
+        # Primeira execução: quem inserir a linha é o líder
+        try:
+            db.execute(insert(TarefaAgendada).values(Nome=tarefa.nome, Lider=self.identidade, LeaseAte=lease))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+
+    @staticmethod
+    def _to_dict(tarefa: Tarefa, controle: Optional[TarefaAgendada]) -> Dict:
+        ultima = controle.UltimaExecucao if controle else None
+        return {
+            "nome": tarefa.nome,
+            "descricao": tarefa.descricao,
+            "intervalo_segundos": tarefa.intervalo,
+            "ultima_execucao": ultima,
+            "proxima_execucao": ultima + timedelta(seconds=tarefa.intervalo) if ultima else None,
+            "duracao_segundos": float(controle.DuracaoSegundos) if controle and controle.DuracaoSegundos is not None else None,
+            "registros": controle.Registros if controle else None,
+            "sucesso": controle.Sucesso if controle else None,
+            "erro": controle.Erro if controle else None,
+            "lider": controle.Lider if controle else None,
+        }
+
+
+agendador = Agendador()
@@ -1,12 +1,13 @@
 """
 Serviço de autenticação
 """
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from fastapi import HTTPException, status
 from datetime import timedelta
-from app.models.funcionario import TblFuncionarios
+from app.models.funcionario import TblFuncionarios, AUTH_COLUMNS
 from app.schemas.auth import LoginRequest, LoginResponse, UserInfo
 from app.core.security import hash_util, jwt_util
+from app.core.access_control import login_rate_limiter, token_revocation
 from app.core.config import settings
 
 
@@ -16,15 +17,21 @@ class AuthService:
     def __init__(self, db: Session):
         self.db = db
     
-    async def authenticate_user(self, login_data: LoginRequest) -> LoginResponse:
+    async def authenticate_user(self, login_data: LoginRequest, client_ip: str = "desconhecido") -> LoginResponse:
         """Autentica usuário usando credenciais da tabela tbl_Funcionarios"""
         
-        # Buscar funcionário pelo login
-        funcionario = self.db.query(TblFuncionarios).filter(
+        # Limites de tentativas antes de qualquer consulta ao banco
+        login_rate_limiter.check(client_ip, login_data.login)
+        
+        # Buscar funcionário pelo login (só as colunas da autenticação e a senha)
+        funcionario = self.db.query(TblFuncionarios).options(
+            load_only(*AUTH_COLUMNS, TblFuncionarios.Senha)
+        ).filter(
             TblFuncionarios.Login == login_data.login
         ).first()
         
         if not funcionario:
+            login_rate_limiter.failure(client_ip, login_data.login)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuário não encontrado"
@@ -39,11 +46,14 @@ class AuthService:
         
         # Verificar senha
         if not hash_util.verificar_senha(login_data.senha, funcionario.Senha):
+            login_rate_limiter.failure(client_ip, login_data.login)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuário ou senha incorretos"
             )
         
+        login_rate_limiter.success(client_ip, login_data.login)
+        
         # Gerar token JWT
         access_token_expires = timedelta(hours=settings.ACCESS_TOKEN_EXPIRE_HOURS)
         access_token = jwt_util.create_access_token(
@@ -76,6 +86,13 @@ class AuthService:
         """Obtém o usuário atual baseado no token JWT"""
         payload = jwt_util.verify_token(token)
         
+        if token_revocation.is_revoked(payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revogado",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
         cod_funcionario = payload.get("sub")
         if cod_funcionario is None:
             raise HTTPException(
@@ -83,7 +100,9 @@ class AuthService:
                 detail="Token inválido"
             )
         
-        funcionario = self.db.query(TblFuncionarios).filter(
+        funcionario = self.db.query(TblFuncionarios).options(
+            load_only(*AUTH_COLUMNS)
+        ).filter(
             TblFuncionarios.CodFuncionario == int(cod_funcionario)
         ).first()
         
@@ -93,4 +112,8 @@ class AuthService:
                 detail="Usuário não encontrado ou inativo"
             )
         
-        return funcionario
\ No newline at end of file
+        return funcionario
+    
+    def logout(self, token: str) -> None:
+        """Revoga o token até o seu vencimento"""
+        token_revocation.revoke(jwt_util.verify_token(token))
@@ -0,0 +1,159 @@
+"""
+Serviço de autocomplete (typeahead) para os seletores do frontend
+"""
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.models.favorecido import Favorecido
+from app.models.cliente import Cliente
+from app.models.categoria import Categoria
+
+
+# Entidades disponíveis: (modelo, coluna id, coluna label, filtros fixos)
+AUTOCOMPLETE_ENTITIES = {
+    "favorecidos": (Favorecido, Favorecido.CodFavorecido, Favorecido.DesFavorecido, ()),
+    "clientes": (Cliente, Cliente.CodCliente, Cliente.DesCliente, ()),
+    "categorias": (Categoria, Categoria.CodCategoria, Categoria.DesCategoria, (Categoria.FlgAtivo == 'S',)),
+}
+
+
+def normalize_term(term: Optional[str]) -> str:
+    """Normaliza o termo para comparação (sem acentos e sem diferenciar maiúsculas)"""
+    if not term:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", term.strip())
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class PrefixCache:
+    """
+    Cache LRU de prefixos consultados recentemente.
+
+    Cada entrada guarda os candidatos (id, label, label normalizado) de um prefixo
+    e se a lista está completa, isto é, se o banco retornou menos candidatos que o
+    limite. Uma entrada completa para "ab" responde "abc" filtrando em memória.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, List[Tuple[int, str, str]], bool]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.refinements = 0
+        self.misses = 0
+
+    def get(self, entity: str, prefix: str) -> Optional[List[Tuple[int, str, str]]]:
+        """Retorna os candidatos do prefixo, refinando um prefixo menor se possível"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._get_valid(entity, prefix, now)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+
+            # Procurar o maior prefixo já consultado cuja lista esteja completa
+            for size in range(len(prefix) - 1, 0, -1):
+                entry = self._get_valid(entity, prefix[:size], now)
+                if entry is None or not entry[2]:
+                    continue
+                items = [item for item in entry[1] if item[2].startswith(prefix)]
+                self._store(entity, prefix, items, True, entry[0])
+                self.refinements += 1
+                return items
+
+            self.misses += 1
+            return None
+
+    def put(self, entity: str, prefix: str, items: List[Tuple[int, str, str]], complete: bool) -> None:
+        """Armazena os candidatos de um prefixo"""
+        with self._lock:
+            self._store(entity, prefix, items, complete, time.monotonic())
+
+    def invalidate(self, entity: Optional[str] = None) -> None:
+        """Descarta as entradas de uma entidade (ou todas)"""
+        with self._lock:
+            if entity is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == entity]:
+                del self._entries[key]
+
+    def _get_valid(self, entity: str, prefix: str, now: float):
+        key = (entity, prefix)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now - entry[0] > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, entity: str, prefix: str, items, complete: bool, created_at: float) -> None:
+        # O refinamento herda o instante de criação da entrada de origem,
+        # para não prolongar a vida de dados já antigos
+        self._entries[(entity, prefix)] = (created_at, items, complete)
+        self._entries.move_to_end((entity, prefix))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Cache compartilhado pelo processo
+autocomplete_cache = PrefixCache(
+    max_entries=settings.AUTOCOMPLETE_CACHE_SIZE,
+    ttl_seconds=settings.AUTOCOMPLETE_CACHE_TTL
+)
+
+
+class AutocompleteService:
+    """Serviço para sugestões de autocomplete (id + label)"""
+
+    def __init__(self, db: Session, cache: PrefixCache = autocomplete_cache):
+        self.db = db
+        self.cache = cache
+
+    def search(self, entity: str, termo: str, limit: int = 10) -> List[Dict]:
+        """Buscar sugestões cujo label começa com o termo informado"""
+
+        if entity not in AUTOCOMPLETE_ENTITIES:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Entidade '{entity}' não suporta autocomplete"
+            )
+
+        prefix = normalize_term(termo)
+        if not prefix:
+            return []
+
+        candidates = self.cache.get(entity, prefix)
+        if candidates is None:
+            candidates, complete = self._fetch_candidates(entity, termo.strip())
+            self.cache.put(entity, prefix, candidates, complete)
+
+        return [{"id": item[0], "label": item[1]} for item in candidates[:limit]]
+
+    def _fetch_candidates(self, entity: str, termo: str) -> Tuple[List[Tuple[int, str, str]], bool]:
+        """Consulta por prefixo (LIKE 'termo%'), que aproveita o índice da coluna label"""
+
+        model, id_column, label_column, filters = AUTOCOMPLETE_ENTITIES[entity]
+        candidate_limit = settings.AUTOCOMPLETE_CANDIDATE_LIMIT
+
+        escaped = termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = select(id_column, label_column).where(
+            label_column.like(f"{escaped}%", escape="\\"),
+            *filters
+        ).order_by(label_column).limit(candidate_limit + 1)
+
+        rows = self.db.execute(query).all()
+        complete = len(rows) <= candidate_limit
+        items = [(row[0], row[1], normalize_term(row[1])) for row in rows[:candidate_limit]]
+        return items, complete
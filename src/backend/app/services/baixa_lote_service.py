@@ -0,0 +1,220 @@
+"""
+Baixa em lote de títulos (contas a pagar e a receber)
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, insert, update, bindparam
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.models.funcionario import TblFuncionarios
+
+# Limite de ids por IN (o SQL Server aceita até 2100 parâmetros por comando)
+IN_CHUNK_SIZE = 1000
+
+
+class BaixaLoteService:
+    """
+    Registra vários pagamentos/recebimentos em uma única transação.
+
+    Os títulos do lote são lidos com uma única consulta (em blocos de ids),
+    os itens são validados em memória - acumulando os valores quando o mesmo
+    título aparece mais de uma vez -, os pagamentos são gravados com um
+    executemany e os títulos são atualizados com um único UPDATE parametrizado.
+    Cada item recebe o seu resultado; itens inválidos não impedem a baixa dos
+    demais, a menos que tudo_ou_nada seja informado.
+
+    Multa e juros aumentam o valor devido e o desconto o reduz; o título fica
+    quitado quando o valor pago alcança o devido, senão a baixa é parcial.
+    """
+
+    def __init__(self, db: Session, titulo_model, pagamento_model, pagamento_fk: str, descricao: str):
+        self.db = db
+        self.titulo_model = titulo_model
+        self.pagamento_model = pagamento_model
+        self.pagamento_fk = pagamento_fk  # atributo do pagamento que referencia o título
+        self.descricao = descricao  # "pagamento" / "recebimento", usado nas mensagens
+
+    def baixar(
+        self,
+        itens: List,
+        current_user: TblFuncionarios,
+        id_forma_pagamento: Optional[int] = None,
+        tudo_ou_nada: bool = False
+    ) -> Dict:
+        """Processa os itens e retorna o resultado por item e a situação final de cada título"""
+        titulos = self._carregar({item.id for item in itens})
+
+        resultados = []
+        pagamentos = []
+        alterados: Dict[int, Dict] = {}
+        now = datetime.now()
+
+        for indice, item in enumerate(itens):
+            titulo = titulos.get(item.id)
+            forma = item.id_forma_pagamento or id_forma_pagamento
+            erro = self._validar(item, titulo, forma)
+            if erro:
+                resultados.append(self._resultado(indice, item, False, erro, titulo))
+                continue
+
+            titulo["multa"] += item.multa
+            titulo["juros"] += item.juros
+            titulo["desconto"] += item.desconto
+            titulo["pago"] += item.valor
+            titulo["ultima_data"] = max(titulo["ultima_data"] or item.data, item.data)
+            if item.id_conta:
+                titulo["id_conta"] = item.id_conta
+            titulo["id_forma"] = forma
+            alterados[item.id] = titulo
+
+            pagamentos.append({
+                self.pagamento_fk: item.id,
+                "id_payment_method": forma,
+                "id_bank_account": item.id_conta or titulo["id_conta"],
+                "date": item.data,
+                "amount": item.valor,
+                "id_user_create": current_user.CodFuncionario,
+                "date_create": now
+            })
+            resultados.append(self._resultado(indice, item, True, f"{self.descricao.capitalize()} registrado", titulo))
+
+        rejeitados = sum(1 for r in resultados if not r["sucesso"])
+        if tudo_ou_nada and rejeitados:
+            for resultado in resultados:
+                if resultado["sucesso"]:
+                    resultado["sucesso"] = False
+                    resultado["mensagem"] = "Lote não processado: há itens inválidos"
+            return self._resposta(resultados, {})
+
+        if pagamentos:
+            try:
+                self.db.execute(insert(self.pagamento_model), pagamentos)
+                self._atualizar_titulos(alterados, current_user, now)
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Erro ao registrar {self.descricao} em lote: {str(e)}"
+                )
+
+        return self._resposta(resultados, alterados)
+
+    def _carregar(self, ids) -> Dict[int, Dict]:
+        model = self.titulo_model
+        ids = sorted(ids)
+        titulos = {}
+        for inicio in range(0, len(ids), IN_CHUNK_SIZE):
+            for row in self.db.execute(
+                select(
+                    model.id,
+                    model.amount,
+                    model.paid_amount,
+                    model.payment_date,
+                    model.fine_amount,
+                    model.interest_amount,
+                    model.discount_amount,
+                    model.id_bank_account
+                ).where(model.id.in_(ids[inicio:inicio + IN_CHUNK_SIZE]))
+            ):
+                titulos[row.id] = {
+                    "valor": Decimal(str(row.amount)),
+                    "pago": Decimal(str(row.paid_amount or 0)),
+                    "multa": Decimal(str(row.fine_amount or 0)),
+                    "juros": Decimal(str(row.interest_amount or 0)),
+                    "desconto": Decimal(str(row.discount_amount or 0)),
+                    "quitado": row.payment_date is not None,
+                    "ultima_data": None,
+                    "id_conta": row.id_bank_account,
+                    "id_forma": None,
+                }
+        return titulos
+
+    def _validar(self, item, titulo: Optional[Dict], forma: Optional[int]) -> Optional[str]:
+        if titulo is None:
+            return "Título não encontrado"
+        if titulo["quitado"]:
+            return "Título já quitado"
+        if item.valor <= 0:
+            return f"Valor do {self.descricao} deve ser maior que zero"
+        if not forma:
+            return "Forma de pagamento não informada"
+        devido = self._devido(titulo) + item.multa + item.juros - item.desconto
+        if titulo["pago"] + item.valor > devido:
+            return f"Valor do {self.descricao} excede o valor devido"
+        return None
+
+    def _atualizar_titulos(self, titulos: Dict[int, Dict], current_user: TblFuncionarios, now: datetime) -> None:
+        params = [
+            {
+                "b_id": titulo_id,
+                "b_pago": titulo["pago"],
+                # Data de pagamento só é preenchida quando o título fica quitado
+                "b_data": titulo["ultima_data"] if self._quitado(titulo) else None,
+                "b_multa": titulo["multa"],
+                "b_juros": titulo["juros"],
+                "b_desconto": titulo["desconto"],
+                "b_conta": titulo["id_conta"],
+                "b_forma": titulo["id_forma"],
+            }
+            for titulo_id, titulo in titulos.items()
+        ]
+        self.db.execute(
+            update(self.titulo_model.__table__)
+            .where(self.titulo_model.id == bindparam("b_id"))
+            .values({
+                "PaidAmount": bindparam("b_pago"),
+                "PaymentDate": bindparam("b_data"),
+                "FineAmount": bindparam("b_multa"),
+                "InterestAmount": bindparam("b_juros"),
+                "DiscountAmount": bindparam("b_desconto"),
+                "IdBankAccount": bindparam("b_conta"),
+                "IdPaymentMethod": bindparam("b_forma"),
+                "IdUserAlter": current_user.CodFuncionario,
+                "DateUpdate": now
+            }),
+            params
+        )
+
+    @staticmethod
+    def _devido(titulo: Dict) -> Decimal:
+        return titulo["valor"] + titulo["multa"] + titulo["juros"] - titulo["desconto"]
+
+    @classmethod
+    def _quitado(cls, titulo: Dict) -> bool:
+        return titulo["pago"] >= cls._devido(titulo)
+
+    @classmethod
+    def _resultado(cls, indice: int, item, sucesso: bool, mensagem: str, titulo: Optional[Dict]) -> Dict:
+        return {
+            "indice": indice,
+            "id": item.id,
+            "sucesso": sucesso,
+            "mensagem": mensagem,
+            "valor_pago": titulo["pago"] if titulo else None,
+            "saldo": cls._devido(titulo) - titulo["pago"] if titulo else None,
+            "quitado": bool(titulo) and cls._quitado(titulo),
+        }
+
+    @classmethod
+    def _resposta(cls, resultados: List[Dict], titulos: Dict[int, Dict]) -> Dict:
+        processados = sum(1 for r in resultados if r["sucesso"])
+        return {
+            "total": len(resultados),
+            "processados": processados,
+            "rejeitados": len(resultados) - processados,
+            "itens": resultados,
+            "titulos": [
+                {
+                    "id": titulo_id,
+                    "valor_devido": cls._devido(titulo),
+                    "valor_pago": titulo["pago"],
+                    "saldo": cls._devido(titulo) - titulo["pago"],
+                    "quitado": cls._quitado(titulo),
+                }
+                for titulo_id, titulo in titulos.items()
+            ],
+        }
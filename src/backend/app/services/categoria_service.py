@@ -13,6 +13,7 @@ from app.schemas.categoria import (
     CategoriaUpdate, 
     CategoriaResponse
 )
+from app.services.autocomplete_service import autocomplete_cache
 
 
 class CategoriaService:
@@ -46,6 +47,7 @@ class CategoriaService:
         try:
             self.db.add(categoria)
             self.db.commit()
+            autocomplete_cache.invalidate("categorias")
             self.db.refresh(categoria)
             return categoria
         except Exception as e:
@@ -152,6 +154,7 @@ class CategoriaService:
             categoria.NomUsuario = current_user.Login
             
             self.db.commit()
+            autocomplete_cache.invalidate("categorias")
             self.db.refresh(categoria)
             return categoria
             
@@ -191,6 +194,7 @@ class CategoriaService:
             categoria.NomUsuario = current_user.Login
             
             self.db.commit()
+            autocomplete_cache.invalidate("categorias")
         except Exception as e:
             self.db.rollback()
             raise HTTPException(
@@ -217,6 +221,7 @@ class CategoriaService:
             categoria.NomUsuario = current_user.Login
             
             self.db.commit()
+            autocomplete_cache.invalidate("categorias")
             self.db.refresh(categoria)
             return categoria
             
@@ -267,6 +272,7 @@ class CategoriaService:
             categoria.NomUsuario = current_user.Login
             
             self.db.commit()
+            autocomplete_cache.invalidate("categorias")
             self.db.refresh(categoria)
             return categoria
             
@@ -5,11 +5,12 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from fastapi import HTTPException, status
-import re
 
 from app.models.cliente import Cliente
 from app.models.funcionario import TblFuncionarios
 from app.schemas.cliente import ClienteCreate, ClienteUpdate
+from app.services.autocomplete_service import autocomplete_cache
+from app.services.documento_service import DocumentoIndexService, documento_from_term
 
 
 class ClienteService:
@@ -44,7 +45,10 @@ class ClienteService:
 
         try:
             self.db.add(cliente)
+            self.db.flush()
+            DocumentoIndexService(self.db).sync("cliente", cliente.CodCliente, [cliente.CPF, cliente.CNPJ])
             self.db.commit()
+            autocomplete_cache.invalidate("clientes")
             self.db.refresh(cliente)
             return cliente
         except Exception as e:
@@ -104,8 +108,12 @@ class ClienteService:
         if liberados_apenas:
             query = query.filter(Cliente.FlgLiberado == True)
         
-        # Search by term
-        if search_term:
+        # Search by term (documento completo usa o índice normalizado)
+        doc_digits = documento_from_term(search_term)
+        if doc_digits:
+            codigos = DocumentoIndexService(self.db).lookup("cliente", doc_digits)
+            query = query.filter(Cliente.CodCliente.in_(codigos))
+        elif search_term:
             search_filter = or_(
                 Cliente.DesCliente.ilike(f"%{search_term}%"),
                 Cliente.RazaoSocial.ilike(f"%{search_term}%"),
@@ -160,7 +168,11 @@ class ClienteService:
             # Update audit fields
             cliente.NomUsuario = current_user.Login
             
+            if any(doc_field in update_data for doc_field in ['CPF', 'CNPJ', 'FlgTipoPessoa']):
+                DocumentoIndexService(self.db).sync("cliente", cliente.CodCliente, [cliente.CPF, cliente.CNPJ])
+            
             self.db.commit()
+            autocomplete_cache.invalidate("clientes")
             self.db.refresh(cliente)
             return cliente
             
@@ -189,6 +201,7 @@ class ClienteService:
             cliente.NomUsuario = current_user.Login
             
             self.db.commit()
+            autocomplete_cache.invalidate("clientes")
         except Exception as e:
             self.db.rollback()
             raise HTTPException(
@@ -197,32 +210,16 @@ class ClienteService:
             )
 
     def _validate_document_unique(self, cliente_data: ClienteCreate, exclude_id: Optional[int] = None) -> None:
-        """Validate document uniqueness (CPF or CNPJ)"""
-        
-        query = self.db.query(Cliente)
+        """Validate document uniqueness (CPF or CNPJ) against the normalized index"""
         
-        # Exclude current cliente if updating
-        if exclude_id:
-            query = query.filter(Cliente.CodCliente != exclude_id)
+        index = DocumentoIndexService(self.db)
         
         if cliente_data.FlgTipoPessoa == 'F' and cliente_data.CPF:
             # Validate CPF uniqueness for Pessoa Física
-            cpf_digits = re.sub(r'\D', '', cliente_data.CPF)
-            existing = query.filter(Cliente.CPF == cpf_digits).first()
-            if existing:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Já existe um cliente com este CPF"
-                )
+            index.validate_unique("cliente", [cliente_data.CPF], exclude_id, detail="Já existe um cliente com este CPF")
         elif cliente_data.FlgTipoPessoa == 'J' and cliente_data.CNPJ:
             # Validate CNPJ uniqueness for Pessoa Jurídica
-            cnpj_digits = re.sub(r'\D', '', cliente_data.CNPJ)
-            existing = query.filter(Cliente.CNPJ == cnpj_digits).first()
-            if existing:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Já existe um cliente com este CNPJ"
-                )
+            index.validate_unique("cliente", [cliente_data.CNPJ], exclude_id, detail="Já existe um cliente com este CNPJ")
 
     def _has_related_records(self, cliente_id: int) -> bool:
         """Check if cliente has related records"""
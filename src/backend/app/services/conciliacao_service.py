@@ -0,0 +1,307 @@
+"""
+Serviço de Conciliação Bancária (linhas de extrato x lançamentos)
+"""
+import re
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, update, bindparam, exists, or_
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.models.extrato import OfxFile, OfxDados
+from app.models.favorecido import Favorecido
+from app.models.funcionario import TblFuncionarios
+from app.models.lancamento import Lancamento
+from app.services.autocomplete_service import normalize_term
+from app.services.saldo_service import SaldoService
+
+
+# Pesos da pontuação (somam 1.0)
+PESO_DATA = 0.6
+PESO_DOCUMENTO = 0.25
+PESO_FAVORECIDO = 0.15
+
+
+def _cents(valor) -> int:
+    return int((Decimal(str(valor)) * 100).to_integral_value())
+
+
+def _as_date(value) -> Optional[date]:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _documento(value: Optional[str]) -> str:
+    """Documento sem pontuação e sem zeros à esquerda"""
+    return re.sub(r'[^0-9A-Za-z]', '', value or '').lstrip('0').upper()
+
+
+def _tokens(value: Optional[str]) -> Set[str]:
+    return {token for token in re.split(r'\W+', normalize_term(value)) if len(token) >= 3}
+
+
+class ConciliacaoService:
+    """
+    Motor de conciliação automática.
+
+    Os lançamentos em aberto são indexados em buckets por (conta, valor em
+    centavos); cada linha do extrato consulta apenas o seu bucket e filtra pela
+    janela de datas, evitando a comparação de todos contra todos. Os pares são
+    pontuados por proximidade de data, número do documento e favorecido, e a
+    atribuição é gulosa pela maior pontuação (cada lado é usado uma única vez).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def conciliar(
+        self,
+        data_inicio: date,
+        data_fim: date,
+        current_user: TblFuncionarios,
+        conta_id: Optional[int] = None,
+        tolerancia_dias: Optional[int] = None,
+        score_auto: Optional[float] = None,
+        auto_confirmar: bool = True
+    ) -> Dict:
+        """Propõe (e opcionalmente confirma) pares linha de extrato x lançamento no período"""
+        if data_inicio > data_fim:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Data inicial não pode ser posterior à data final"
+            )
+
+        tolerancia = settings.CONCILIACAO_TOLERANCIA_DIAS if tolerancia_dias is None else tolerancia_dias
+        score_auto = settings.CONCILIACAO_SCORE_AUTO if score_auto is None else score_auto
+
+        linhas = self._linhas_pendentes(data_inicio, data_fim, conta_id)
+        buckets = self._indexar_lancamentos(
+            data_inicio - timedelta(days=tolerancia),
+            data_fim + timedelta(days=tolerancia),
+            conta_id
+        )
+
+        candidatos: List[Tuple[float, int, int]] = []
+        for linha in linhas:
+            for lancamento in buckets.get((linha["conta"], linha["centavos"]), ()):
+                score = self._score(linha, lancamento, tolerancia)
+                if score is not None:
+                    candidatos.append((score, linha["id"], lancamento["id"]))
+
+        # Atribuição gulosa: maior pontuação primeiro; desempate determinístico pelos ids
+        candidatos.sort(key=lambda item: (-item[0], item[1], item[2]))
+        linhas_usadas: Set[int] = set()
+        lancamentos_usados: Set[int] = set()
+        pares = []
+        for score, linha_id, lancamento_id in candidatos:
+            if linha_id in linhas_usadas or lancamento_id in lancamentos_usados:
+                continue
+            linhas_usadas.add(linha_id)
+            lancamentos_usados.add(lancamento_id)
+            pares.append({
+                "IdOfxDados": linha_id,
+                "CodLancamento": lancamento_id,
+                "score": round(score, 4),
+                "confirmado": auto_confirmar and score >= score_auto
+            })
+
+        try:
+            self._gravar(pares, current_user)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao conciliar extrato: {str(e)}"
+            )
+
+        return {
+            "linhas_analisadas": len(linhas),
+            "propostos": sum(1 for par in pares if not par["confirmado"]),
+            "confirmados": sum(1 for par in pares if par["confirmado"]),
+            "sem_correspondencia": len(linhas) - len(pares),
+            "pares": pares
+        }
+
+    def confirmar(self, ids_ofx_dados: Iterable[int], current_user: TblFuncionarios) -> int:
+        """Confirma pares propostos anteriormente; retorna o total confirmado"""
+        ids = list(dict.fromkeys(ids_ofx_dados))
+        if not ids:
+            return 0
+
+        rows = self.db.execute(
+            select(OfxDados.IdOfxDados, OfxDados.IdEntry)
+            .where(
+                OfxDados.IdOfxDados.in_(ids),
+                OfxDados.IdEntry.isnot(None),
+                or_(OfxDados.IsValidated == False, OfxDados.IsValidated.is_(None))
+            )
+        ).all()
+
+        pares = [{"IdOfxDados": row[0], "CodLancamento": row[1], "confirmado": True} for row in rows]
+        try:
+            self._gravar(pares, current_user)
+            self.db.commit()
+            return len(pares)
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao confirmar conciliação: {str(e)}"
+            )
+
+    def _linhas_pendentes(self, data_inicio: date, data_fim: date, conta_id: Optional[int]) -> List[Dict]:
+        """Linhas de extrato ainda sem lançamento associado"""
+        query = select(
+            OfxDados.IdOfxDados,
+            OfxFile.IdBankAccount,
+            OfxDados.DatePosted,
+            OfxDados.Amount,
+            OfxDados.FitId,
+            OfxDados.ChequeNumber,
+            OfxDados.ReferenceNumber,
+            OfxDados.Name,
+            OfxDados.Memo,
+            OfxDados.Payee
+        ).join(
+            OfxFile, OfxFile.IdOfxFile == OfxDados.IdOfxFile
+        ).where(
+            OfxDados.IdEntry.is_(None),
+            OfxDados.DatePosted >= datetime.combine(data_inicio, datetime.min.time()),
+            OfxDados.DatePosted < datetime.combine(data_fim + timedelta(days=1), datetime.min.time())
+        )
+        if conta_id:
+            query = query.where(OfxFile.IdBankAccount == conta_id)
+
+        linhas = []
+        for row in self.db.execute(query):
+            if row.Amount is None or row.DatePosted is None:
+                continue
+            texto = " ".join(filter(None, [row.Name, row.Memo, row.Payee]))
+            linhas.append({
+                "id": row.IdOfxDados,
+                "conta": row.IdBankAccount,
+                "data": _as_date(row.DatePosted),
+                "centavos": _cents(row.Amount),
+                "documentos": {d for d in map(_documento, (row.FitId, row.ChequeNumber, row.ReferenceNumber)) if d},
+                "texto": normalize_term(texto).upper(),
+                "tokens": _tokens(texto)
+            })
+        return linhas
+
+    def _indexar_lancamentos(self, data_inicio: date, data_fim: date, conta_id: Optional[int]) -> Dict[Tuple[int, int], List[Dict]]:
+        """Buckets (conta, centavos com sinal) dos lançamentos ainda não conciliados"""
+        ja_conciliado = exists().where(OfxDados.IdEntry == Lancamento.CodLancamento)
+
+        query = select(
+            Lancamento.CodLancamento,
+            Lancamento.CodConta,
+            Lancamento.Data,
+            Lancamento.Valor,
+            Lancamento.IndMov,
+            Lancamento.NumDocto,
+            Favorecido.DesFavorecido
+        ).outerjoin(
+            Favorecido, Favorecido.CodFavorecido == Lancamento.CodFavorecido
+        ).where(
+            Lancamento.CodConta.isnot(None),
+            Lancamento.Data >= data_inicio,
+            Lancamento.Data <= data_fim,
+            ~ja_conciliado
+        )
+        if conta_id:
+            query = query.where(Lancamento.CodConta == conta_id)
+
+        buckets: Dict[Tuple[int, int], List[Dict]] = defaultdict(list)
+        for row in self.db.execute(query):
+            centavos = _cents(row.Valor)
+            if not row.IndMov:
+                centavos = -centavos
+            buckets[(row.CodConta, centavos)].append({
+                "id": row.CodLancamento,
+                "data": _as_date(row.Data),
+                "documento": _documento(row.NumDocto),
+                "tokens": _tokens(row.DesFavorecido)
+            })
+        return buckets
+
+    @staticmethod
+    def _score(linha: Dict, lancamento: Dict, tolerancia: int) -> Optional[float]:
+        """Pontuação do par em [0, 1]; None se fora da janela de datas"""
+        distancia = abs((linha["data"] - lancamento["data"]).days)
+        if distancia > tolerancia:
+            return None
+
+        score = PESO_DATA * (1 - distancia / (tolerancia + 1))
+
+        documento = lancamento["documento"]
+        if len(documento) >= 3 and (documento in linha["documentos"] or documento in linha["texto"]):
+            score += PESO_DOCUMENTO
+
+        tokens = lancamento["tokens"]
+        if tokens and len(tokens & linha["tokens"]) * 2 >= len(tokens):
+            score += PESO_FAVORECIDO
+
+        return score
+
+    def _gravar(self, pares: List[Dict], current_user: TblFuncionarios) -> None:
+        """Grava os pares em lote e confirma os lançamentos dos pares confirmados (não faz commit)"""
+        if not pares:
+            return
+
+        now = datetime.utcnow()
+        self.db.execute(
+            update(OfxDados.__table__)
+            .where(OfxDados.__table__.c.IdOfxDados == bindparam("b_id"))
+            .values(
+                IdEntry=bindparam("b_entry"),
+                IsValidated=bindparam("b_validated"),
+                IdUserAlter=current_user.CodFuncionario,
+                DateUpdate=now
+            ),
+            [
+                {"b_id": par["IdOfxDados"], "b_entry": par["CodLancamento"], "b_validated": par["confirmado"]}
+                for par in pares
+            ]
+        )
+
+        confirmados = [par["CodLancamento"] for par in pares if par["confirmado"]]
+        if not confirmados:
+            return
+
+        # Lançamentos ainda não confirmados passam a confirmados; o saldo é
+        # aplicado uma vez por (conta, dia) com o delta agregado
+        deltas: Dict[Tuple[int, date], Decimal] = defaultdict(Decimal)
+        para_confirmar = []
+        for inicio in range(0, len(confirmados), 1000):
+            for row in self.db.execute(
+                select(Lancamento.CodLancamento, Lancamento.CodConta, Lancamento.Data, Lancamento.Valor, Lancamento.IndMov)
+                .where(
+                    Lancamento.CodLancamento.in_(confirmados[inicio:inicio + 1000]),
+                    or_(Lancamento.flg_confirmacao == False, Lancamento.flg_confirmacao.is_(None))
+                )
+            ):
+                valor = Decimal(str(row.Valor or 0))
+                deltas[(row.CodConta, _as_date(row.Data))] += valor if row.IndMov else -valor
+                para_confirmar.append({"b_cod": row.CodLancamento, "b_data": _as_date(row.Data)})
+
+        if para_confirmar:
+            tabela = Lancamento.__table__
+            self.db.execute(
+                update(tabela)
+                .where(tabela.c.CodLancamento == bindparam("b_cod"))
+                .values(
+                    FlgConfirmacao=True,
+                    DatConfirmacao=bindparam("b_data"),
+                    NomUsuarioAlteracao=current_user.Login,
+                    DatAlteracao=now
+                ),
+                para_confirmar
+            )
+
+        saldo_service = SaldoService(self.db)
+        for (conta, dia), delta in deltas.items():
+            saldo_service.apply_delta(conta, dia, delta)
@@ -18,6 +18,9 @@ from app.schemas.conta_pagar import (
     AccountsPayablePaymentCreate,
     AccountsPayablePaymentUpdate
 )
+from app.schemas.baixa_lote import BaixaLoteRequest
+from app.services.status_titulo_service import StatusTituloService
+from app.services.baixa_lote_service import BaixaLoteService
 
 
 class ContaPagarService:
@@ -257,6 +260,13 @@ class ContaPagarService:
                 detail=f"Erro ao registrar pagamento: {str(e)}"
             )
 
+    def pay_lote(self, lote: BaixaLoteRequest, current_user: TblFuncionarios) -> dict:
+        """Register payments for several accounts payable in a single transaction"""
+        service = BaixaLoteService(
+            self.db, AccountsPayable, AccountsPayablePayment, "id_accounts_payable", "pagamento"
+        )
+        return service.baixar(lote.itens, current_user, lote.id_forma_pagamento, lote.tudo_ou_nada)
+
     def update_payment(
         self, 
         payment_id: int, 
@@ -267,7 +277,7 @@ class ContaPagarService:
         
         # Get payment
         payment = self.db.query(AccountsPayablePayment).filter(
-            AccountsPayablePayment.CodPayment == payment_id
+            AccountsPayablePayment.id == payment_id
         ).first()
         
         if not payment:
@@ -277,7 +287,7 @@ class ContaPagarService:
             )
         
         # Get accounts payable
-        conta_pagar = self.get_conta_pagar_by_id(payment.CodAccountsPayable)
+        conta_pagar = self.get_conta_pagar_by_id(payment.id_accounts_payable)
         
         # Prepare data for update
         update_data = payment_update.dict(exclude_unset=True)
@@ -306,7 +316,7 @@ class ContaPagarService:
         
         # Get payment
         payment = self.db.query(AccountsPayablePayment).filter(
-            AccountsPayablePayment.CodPayment == payment_id
+            AccountsPayablePayment.id == payment_id
         ).first()
         
         if not payment:
@@ -316,7 +326,7 @@ class ContaPagarService:
             )
         
         # Get accounts payable
-        conta_pagar = self.get_conta_pagar_by_id(payment.CodAccountsPayable)
+        conta_pagar = self.get_conta_pagar_by_id(payment.id_accounts_payable)
         
         # Validate if can be deleted
         if conta_pagar.Status == 'C':
@@ -327,7 +337,7 @@ class ContaPagarService:
         
         try:
             # Remove payment value from accounts payable
-            conta_pagar.ValorPago -= payment.ValorPago
+            conta_pagar.ValorPago -= payment.amount
             conta_pagar.NomUsuario = current_user.Login
             
             # Update status based on values
@@ -369,16 +379,8 @@ class ContaPagarService:
 
     def get_overdue_count(self) -> int:
         """Get count of overdue accounts payable"""
-        from datetime import datetime
-        
-        count = self.db.query(AccountsPayable).filter(
-            and_(
-                AccountsPayable.Status == 'V',  # Vencido
-                AccountsPayable.DataVencimento < datetime.now()
-            )
-        ).count()
-        
-        return count
+        # Situação mantida pelo agendador (tarefa status_titulos)
+        return StatusTituloService(self.db).contar_vencidos('pagar')
 
     def _validate_conta_pagar_data(self, conta_pagar_data) -> None:
         """Business validations for accounts payable"""
@@ -11,6 +11,7 @@ from fastapi import HTTPException, status
 from app.models.accounts_receivable import AccountsReceivable, AccountsReceivablePayment
 from app.models.funcionario import TblFuncionarios
 from app.models.cliente import Cliente
+from app.models.favorecido import Favorecido
 from app.schemas.conta_receber import (
     AccountsReceivableCreate, 
     AccountsReceivableUpdate, 
@@ -18,6 +19,9 @@ from app.schemas.conta_receber import (
     AccountsReceivablePaymentCreate,
     AccountsReceivablePaymentUpdate
 )
+from app.schemas.baixa_lote import BaixaLoteRequest
+from app.services.status_titulo_service import StatusTituloService
+from app.services.baixa_lote_service import BaixaLoteService
 
 
 class ContaReceberService:
@@ -56,21 +60,21 @@ class ContaReceberService:
 
     def get_conta_receber_by_id(self, conta_receber_id: int) -> AccountsReceivable:
         """Get accounts receivable by ID"""
-        conta_receber = self.db.query(AccountsReceivable).filter(
+        # Nome do cliente (favorecido) obtido na mesma consulta
+        row = self.db.query(AccountsReceivable, Favorecido.DesFavorecido).outerjoin(
+            Favorecido, AccountsReceivable.id_customer == Favorecido.CodFavorecido
+        ).filter(
             AccountsReceivable.id == conta_receber_id
         ).first()
 
-        if not conta_receber:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Conta a receber com ID {conta_receber_id} não encontrada"
             )
 
-        # Add cliente_nome to the response by querying Cliente table
-        if conta_receber.cod_cliente:
-            cliente = self.db.query(Cliente).filter(Cliente.CodCliente == conta_receber.cod_cliente).first()
-            if cliente:
-                conta_receber.cliente_nome = cliente.DesCliente
+        conta_receber, cliente_nome = row
+        conta_receber.cliente_nome = cliente_nome
         
         return conta_receber
 
@@ -254,6 +258,13 @@ class ContaReceberService:
                 detail=f"Erro ao registrar recebimento: {str(e)}"
             )
 
+    def receive_lote(self, lote: BaixaLoteRequest, current_user: TblFuncionarios) -> dict:
+        """Register receipts (with fines, interest and partial amounts) for several accounts receivable in a single transaction"""
+        service = BaixaLoteService(
+            self.db, AccountsReceivable, AccountsReceivablePayment, "id_accounts_receivable", "recebimento"
+        )
+        return service.baixar(lote.itens, current_user, lote.id_forma_pagamento, lote.tudo_ou_nada)
+
     def update_payment(
         self, 
         payment_id: int, 
@@ -264,7 +275,7 @@ class ContaReceberService:
         
         # Get payment
         payment = self.db.query(AccountsReceivablePayment).filter(
-            AccountsReceivablePayment.CodPayment == payment_id
+            AccountsReceivablePayment.id == payment_id
         ).first()
         
         if not payment:
@@ -274,7 +285,7 @@ class ContaReceberService:
             )
         
         # Get accounts receivable
-        conta_receber = self.get_conta_receber_by_id(payment.CodAccountsReceivable)
+        conta_receber = self.get_conta_receber_by_id(payment.id_accounts_receivable)
         
         # Prepare data for update
         update_data = payment_update.dict(exclude_unset=True)
@@ -303,7 +314,7 @@ class ContaReceberService:
         
         # Get payment
         payment = self.db.query(AccountsReceivablePayment).filter(
-            AccountsReceivablePayment.CodPayment == payment_id
+            AccountsReceivablePayment.id == payment_id
         ).first()
         
         if not payment:
@@ -313,7 +324,7 @@ class ContaReceberService:
             )
         
         # Get accounts receivable
-        conta_receber = self.get_conta_receber_by_id(payment.CodAccountsReceivable)
+        conta_receber = self.get_conta_receber_by_id(payment.id_accounts_receivable)
         
         # Validate if can be deleted
         if conta_receber.Status == 'C':
@@ -324,7 +335,7 @@ class ContaReceberService:
         
         try:
             # Remove payment value from accounts receivable
-            conta_receber.ValorRecebido -= payment.ValorRecebido
+            conta_receber.ValorRecebido -= payment.amount
             conta_receber.NomUsuario = current_user.Login
             
             # Update status and overdue days
@@ -366,16 +377,8 @@ class ContaReceberService:
 
     def get_overdue_count(self) -> int:
         """Get count of overdue accounts receivable"""
-        from datetime import datetime
-        
-        count = self.db.query(AccountsReceivable).filter(
-            and_(
-                AccountsReceivable.status == 'V',  # Vencido
-                AccountsReceivable.due_date < datetime.now()
-            )
-        ).count()
-        
-        return count
+        # Situação mantida pelo agendador (tarefa status_titulos)
+        return StatusTituloService(self.db).contar_vencidos('receber')
 
     def get_delinquent_count(self) -> int:
         """Get count of delinquent accounts receivable"""
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from fastapi import HTTPException, status
 from decimal import Decimal
+import re
 
 from app.models.conta import Conta
 from app.models.empresa import Empresa
@@ -76,6 +77,41 @@ class ContaService:
 
         return conta
 
+    def find_conta_by_dados_bancarios(
+        self,
+        banco: Optional[str],
+        agencia: Optional[str],
+        conta: Optional[str]
+    ) -> Optional[Conta]:
+        """Find conta by bank/branch/account as informed in bank files (masked or zero-padded)"""
+
+        def _digits(value) -> str:
+            return re.sub(r'\D', '', str(value or '')).lstrip('0')
+
+        numero = _digits(conta)
+        if not numero:
+            return None
+
+        query = self.db.query(Conta)
+        if _digits(banco):
+            query = query.filter(Conta.Banco == int(_digits(banco)))
+
+        encontradas = []
+        for candidata in query.all():
+            if agencia and _digits(agencia) != _digits(candidata.Agencia):
+                continue
+            # O arquivo pode trazer a conta com ou sem o dígito verificador
+            if numero in (_digits(candidata.Conta), _digits(f"{candidata.Conta or ''}{candidata.ContaDigito or ''}")):
+                encontradas.append(candidata)
+
+        if len(encontradas) > 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Mais de uma conta cadastrada com os mesmos dados bancários"
+            )
+
+        return encontradas[0] if encontradas else None
+
     def list_contas(
         self,
         skip: int = 0,
@@ -2,16 +2,54 @@
 Service layer for Dashboard and Financial Indicators
 """
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from itertools import accumulate
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, extract
+from sqlalchemy import and_, or_, func, case, cast, select, Float
 from fastapi import HTTPException, status
 
 from app.models.lancamento import Lancamento
 from app.models.accounts_payable import AccountsPayable
 from app.models.accounts_receivable import AccountsReceivable
 from app.models.funcionario import TblFuncionarios
+from app.models.favorecido import Favorecido
+from app.models.empresa import Empresa
+from app.models.conta import Conta
+from app.services.parcelamento_service import ParcelamentoService, data_ocorrencia
+from app.services.fechamento_service import FechamentoService
+from app.core.singleflight import single_flight
+
+
+# Faixas de aging: (nome, dias de atraso mínimo, dias de atraso máximo)
+AGING_BUCKETS = (
+    ("a_vencer", None, 0),
+    ("1_30", 1, 30),
+    ("31_60", 31, 60),
+    ("61_90", 61, 90),
+    ("90_mais", 91, None),
+)
+
+# Colunas de cada período da previsão de fluxo de caixa
+PREVISAO_CAMPOS = ("realizado_entradas", "realizado_saidas", "previsto_entradas", "previsto_saidas")
+
+
+def inicio_periodo(data: date, granularidade: str) -> date:
+    """Primeiro dia do período (dia, semana iniciada na segunda ou mês) que contém a data"""
+    if granularidade == "semanal":
+        return data - timedelta(days=data.weekday())
+    if granularidade == "mensal":
+        return data.replace(day=1)
+    return data
+
+
+def proximo_periodo(data: date, granularidade: str) -> date:
+    """Início do período seguinte"""
+    if granularidade == "semanal":
+        return data + timedelta(days=7)
+    if granularidade == "mensal":
+        return data_ocorrencia(data, 3, 1)
+    return data + timedelta(days=1)
 
 
 class DashboardService:
@@ -20,8 +58,9 @@ class DashboardService:
     def __init__(self, db: Session):
         self.db = db
 
+    @single_flight
     def get_financial_summary(self, empresa_id: Optional[int] = None) -> Dict:
-        """Get financial summary with main indicators"""
+        """Get financial summary with main indicators (concurrent identical calls share one computation)"""
         
         # Get total revenues (confirmed entries)
         total_receitas = self._get_total_lancamentos(True, empresa_id)
@@ -84,33 +123,115 @@ class DashboardService:
             "saldo_mensal": saldo_mensal
         }
 
+    def get_cash_flow_forecast(
+        self,
+        meses: int = 12,
+        meses_historico: int = 3,
+        granularidade: str = "mensal",
+        empresa_id: Optional[int] = None,
+        conta_id: Optional[int] = None,
+        data_base: Optional[date] = None
+    ) -> Dict:
+        """
+        Previsão de fluxo de caixa por conta: histórico confirmado + lançamentos
+        em aberto, contas a pagar/receber em aberto e recorrências futuras.
+
+        Cada origem é agregada no banco por (conta, dia); os totais diários são
+        somados em vetores por conta indexados pelo período, e o saldo final de
+        cada período sai de somas acumuladas a partir do saldo atual da conta.
+        Valores vencidos e ainda em aberto entram no período de data_base.
+        """
+        hoje = data_base or date.today()
+        inicio = inicio_periodo(data_ocorrencia(hoje, 3, -meses_historico), granularidade)
+        fim = data_ocorrencia(hoje, 3, meses)
+
+        periodos = []
+        data = inicio
+        while data <= fim:
+            periodos.append(data)
+            data = proximo_periodo(data, granularidade)
+        indice = {periodo: i for i, periodo in enumerate(periodos)}
+        indice_dia: Dict[date, int] = {}
+        vetores: Dict[Optional[int], Dict[str, List[float]]] = {}
+
+        def acumular(conta, dia, tipo, entradas, saidas):
+            serie = vetores.get(conta)
+            if serie is None:
+                serie = vetores[conta] = {c: [0.0] * len(periodos) for c in PREVISAO_CAMPOS}
+            if tipo == "previsto" and dia < hoje:
+                dia = hoje
+            i = indice_dia.get(dia)
+            if i is None:
+                i = indice_dia[dia] = indice[inicio_periodo(dia, granularidade)]
+            serie[f"{tipo}_entradas"][i] += entradas or 0.0
+            serie[f"{tipo}_saidas"][i] += saidas or 0.0
+
+        for conta, dia, entradas, saidas in self._forecast_lancamentos(True, inicio, hoje, empresa_id, conta_id):
+            acumular(conta, dia, "realizado", entradas, saidas)
+        for conta, dia, entradas, saidas in self._forecast_lancamentos(False, None, fim, empresa_id, conta_id):
+            acumular(conta, dia, "previsto", entradas, saidas)
+        for conta, dia, valor in self._forecast_titulos(AccountsReceivable, fim, empresa_id, conta_id):
+            acumular(conta, dia, "previsto", valor, 0.0)
+        for conta, dia, valor in self._forecast_titulos(AccountsPayable, fim, empresa_id, conta_id):
+            acumular(conta, dia, "previsto", 0.0, valor)
+        for row in ParcelamentoService(self.db).projetar_recorrencias(fim, empresa_id):
+            if conta_id and row["CodConta"] != conta_id:
+                continue
+            valor = float(row["Valor"] or 0)
+            acumular(row["CodConta"], row["Data"], "previsto", valor if row["IndMov"] else 0.0, 0.0 if row["IndMov"] else valor)
+
+        contas_query = select(Conta.idConta, Conta.NomConta, Conta.Saldo)
+        if empresa_id:
+            contas_query = contas_query.where(Conta.CodEmpresa == empresa_id)
+        if conta_id:
+            contas_query = contas_query.where(Conta.idConta == conta_id)
+        contas = {row.idConta: row for row in self.db.execute(contas_query)}
+
+        resultado = []
+        consolidado = {c: [0.0] * len(periodos) for c in PREVISAO_CAMPOS + ("saldo_final",)}
+        for conta in sorted(set(contas) | set(vetores), key=lambda c: (c is None, c)):
+            serie = vetores.get(conta) or {c: [0.0] * len(periodos) for c in PREVISAO_CAMPOS}
+            saldo_atual = float(contas[conta].Saldo or 0) if conta in contas else 0.0
+            serie["saldo_final"] = self._forecast_saldos(serie, saldo_atual)
+            for campo, valores in serie.items():
+                consolidado[campo] = [a + b for a, b in zip(consolidado[campo], valores)]
+            resultado.append({
+                "id_conta": conta,
+                "nome": contas[conta].NomConta if conta in contas else "Sem conta",
+                "saldo_atual": saldo_atual,
+                "periodos": self._forecast_periodos(periodos, serie)
+            })
+
+        return {
+            "granularidade": granularidade,
+            "data_base": hoje.isoformat(),
+            "inicio": inicio.isoformat(),
+            "fim": fim.isoformat(),
+            "contas": resultado,
+            "consolidado": self._forecast_periodos(periodos, consolidado)
+        }
+
     def get_category_summary(self, tipo: bool = True, empresa_id: Optional[int] = None) -> List[Dict]:
         """Get summary by category for revenues or expenses"""
         
         from app.models.categoria import Categoria
         
+        # Closed months come from the period-closing totals
+        fonte = FechamentoService(self.db).fonte("categoria", tipo, empresa_id)
+        
         # Query to get category totals
         query = self.db.query(
             Categoria.DesCategoria,
-            func.sum(Lancamento.Valor).label('total')
+            func.sum(fonte.c.valor).label('total')
         ).join(
-            Lancamento, Lancamento.CodCategoria == Categoria.CodCategoria
-        ).filter(
-            and_(
-                Lancamento.IndMov == tipo,
-                Lancamento.flg_confirmacao == True  # Campo bit: True = confirmado
-            )
+            fonte, fonte.c.referencia == Categoria.CodCategoria
         )
         
-        # Filter by empresa if provided
-        if empresa_id:
-            query = query.filter(Lancamento.CodEmpresa == empresa_id)
-        
         # Group by category and order by total
         results = query.group_by(
             Categoria.DesCategoria
         ).order_by(
-            func.sum(Lancamento.Valor).desc()
+            func.sum(fonte.c.valor).desc()
         ).all()
         
         # Format results
@@ -126,19 +247,76 @@ class DashboardService:
     def get_overdue_summary(self, empresa_id: Optional[int] = None) -> Dict:
         """Get summary of overdue accounts"""
         
-        # Get overdue accounts payable
-        contas_pagar_vencidas = self._get_overdue_count('payable', empresa_id)
+        pagar = self._get_aging_totals('payable', empresa_id)
+        receber = self._get_aging_totals('receivable', empresa_id)
         
-        # Get overdue accounts receivable
-        contas_receber_vencidas = self._get_overdue_count('receivable', empresa_id)
+        vencidas = [nome for nome, _, _ in AGING_BUCKETS if nome != "a_vencer"]
         
-        # Get delinquent accounts receivable
-        contas_receber_inadimplentes = self._get_delinquent_count(empresa_id)
+        return {
+            "contas_pagar_vencidas": sum(pagar[nome]["quantidade"] for nome in vencidas),
+            "contas_receber_vencidas": sum(receber[nome]["quantidade"] for nome in vencidas),
+            # Inadimplentes: vencidas há mais de 30 dias
+            "contas_receber_inadimplentes": sum(receber[nome]["quantidade"] for nome in vencidas[1:])
+        }
+
+    def get_aging_report(
+        self,
+        account_type: str,
+        agrupar_por: str = "cliente",
+        empresa_id: Optional[int] = None,
+        data_base: Optional[date] = None
+    ) -> Dict:
+        """Aging report of open accounts grouped by empresa or customer"""
+        
+        data_base = data_base or datetime.now().date()
+        model = AccountsPayable if account_type == 'payable' else AccountsReceivable
+        
+        if agrupar_por == "empresa":
+            group_id, group_name, join_model, join_on = (
+                model.id_company, Empresa.NomEmpresa, Empresa, Empresa.CodEmpresa == model.id_company
+            )
+        else:
+            group_id, group_name, join_model, join_on = (
+                model.id_customer, Favorecido.DesFavorecido, Favorecido, Favorecido.CodFavorecido == model.id_customer
+            )
+        
+        query = self.db.query(
+            group_id.label("codigo"),
+            group_name.label("nome"),
+            *self._aging_columns(model, data_base)
+        ).outerjoin(
+            join_model, join_on
+        ).filter(
+            model.payment_date.is_(None)
+        )
+        
+        if empresa_id:
+            query = query.filter(model.id_company == empresa_id)
+        
+        rows = query.group_by(group_id, group_name).order_by(group_name).all()
+        
+        grupos = []
+        totais = {nome: {"valor": 0.0, "quantidade": 0} for nome, _, _ in AGING_BUCKETS}
+        for row in rows:
+            faixas = self._aging_row_to_dict(row)
+            for nome, valores in faixas.items():
+                totais[nome]["valor"] += valores["valor"]
+                totais[nome]["quantidade"] += valores["quantidade"]
+            grupos.append({
+                "codigo": row.codigo,
+                "nome": row.nome,
+                "faixas": faixas,
+                "total_valor": sum(v["valor"] for v in faixas.values()),
+                "total_quantidade": sum(v["quantidade"] for v in faixas.values())
+            })
         
         return {
-            "contas_pagar_vencidas": contas_pagar_vencidas,
-            "contas_receber_vencidas": contas_receber_vencidas,
-            "contas_receber_inadimplentes": contas_receber_inadimplentes
+            "tipo": "pagar" if account_type == 'payable' else "receber",
+            "agrupar_por": agrupar_por,
+            "data_base": data_base.isoformat(),
+            "faixas": [nome for nome, _, _ in AGING_BUCKETS],
+            "totais": totais,
+            "grupos": grupos
         }
 
     def get_top_favorecidos(self, tipo: bool = False, limit: int = 10, empresa_id: Optional[int] = None) -> List[Dict]:
@@ -146,28 +324,22 @@ class DashboardService:
         
         from app.models.favorecido import Favorecido
         
+        # Closed months come from the period-closing totals
+        fonte = FechamentoService(self.db).fonte("favorecido", tipo, empresa_id)
+        
         # Query to get top favorecidos
         query = self.db.query(
             Favorecido.DesFavorecido,
-            func.sum(Lancamento.Valor).label('total')
+            func.sum(fonte.c.valor).label('total')
         ).join(
-            Lancamento, Lancamento.CodFavorecido == Favorecido.CodFavorecido
-        ).filter(
-            and_(
-                Lancamento.IndMov == tipo,
-                Lancamento.flg_confirmacao == True  # Campo bit: True = confirmado
-            )
+            fonte, fonte.c.referencia == Favorecido.CodFavorecido
         )
         
-        # Filter by empresa if provided
-        if empresa_id:
-            query = query.filter(Lancamento.CodEmpresa == empresa_id)
-        
         # Group by favorecido and order by total
         results = query.group_by(
             Favorecido.DesFavorecido
         ).order_by(
-            func.sum(Lancamento.Valor).desc()
+            func.sum(fonte.c.valor).desc()
         ).limit(limit).all()
         
         # Format results
@@ -183,21 +355,9 @@ class DashboardService:
     def _get_total_lancamentos(self, ind_mov: bool, empresa_id: Optional[int] = None) -> Decimal:
         """Get total value of confirmed lancamentos"""
         
-        query = self.db.query(
-            func.sum(Lancamento.Valor)
-        ).filter(
-            and_(
-                Lancamento.IndMov == ind_mov,
-                Lancamento.flg_confirmacao == True  # Campo bit: True = confirmado
-            )
-        )
-        
-        # Filter by empresa if provided
-        if empresa_id:
-            query = query.filter(Lancamento.CodEmpresa == empresa_id)
-        
-        result = query.scalar()
-        return result or Decimal('0')
+        fonte = FechamentoService(self.db).fonte("empresa", ind_mov, empresa_id)
+        result = self.db.query(func.sum(fonte.c.valor)).scalar()
+        return Decimal(str(result)) if result is not None else Decimal('0')
 
     def _get_accounts_count(self, account_type: str, empresa_id: Optional[int] = None) -> int:
         """Get count of active accounts (payable or receivable)"""
@@ -228,31 +388,20 @@ class DashboardService:
     def _get_monthly_totals(self, ind_mov: bool, start_date: datetime, end_date: datetime, empresa_id: Optional[int] = None) -> List[Dict]:
         """Get monthly totals for lancamentos"""
         
-        # Query to get monthly totals
-        query = self.db.query(
-            extract('year', Lancamento.Data).label('ano'),
-            extract('month', Lancamento.Data).label('mes'),
-            func.sum(Lancamento.Valor).label('total')
-        ).filter(
-            and_(
-                Lancamento.IndMov == ind_mov,
-                Lancamento.flg_confirmacao == True,  # Campo bit: True = confirmado
-                Lancamento.Data >= start_date,
-                Lancamento.Data <= end_date
-            )
-        )
-        
-        # Filter by empresa if provided
-        if empresa_id:
-            query = query.filter(Lancamento.CodEmpresa == empresa_id)
+        # Closed months come from the period-closing totals
+        fonte = FechamentoService(self.db).fonte("empresa", ind_mov, empresa_id, start_date, end_date)
         
         # Group by month and year
-        results = query.group_by(
-            extract('year', Lancamento.Data),
-            extract('month', Lancamento.Data)
+        results = self.db.query(
+            fonte.c.ano,
+            fonte.c.mes,
+            func.sum(fonte.c.valor).label('total')
+        ).group_by(
+            fonte.c.ano,
+            fonte.c.mes
         ).order_by(
-            extract('year', Lancamento.Data),
-            extract('month', Lancamento.Data)
+            fonte.c.ano,
+            fonte.c.mes
         ).all()
         
         # Format results
@@ -267,57 +416,101 @@ class DashboardService:
         
         return monthly_data
 
-    def _get_overdue_count(self, account_type: str, empresa_id: Optional[int] = None) -> int:
-        """Get count of overdue accounts"""
-        
-        from datetime import datetime
-        
-        if account_type == 'payable':
-            # Contas vencidas são aquelas não pagas e com data de vencimento anterior a hoje
-            query = self.db.query(AccountsPayable).filter(
-                and_(
-                    AccountsPayable.payment_date.is_(None),  # Não pago
-                    AccountsPayable.due_date < datetime.now().date()  # Vencido
-                )
-            )
-            
-            # Filter by empresa if provided
-            if empresa_id:
-                query = query.filter(AccountsPayable.id_company == empresa_id)
-                
-            return query.count()
-        else:  # receivable
-            # Contas vencidas são aquelas não recebidas e com data de vencimento anterior a hoje
-            query = self.db.query(AccountsReceivable).filter(
-                and_(
-                    AccountsReceivable.payment_date.is_(None),  # Não recebido
-                    AccountsReceivable.due_date < datetime.now().date()  # Vencido
-                )
-            )
-            
-            # Filter by empresa if provided
-            if empresa_id:
-                query = query.filter(AccountsReceivable.id_company == empresa_id)
-                
-            return query.count()
+    def _forecast_lancamentos(self, confirmados: bool, inicio: Optional[date], fim: date, empresa_id: Optional[int], conta_id: Optional[int]) -> List:
+        """Entradas e saídas de lançamentos por (conta, dia)"""
+        confirmacao = Lancamento.flg_confirmacao == True if confirmados else or_(
+            Lancamento.flg_confirmacao == False, Lancamento.flg_confirmacao.is_(None)
+        )
+        # Totais como float: evita a conversão de Decimal linha a linha
+        query = select(
+            Lancamento.CodConta,
+            Lancamento.Data,
+            cast(func.sum(case((Lancamento.IndMov == True, Lancamento.Valor), else_=0)), Float),
+            cast(func.sum(case((Lancamento.IndMov == True, 0), else_=Lancamento.Valor)), Float)
+        ).where(confirmacao, Lancamento.Data <= fim)
+        if inicio:
+            query = query.where(Lancamento.Data >= inicio)
+        if empresa_id:
+            query = query.where(Lancamento.CodEmpresa == empresa_id)
+        if conta_id:
+            query = query.where(Lancamento.CodConta == conta_id)
+        return self.db.execute(
+            query.group_by(Lancamento.CodConta, Lancamento.Data)
+        ).all()
 
-    def _get_delinquent_count(self, empresa_id: Optional[int] = None) -> int:
-        """Get count of delinquent accounts receivable"""
-        
-        # Como não há campo de protesto na estrutura atual, vamos considerar
-        # contas vencidas há mais de 30 dias como inadimplentes
-        from datetime import datetime, timedelta
-        thirty_days_ago = datetime.now() - timedelta(days=30)
+    def _forecast_titulos(self, model, fim: date, empresa_id: Optional[int], conta_id: Optional[int]) -> List:
+        """Saldo em aberto de contas a pagar/receber por (conta, vencimento)"""
+        query = select(
+            model.id_bank_account,
+            model.due_date,
+            cast(func.sum(model.amount - func.coalesce(model.paid_amount, 0)), Float)
+        ).where(model.payment_date.is_(None), model.due_date <= fim)
+        if empresa_id:
+            query = query.where(model.id_company == empresa_id)
+        if conta_id:
+            query = query.where(model.id_bank_account == conta_id)
+        return self.db.execute(
+            query.group_by(model.id_bank_account, model.due_date)
+        ).all()
+
+    @staticmethod
+    def _forecast_saldos(serie: Dict[str, List[float]], saldo_atual: float) -> List[float]:
+        """
+        Saldo ao fim de cada período: saldo atual menos o realizado nos períodos
+        seguintes mais o previsto até o período
+        """
+        realizado = [e - s for e, s in zip(serie["realizado_entradas"], serie["realizado_saidas"])]
+        previsto = [e - s for e, s in zip(serie["previsto_entradas"], serie["previsto_saidas"])]
+        realizado_depois = list(accumulate(reversed(realizado)))[::-1][1:] + [0.0]
+        previsto_ate = list(accumulate(previsto))
+        return [saldo_atual - depois + ate for depois, ate in zip(realizado_depois, previsto_ate)]
+
+    @staticmethod
+    def _forecast_periodos(periodos: List[date], serie: Dict[str, List[float]]) -> List[Dict]:
+        return [
+            {"periodo": periodo.isoformat(), **{campo: round(valores[i], 2) for campo, valores in serie.items()}}
+            for i, periodo in enumerate(periodos)
+        ]
+
+    def _get_aging_totals(self, account_type: str, empresa_id: Optional[int] = None) -> Dict:
+        """Get aging bucket totals of open accounts in a single query"""
         
-        query = self.db.query(AccountsReceivable).filter(
-            and_(
-                AccountsReceivable.payment_date.is_(None),  # Não recebido
-                AccountsReceivable.due_date < thirty_days_ago.date()  # Vencido há mais de 30 dias
-            )
+        model = AccountsPayable if account_type == 'payable' else AccountsReceivable
+        query = self.db.query(
+            *self._aging_columns(model, datetime.now().date())
+        ).filter(
+            model.payment_date.is_(None)
         )
         
         # Filter by empresa if provided
         if empresa_id:
-            query = query.filter(AccountsReceivable.id_company == empresa_id)
-            
-        return query.count()
\ No newline at end of file
+            query = query.filter(model.id_company == empresa_id)
+        
+        return self._aging_row_to_dict(query.one())
+
+    def _aging_columns(self, model, data_base: date) -> List:
+        """SUM(CASE ...) columns with open amount and count per aging bucket"""
+        
+        # Compara o vencimento com datas de corte fixas (usa índice em DueDate)
+        saldo_aberto = model.amount - func.coalesce(model.paid_amount, 0)
+        columns = []
+        for nome, minimo, maximo in AGING_BUCKETS:
+            conditions = []
+            if minimo is not None:
+                conditions.append(model.due_date <= data_base - timedelta(days=minimo))
+            if maximo is not None:
+                conditions.append(model.due_date >= data_base - timedelta(days=maximo))
+            condition = and_(*conditions)
+            columns.append(func.sum(case((condition, saldo_aberto), else_=0)).label(f"valor_{nome}"))
+            columns.append(func.sum(case((condition, 1), else_=0)).label(f"qtd_{nome}"))
+        return columns
+
+    def _aging_row_to_dict(self, row) -> Dict:
+        """Convert aging columns of a result row to {bucket: {valor, quantidade}}"""
+        return {
+            nome: {
+                "valor": float(getattr(row, f"valor_{nome}") or 0),
+                "quantidade": int(getattr(row, f"qtd_{nome}") or 0)
+            }
+            for nome, _, _ in AGING_BUCKETS
+        }
@@ -0,0 +1,193 @@
+"""
+Serviço do índice de documentos (CPF/CNPJ) normalizados
+"""
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select, delete, insert, func, and_
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.models.documento_indice import DocumentoIndice
+from app.models.favorecido import Favorecido
+from app.models.cliente import Cliente
+from app.models.empresa import Empresa
+
+
+# Tabelas de origem: entidade -> (coluna id, colunas de documento)
+DOCUMENTO_SOURCES = {
+    "favorecido": (Favorecido.CodFavorecido, (Favorecido.CPF, Favorecido.CNPJ)),
+    "cliente": (Cliente.CodCliente, (Cliente.CPF, Cliente.CNPJ)),
+    "empresa": (Empresa.CodEmpresa, (Empresa.CNPJ,)),
+}
+
+
+def normalize_documento(documento: Optional[str]) -> Optional[str]:
+    """Retorna apenas os dígitos do documento (ou None se vazio)"""
+    if not documento:
+        return None
+    digits = re.sub(r'\D', '', documento)
+    return digits or None
+
+
+def documento_from_term(term: Optional[str]) -> Optional[str]:
+    """Retorna os dígitos se o termo de busca for um CPF/CNPJ completo (com ou sem máscara)"""
+    if not term or not re.fullmatch(r'[\d.\-/\s]+', term.strip()):
+        return None
+    digits = normalize_documento(term)
+    return digits if digits and len(digits) in (11, 14) else None
+
+
+class DocumentoIndexService:
+    """Serviço para consultas e manutenção do índice de documentos"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def find_duplicate(self, entidade: str, documento: Optional[str], exclude_id: Optional[int] = None) -> Optional[int]:
+        """Retorna o código de outro registro com o mesmo documento, se existir"""
+        digits = normalize_documento(documento)
+        if not digits:
+            return None
+
+        query = select(DocumentoIndice.CodEntidade).where(
+            DocumentoIndice.Entidade == entidade,
+            DocumentoIndice.Documento == digits
+        )
+        if exclude_id:
+            query = query.where(DocumentoIndice.CodEntidade != exclude_id)
+
+        return self.db.execute(query.limit(1)).scalar()
+
+    def lookup(self, entidade: str, documento: str) -> List[int]:
+        """Busca os códigos dos registros com o documento informado"""
+        digits = normalize_documento(documento)
+        if not digits:
+            return []
+
+        return list(self.db.execute(
+            select(DocumentoIndice.CodEntidade).where(
+                DocumentoIndice.Entidade == entidade,
+                DocumentoIndice.Documento == digits
+            ).order_by(DocumentoIndice.CodEntidade)
+        ).scalars())
+
+    def validate_unique(self, entidade: str, documentos: Iterable[Optional[str]], exclude_id: Optional[int] = None, detail: str = "Documento já cadastrado") -> None:
+        """Lança 400 se algum dos documentos já pertence a outro registro"""
+        for documento in documentos:
+            if self.find_duplicate(entidade, documento, exclude_id) is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=detail
+                )
+
+    def sync(self, entidade: str, cod_entidade: int, documentos: Iterable[Optional[str]]) -> None:
+        """Regrava as entradas de um registro (não faz commit)"""
+        self.db.execute(
+            delete(DocumentoIndice).where(
+                DocumentoIndice.Entidade == entidade,
+                DocumentoIndice.CodEntidade == cod_entidade
+            )
+        )
+
+        rows = self._rows_for(entidade, cod_entidade, documentos, datetime.utcnow())
+        if rows:
+            self.db.execute(insert(DocumentoIndice), rows)
+
+    def backfill(self, entidade: str, batch_size: int = 1000) -> int:
+        """
+        Reconstrói o índice de uma entidade a partir da tabela de origem.
+
+        Percorre a origem em lotes por chave primária (keyset), lendo apenas o id
+        e os documentos, e faz commit a cada lote. Retorna o total de registros lidos.
+        """
+        id_column, doc_columns = DOCUMENTO_SOURCES[entidade]
+        last_id = None
+        total = 0
+
+        while True:
+            query = select(id_column, *doc_columns).order_by(id_column).limit(batch_size)
+            if last_id is not None:
+                query = query.where(id_column > last_id)
+            batch = self.db.execute(query).all()
+            if not batch:
+                break
+
+            ids = [row[0] for row in batch]
+            self.db.execute(
+                delete(DocumentoIndice).where(
+                    DocumentoIndice.Entidade == entidade,
+                    DocumentoIndice.CodEntidade.in_(ids)
+                )
+            )
+
+            now = datetime.utcnow()
+            rows = []
+            for row in batch:
+                rows.extend(self._rows_for(entidade, row[0], row[1:], now))
+            if rows:
+                self.db.execute(insert(DocumentoIndice), rows)
+
+            self.db.commit()
+            total += len(batch)
+            last_id = ids[-1]
+
+        return total
+
+    def duplicate_report(self, entidade: Optional[str] = None) -> List[Dict]:
+        """Lista os documentos que aparecem em mais de um registro da mesma entidade"""
+        duplicados = select(
+            DocumentoIndice.Entidade,
+            DocumentoIndice.Documento
+        ).group_by(
+            DocumentoIndice.Entidade,
+            DocumentoIndice.Documento
+        ).having(func.count(func.distinct(DocumentoIndice.CodEntidade)) > 1)
+
+        if entidade:
+            duplicados = duplicados.where(DocumentoIndice.Entidade == entidade)
+        duplicados = duplicados.subquery()
+
+        rows = self.db.execute(
+            select(
+                DocumentoIndice.Entidade,
+                DocumentoIndice.Documento,
+                DocumentoIndice.CodEntidade
+            ).join(
+                duplicados,
+                and_(
+                    DocumentoIndice.Entidade == duplicados.c.Entidade,
+                    DocumentoIndice.Documento == duplicados.c.Documento
+                )
+            ).order_by(
+                DocumentoIndice.Entidade,
+                DocumentoIndice.Documento,
+                DocumentoIndice.CodEntidade
+            )
+        ).all()
+
+        report: Dict[tuple, Dict] = {}
+        for row in rows:
+            item = report.setdefault((row[0], row[1]), {
+                "entidade": row[0],
+                "documento": row[1],
+                "codigos": []
+            })
+            if row[2] not in item["codigos"]:
+                item["codigos"].append(row[2])
+
+        return list(report.values())
+
+    @staticmethod
+    def _rows_for(entidade: str, cod_entidade: int, documentos: Iterable[Optional[str]], now: datetime) -> List[Dict]:
+        digits = {normalize_documento(documento) for documento in documentos}
+        return [
+            {
+                "Entidade": entidade,
+                "CodEntidade": cod_entidade,
+                "Documento": documento,
+                "DatAtualizacao": now
+            }
+            for documento in sorted(d for d in digits if d)
+        ]
@@ -0,0 +1,365 @@
+"""
+Serviço da DRE (demonstração do resultado) sobre o plano de contas
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, insert, func, case, extract
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.models.lancamento import Lancamento
+from app.models.categoria import Categoria
+from app.models.accounts_payable import AccountsPayable
+from app.models.accounts_receivable import AccountsReceivable
+from app.models.plano_contas import ChartOfAccounts, CostCenter
+from app.models.dre import DREMes, DREMensal
+
+REGIMES = ("caixa", "competencia")
+
+Mes = Tuple[int, int]
+# (empresa, conta do plano, centro de custo) -> [receitas, despesas]
+TotaisMes = Dict[Tuple[Optional[int], Optional[int], Optional[int]], List[Decimal]]
+
+
+def meses_entre(inicio: Mes, fim: Mes) -> List[Mes]:
+    """Lista de (ano, mês) de inicio a fim, inclusive"""
+    meses = []
+    ano, mes = inicio
+    while (ano, mes) <= fim:
+        meses.append((ano, mes))
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+    return meses
+
+
+def deslocar_mes(mes: Mes, quantidade: int) -> Mes:
+    """Soma (ou subtrai) meses a um (ano, mês)"""
+    total = mes[0] * 12 + mes[1] - 1 + quantidade
+    return total // 12, total % 12 + 1
+
+
+def _chave(mes: Mes) -> str:
+    return f"{mes[0]:04d}-{mes[1]:02d}"
+
+
+class DREService:
+    """
+    Motor da DRE.
+
+    Os valores são agregados por empresa, conta do plano de contas, centro de
+    custo e mês. Meses fechados (anteriores ao mês corrente) são calculados
+    uma única vez por regime e gravados em tbl_FINDREMensal, que passa a ser a
+    fonte desses meses; apenas o mês corrente é recalculado a cada consulta.
+
+    Regime de caixa: lançamentos confirmados pela data, classificados pelo
+    plano de contas e centro de custo da categoria. Regime de competência:
+    contas a receber (receitas) e a pagar (despesas) pela data de emissão.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def relatorio(
+        self,
+        inicio: Mes,
+        fim: Mes,
+        regime: str = "caixa",
+        empresa_id: Optional[int] = None,
+        centro_custo_id: Optional[int] = None,
+        comparar: Optional[str] = None,
+        hoje: Optional[date] = None
+    ) -> Dict:
+        """DRE do período por conta do plano (com totais dos nós pais) e, opcionalmente, comparativa"""
+        if regime not in REGIMES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Regime inválido. Valores aceitos: {', '.join(REGIMES)}"
+            )
+        if inicio > fim:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Mês inicial deve ser anterior ao mês final"
+            )
+
+        meses = meses_entre(inicio, fim)
+        comparativo: List[Mes] = []
+        if comparar == "periodo_anterior":
+            comparativo = [deslocar_mes(mes, -len(meses)) for mes in meses]
+        elif comparar == "ano_anterior":
+            comparativo = [deslocar_mes(mes, -12) for mes in meses]
+
+        totais = self.totais_mensais(sorted(set(meses) | set(comparativo)), regime, hoje)
+
+        # (conta do plano) -> {mês: resultado}; centros de custo -> {mês: resultado}
+        por_conta: Dict[Optional[int], Dict[Mes, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+        por_centro: Dict[Optional[int], Dict[Mes, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+        resumo = {mes: {"receitas": Decimal(0), "despesas": Decimal(0)} for mes in totais}
+        for mes, linhas in totais.items():
+            for (empresa, conta, centro), (receitas, despesas) in linhas.items():
+                if empresa_id and empresa != empresa_id:
+                    continue
+                if centro_custo_id and centro != centro_custo_id:
+                    continue
+                por_conta[conta][mes] += receitas - despesas
+                por_centro[centro][mes] += receitas - despesas
+                resumo[mes]["receitas"] += receitas
+                resumo[mes]["despesas"] += despesas
+
+        linhas = self._arvore(por_conta, meses, comparativo, empresa_id)
+        return {
+            "regime": regime,
+            "meses": [_chave(mes) for mes in meses],
+            "meses_comparativo": [_chave(mes) for mes in comparativo],
+            "linhas": linhas,
+            "centros_custo": self._centros(por_centro, meses, comparativo),
+            "totais": self._totais(resumo, meses, comparativo),
+        }
+
+    def totais_mensais(self, meses: List[Mes], regime: str, hoje: Optional[date] = None) -> Dict[Mes, TotaisMes]:
+        """Totais de cada mês: meses fechados vêm do cache (calculado na primeira consulta)"""
+        hoje = hoje or date.today()
+        corrente = (hoje.year, hoje.month)
+        fechados = [mes for mes in meses if mes < corrente]
+        abertos = [mes for mes in meses if mes >= corrente]
+
+        totais: Dict[Mes, TotaisMes] = {mes: {} for mes in meses}
+        if fechados:
+            calculados = self._meses_calculados(regime, fechados)
+            faltantes = [mes for mes in fechados if mes not in calculados]
+            if faltantes:
+                self._gravar(regime, faltantes, self._calcular(regime, faltantes))
+            totais.update(self._ler_cache(regime, fechados))
+        if abertos:
+            totais.update(self._calcular(regime, abertos))
+        return totais
+
+    def _meses_calculados(self, regime: str, meses: List[Mes]) -> set:
+        anos = {ano for ano, _ in meses}
+        return {
+            (row.Ano, row.Mes)
+            for row in self.db.execute(
+                select(DREMes.Ano, DREMes.Mes).where(DREMes.Regime == regime, DREMes.Ano.in_(anos))
+            )
+        }
+
+    def _ler_cache(self, regime: str, meses: List[Mes]) -> Dict[Mes, TotaisMes]:
+        totais: Dict[Mes, TotaisMes] = {mes: {} for mes in meses}
+        anos = {ano for ano, _ in meses}
+        for row in self.db.execute(
+            select(DREMensal).where(DREMensal.Regime == regime, DREMensal.Ano.in_(anos))
+        ).scalars():
+            mes = (row.Ano, row.Mes)
+            if mes in totais:
+                totais[mes][(row.IdCompany, row.IdChartOfAccounts, row.IdCostCenter)] = [
+                    Decimal(str(row.Receitas or 0)), Decimal(str(row.Despesas or 0))
+                ]
+        return totais
+
+    def _gravar(self, regime: str, meses: List[Mes], totais: Dict[Mes, TotaisMes]) -> None:
+        now = datetime.utcnow()
+        linhas = [
+            {
+                "Regime": regime, "Ano": mes[0], "Mes": mes[1],
+                "IdCompany": empresa, "IdChartOfAccounts": conta, "IdCostCenter": centro,
+                "Receitas": receitas, "Despesas": despesas
+            }
+            for mes in meses
+            for (empresa, conta, centro), (receitas, despesas) in totais[mes].items()
+        ]
+        try:
+            if linhas:
+                self.db.execute(insert(DREMensal), linhas)
+            self.db.execute(insert(DREMes), [
+                {"Regime": regime, "Ano": ano, "Mes": mes, "DatCalculo": now} for ano, mes in meses
+            ])
+            self.db.commit()
+        except IntegrityError:
+            # Outro processo gravou os mesmos meses; o cache dele é usado
+            self.db.rollback()
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao gravar DRE mensal: {str(e)}"
+            )
+
+    def _calcular(self, regime: str, meses: List[Mes]) -> Dict[Mes, TotaisMes]:
+        """Agrega as origens do regime nos meses informados com consultas agrupadas"""
+        inicio = date(meses[0][0], meses[0][1], 1)
+        ano, mes = deslocar_mes(meses[-1], 1)
+        fim = date(ano, mes, 1)
+
+        totais: Dict[Mes, TotaisMes] = {mes: {} for mes in meses}
+
+        def somar(rows, indice):
+            for row in rows:
+                mes = (int(row.ano), int(row.mes))
+                if mes not in totais:
+                    continue
+                valores = totais[mes].setdefault((row.empresa, row.conta, row.centro), [Decimal(0), Decimal(0)])
+                if indice is None:
+                    valores[0] += Decimal(str(row.receitas or 0))
+                    valores[1] += Decimal(str(row.despesas or 0))
+                else:
+                    valores[indice] += Decimal(str(row.valor or 0))
+
+        if regime == "caixa":
+            somar(self._query_caixa(inicio, fim), None)
+        else:
+            somar(self._query_titulos(AccountsReceivable, inicio, fim), 0)
+            somar(self._query_titulos(AccountsPayable, inicio, fim), 1)
+        return totais
+
+    def _query_caixa(self, inicio: date, fim: date):
+        ano = extract('year', Lancamento.Data)
+        mes = extract('month', Lancamento.Data)
+        return self.db.execute(
+            select(
+                Lancamento.CodEmpresa.label("empresa"),
+                Categoria.idChartsOfAccount.label("conta"),
+                Categoria.idCostCenter.label("centro"),
+                ano.label("ano"),
+                mes.label("mes"),
+                func.sum(case((Lancamento.IndMov == True, Lancamento.Valor), else_=0)).label("receitas"),
+                func.sum(case((Lancamento.IndMov == True, 0), else_=Lancamento.Valor)).label("despesas")
+            ).outerjoin(
+                Categoria, Categoria.CodCategoria == Lancamento.CodCategoria
+            ).where(
+                Lancamento.flg_confirmacao == True,
+                Lancamento.Data >= inicio,
+                Lancamento.Data < fim
+            ).group_by(
+                Lancamento.CodEmpresa, Categoria.idChartsOfAccount, Categoria.idCostCenter, ano, mes
+            )
+        ).all()
+
+    def _query_titulos(self, model, inicio: date, fim: date):
+        ano = extract('year', model.issuance_date)
+        mes = extract('month', model.issuance_date)
+        return self.db.execute(
+            select(
+                model.id_company.label("empresa"),
+                model.id_chart_of_accounts.label("conta"),
+                model.id_cost_center.label("centro"),
+                ano.label("ano"),
+                mes.label("mes"),
+                func.sum(model.amount).label("valor")
+            ).where(
+                model.issuance_date >= inicio,
+                model.issuance_date < fim
+            ).group_by(
+                model.id_company, model.id_chart_of_accounts, model.id_cost_center, ano, mes
+            )
+        ).all()
+
+    def _arvore(
+        self,
+        por_conta: Dict[Optional[int], Dict[Mes, Decimal]],
+        meses: List[Mes],
+        comparativo: List[Mes],
+        empresa_id: Optional[int]
+    ) -> List[Dict]:
+        """Linhas do plano de contas em ordem hierárquica, com os valores somados nos nós pais"""
+        query = select(ChartOfAccounts.id, ChartOfAccounts.parent_id, ChartOfAccounts.account_name, ChartOfAccounts.account_type)
+        if empresa_id:
+            query = query.where(ChartOfAccounts.id_company == empresa_id)
+        contas = {row.id: row for row in self.db.execute(query)}
+
+        valores: Dict[Optional[int], Dict[Mes, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+        for conta, por_mes in por_conta.items():
+            # Soma na própria conta e em todos os ancestrais
+            destino = conta if conta in contas else None
+            visitados = set()
+            while True:
+                for mes, valor in por_mes.items():
+                    valores[destino][mes] += valor
+                if destino is None:
+                    break
+                visitados.add(destino)
+                pai = contas[destino].parent_id
+                if pai not in contas or pai in visitados:
+                    break
+                destino = pai
+
+        filhos: Dict[Optional[int], List[int]] = defaultdict(list)
+        for conta in sorted(contas.values(), key=lambda c: (c.account_name or "", c.id)):
+            filhos[conta.parent_id if conta.parent_id in contas else None].append(conta.id)
+
+        linhas = []
+
+        def visitar(conta_id: int, nivel: int) -> None:
+            if conta_id not in valores:
+                return
+            conta = contas[conta_id]
+            linhas.append(self._linha(
+                {"id_plano_contas": conta_id, "parent_id": conta.parent_id, "nome": conta.account_name,
+                 "tipo": conta.account_type, "nivel": nivel},
+                valores[conta_id], meses, comparativo
+            ))
+            for filho in filhos[conta_id]:
+                visitar(filho, nivel + 1)
+
+        for raiz in filhos[None]:
+            visitar(raiz, 0)
+        if None in valores:
+            linhas.append(self._linha(
+                {"id_plano_contas": None, "parent_id": None, "nome": "Sem plano de contas", "tipo": None, "nivel": 0},
+                valores[None], meses, comparativo
+            ))
+        return linhas
+
+    def _centros(self, por_centro, meses: List[Mes], comparativo: List[Mes]) -> List[Dict]:
+        nomes = {}
+        ids = [centro for centro in por_centro if centro is not None]
+        if ids:
+            nomes = dict(self.db.execute(select(CostCenter.id, CostCenter.name).where(CostCenter.id.in_(ids))).all())
+        return [
+            self._linha(
+                {"id_centro_custo": centro, "nome": nomes.get(centro, "Sem centro de custo")},
+                por_centro[centro], meses, comparativo
+            )
+            for centro in sorted(por_centro, key=lambda c: (c is None, nomes.get(c, "")))
+        ]
+
+    @staticmethod
+    def _linha(dados: Dict, por_mes: Dict[Mes, Decimal], meses: List[Mes], comparativo: List[Mes]) -> Dict:
+        total = sum((por_mes.get(mes, Decimal(0)) for mes in meses), Decimal(0))
+        dados.update({
+            "valores": {_chave(mes): float(por_mes.get(mes, 0)) for mes in meses},
+            "total": float(total),
+        })
+        if comparativo:
+            anterior = sum((por_mes.get(mes, Decimal(0)) for mes in comparativo), Decimal(0))
+            dados["total_comparativo"] = float(anterior)
+            dados["variacao_percentual"] = float((total - anterior) / abs(anterior) * 100) if anterior else None
+        return dados
+
+    @staticmethod
+    def _totais(resumo: Dict[Mes, Dict[str, Decimal]], meses: List[Mes], comparativo: List[Mes]) -> Dict:
+        def somar(lista, campo):
+            return sum((resumo[mes][campo] for mes in lista), Decimal(0))
+
+        totais = {
+            "por_mes": {
+                _chave(mes): {
+                    "receitas": float(resumo[mes]["receitas"]),
+                    "despesas": float(resumo[mes]["despesas"]),
+                    "resultado": float(resumo[mes]["receitas"] - resumo[mes]["despesas"])
+                }
+                for mes in meses
+            },
+            "receitas": float(somar(meses, "receitas")),
+            "despesas": float(somar(meses, "despesas")),
+        }
+        totais["resultado"] = totais["receitas"] - totais["despesas"]
+        if comparativo:
+            receitas, despesas = somar(comparativo, "receitas"), somar(comparativo, "despesas")
+            totais["comparativo"] = {
+                "receitas": float(receitas),
+                "despesas": float(despesas),
+                "resultado": float(receitas - despesas)
+            }
+        return totais
@@ -5,11 +5,11 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from fastapi import HTTPException, status
-import re
 
 from app.models.empresa import Empresa
 from app.models.funcionario import TblFuncionarios
 from app.schemas.empresa import EmpresaCreate, EmpresaUpdate
+from app.services.documento_service import DocumentoIndexService
 
 
 class EmpresaService:
@@ -33,6 +33,8 @@ class EmpresaService:
 
         try:
             self.db.add(empresa)
+            self.db.flush()
+            DocumentoIndexService(self.db).sync("empresa", empresa.CodEmpresa, [empresa.CNPJ])
             self.db.commit()
             self.db.refresh(empresa)
             
@@ -109,6 +111,9 @@ class EmpresaService:
             # Update audit fields
             empresa.NomUsuario = current_user.Login
             
+            if 'CNPJ' in update_data:
+                DocumentoIndexService(self.db).sync("empresa", empresa.CodEmpresa, [empresa.CNPJ])
+            
             # Handle default empresa logic
             if 'FlgPadrao' in update_data and update_data['FlgPadrao']:
                 self._set_as_default_empresa(empresa_id)
@@ -139,6 +144,7 @@ class EmpresaService:
         try:
             # Physical deletion since FlgAtivo doesn't exist in model
             self.db.delete(empresa)
+            DocumentoIndexService(self.db).sync("empresa", empresa_id, [])
             self.db.commit()
         except Exception as e:
             self.db.rollback()
@@ -148,24 +154,14 @@ class EmpresaService:
             )
 
     def _validate_cnpj_unique(self, cnpj: str, exclude_id: Optional[int] = None) -> None:
-        """Validate CNPJ uniqueness"""
-        
-        # Clean CNPJ
-        cnpj_digits = re.sub(r'\D', '', cnpj)
+        """Validate CNPJ uniqueness against the normalized index"""
         
-        query = self.db.query(Empresa).filter(
-            Empresa.CNPJ == cnpj_digits
+        DocumentoIndexService(self.db).validate_unique(
+            "empresa",
+            [cnpj],
+            exclude_id,
+            detail="Já existe uma empresa com este CNPJ"
         )
-        
-        # Exclude current empresa if updating
-        if exclude_id:
-            query = query.filter(Empresa.CodEmpresa != exclude_id)
-        
-        if query.first():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Já existe uma empresa com este CNPJ"
-            )
 
     def _is_first_empresa(self) -> bool:
         """Check if this is the first empresa"""
@@ -0,0 +1,316 @@
+"""
+Leitura em streaming de extratos bancários (OFX e CNAB 240/400)
+
+Os parsers consomem o arquivo em blocos/linhas e produzem uma transação por
+vez, no formato das colunas de tbl_OfxDados, sem carregar o arquivo inteiro.
+Os dados da conta (banco/agência/conta) ficam disponíveis no parser assim
+que o cabeçalho é lido, antes da primeira transação.
+"""
+import hashlib
+from datetime import datetime, date
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterator, Optional, TextIO
+
+
+class ExtratoParseError(ValueError):
+    """Arquivo de extrato inválido ou em formato não suportado"""
+
+
+def _parse_decimal(value: Optional[str]) -> Optional[Decimal]:
+    if value is None:
+        return None
+    value = value.strip().replace(" ", "")
+    if not value:
+        return None
+    # Alguns bancos usam vírgula como separador decimal no OFX
+    if "," in value and "." not in value:
+        value = value.replace(",", ".")
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ExtratoParseError(f"Valor inválido: {value}")
+
+
+def _parse_ofx_date(value: Optional[str]) -> Optional[datetime]:
+    # Formato OFX: AAAAMMDD[HHMMSS[.XXX]][TZ]
+    digits = "".join(c for c in (value or "")[:14] if c.isdigit())
+    if len(digits) < 8:
+        return None
+    fmt = "%Y%m%d%H%M%S" if len(digits) == 14 else "%Y%m%d"
+    try:
+        return datetime.strptime(digits[:14] if len(digits) == 14 else digits[:8], fmt)
+    except ValueError:
+        return None
+
+
+def _parse_cnab_date(value: str) -> Optional[datetime]:
+    value = value.strip()
+    if not value or not value.isdigit() or int(value) == 0:
+        return None
+    fmt = "%d%m%Y" if len(value) == 8 else "%d%m%y"
+    try:
+        return datetime.strptime(value, fmt)
+    except ValueError:
+        return None
+
+
+def _cnab_amount(value: str, decimals: int = 2) -> Decimal:
+    value = value.strip()
+    if not value.isdigit():
+        raise ExtratoParseError(f"Valor inválido: {value}")
+    return Decimal(int(value)).scaleb(-decimals)
+
+
+def synthetic_fit_id(*parts) -> str:
+    """Identificador determinístico para linhas sem FITID/documento"""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return "H" + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:39]
+
+
+class ExtratoParser:
+    """Base dos parsers: expõe os dados da conta e itera as transações"""
+
+    formato = ""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.banco: Optional[str] = None
+        self.agencia: Optional[str] = None
+        self.conta: Optional[str] = None
+        self.data_inicial: Optional[date] = None
+        self.data_final: Optional[date] = None
+        self.linhas_lidas = 0
+
+    def __iter__(self) -> Iterator[Dict]:
+        raise NotImplementedError
+
+    def _track_period(self, posted: Optional[datetime]) -> None:
+        if posted is None:
+            return
+        day = posted.date()
+        if self.data_inicial is None or day < self.data_inicial:
+            self.data_inicial = day
+        if self.data_final is None or day > self.data_final:
+            self.data_final = day
+
+
+class OfxParser(ExtratoParser):
+    """
+    Parser OFX 1.x (SGML) e 2.x (XML).
+
+    O arquivo é lido em blocos e quebrado em elementos "<TAG>valor", o que
+    funciona tanto para arquivos com uma tag por linha quanto para os que
+    trazem tudo em uma única linha.
+    """
+
+    formato = "OFX"
+    BLOCK_SIZE = 64 * 1024
+
+    def _tokens(self) -> Iterator:
+        buffer = ""
+        while True:
+            block = self.stream.read(self.BLOCK_SIZE)
+            if not block:
+                break
+            self.linhas_lidas += block.count("\n")
+            buffer += block
+            parts = buffer.split("<")
+            buffer = parts.pop()
+            for part in parts:
+                token = self._token(part)
+                if token:
+                    yield token
+        token = self._token(buffer)
+        if token:
+            yield token
+
+    @staticmethod
+    def _token(part: str):
+        if ">" not in part:
+            return None
+        tag, _, value = part.partition(">")
+        return tag.strip().upper(), value.strip()
+
+    def __iter__(self) -> Iterator[Dict]:
+        transacao: Optional[Dict] = None
+
+        for tag, value in self._tokens():
+            if tag == "STMTTRN":
+                transacao = {}
+            elif tag == "/STMTTRN":
+                if transacao is not None:
+                    yield self._build(transacao)
+                transacao = None
+            elif transacao is not None:
+                if not tag.startswith("/"):
+                    transacao[tag] = value
+            elif tag == "BANKID":
+                self.banco = value
+            elif tag == "BRANCHID":
+                self.agencia = value
+            elif tag == "ACCTID":
+                self.conta = value
+            elif tag in ("DTSTART", "DTEND"):
+                # Período informado pelo banco; as datas das transações só o ampliam
+                self._track_period(_parse_ofx_date(value))
+
+    def _build(self, transacao: Dict) -> Dict:
+        amount = _parse_decimal(transacao.get("TRNAMT"))
+        if amount is None:
+            raise ExtratoParseError("Transação OFX sem TRNAMT")
+        posted = _parse_ofx_date(transacao.get("DTPOSTED"))
+        self._track_period(posted)
+
+        fit_id = transacao.get("FITID") or synthetic_fit_id(
+            posted, amount, transacao.get("CHECKNUM"), transacao.get("MEMO")
+        )
+
+        return {
+            "TxType": (transacao.get("TRNTYPE") or "")[:30] or None,
+            "DatePosted": posted,
+            "DateUser": _parse_ofx_date(transacao.get("DTUSER")),
+            "DateAvailable": _parse_ofx_date(transacao.get("DTAVAIL")),
+            "Amount": amount,
+            "FitId": fit_id[:50],
+            "Name": (transacao.get("NAME") or "")[:100] or None,
+            "Memo": (transacao.get("MEMO") or "")[:255] or None,
+            "ChequeNumber": (transacao.get("CHECKNUM") or "")[:50] or None,
+            "ReferenceNumber": (transacao.get("REFNUM") or "")[:50] or None,
+            "CorrectFitId": (transacao.get("CORRECTFITID") or "")[:20] or None,
+            "ServerTxId": (transacao.get("SRVRTID") or "")[:50] or None,
+            "StandardIndustrialCode": (transacao.get("SIC") or "")[:30] or None,
+            "Currency": (transacao.get("CURRENCY") or transacao.get("CURSYM") or "")[:10] or None,
+            "MovimentType": 1 if amount >= 0 else 2,
+        }
+
+
+class Cnab240Parser(ExtratoParser):
+    """
+    Parser CNAB 240 FEBRABAN - extrato para conciliação bancária.
+
+    Considera o header de arquivo (registro 0), o header de lote (registro 1,
+    com agência/conta) e os detalhes segmento E (registro 3).
+    """
+
+    formato = "CNAB240"
+
+    def __iter__(self) -> Iterator[Dict]:
+        for line in self.stream:
+            self.linhas_lidas += 1
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            if len(line) < 240:
+                raise ExtratoParseError(f"Linha {self.linhas_lidas} com tamanho inválido para CNAB 240")
+
+            tipo = line[7]
+            if tipo == "0":
+                self.banco = line[0:3]
+            elif tipo == "1":
+                self.agencia = line[52:57].strip()
+                self.conta = line[58:70].strip()
+            elif tipo == "3" and line[13] == "E":
+                yield self._build(line)
+
+    def _build(self, line: str) -> Dict:
+        if not self.agencia:
+            self.agencia = line[52:57].strip()
+            self.conta = line[58:70].strip()
+
+        posted = _parse_cnab_date(line[142:150])
+        self._track_period(posted)
+
+        amount = _cnab_amount(line[150:168])
+        if line[168] == "D":
+            amount = -amount
+
+        documento = line[201:240].strip()
+        historico = line[176:201].strip()
+
+        return {
+            "TxType": f"CNAB240-{line[169:172].strip()}",
+            "DatePosted": posted,
+            "DateUser": _parse_cnab_date(line[134:142]),
+            "Amount": amount,
+            "FitId": (documento or synthetic_fit_id(posted, amount, historico, line[8:13]))[:50],
+            "Memo": historico or None,
+            "ReferenceNumber": documento[:50] or None,
+            "StandardIndustrialCode": line[172:176].strip() or None,
+            "MovimentType": 1 if amount >= 0 else 2,
+        }
+
+
+class Cnab400Parser(ExtratoParser):
+    """
+    Parser CNAB 400 de retorno de cobrança.
+
+    As posições seguem o layout mais comum (FEBRABAN/Itaú); cada detalhe
+    (registro 1) com valor pago vira um crédito identificado pelo nosso número.
+    """
+
+    formato = "CNAB400"
+
+    def __iter__(self) -> Iterator[Dict]:
+        for line in self.stream:
+            self.linhas_lidas += 1
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            if len(line) < 400:
+                raise ExtratoParseError(f"Linha {self.linhas_lidas} com tamanho inválido para CNAB 400")
+
+            tipo = line[0]
+            if tipo == "0":
+                self.banco = line[76:79]
+                self.agencia = line[26:30].strip()
+                self.conta = line[32:37].strip()
+            elif tipo == "1":
+                row = self._build(line)
+                if row is not None:
+                    yield row
+
+    def _build(self, line: str) -> Optional[Dict]:
+        amount = _cnab_amount(line[253:266])
+        if not amount:
+            return None
+
+        posted = _parse_cnab_date(line[110:116])
+        self._track_period(posted)
+
+        nosso_numero = line[62:70].strip()
+        documento = line[116:126].strip()
+
+        return {
+            "TxType": f"CNAB400-{line[108:110]}",
+            "DatePosted": posted,
+            "Amount": amount,
+            "FitId": (nosso_numero or documento or synthetic_fit_id(posted, amount, line[394:400]))[:50],
+            "ChequeNumber": documento or None,
+            "ReferenceNumber": nosso_numero or None,
+            "MovimentType": 1,
+        }
+
+
+def detect_parser(stream: TextIO) -> ExtratoParser:
+    """Identifica o formato pelo início do arquivo e retorna o parser adequado"""
+    if not stream.seekable():
+        raise ExtratoParseError("Arquivo de extrato precisa permitir releitura do início")
+
+    first_line = ""
+    while not first_line.strip():
+        first_line = stream.readline()
+        if not first_line:
+            raise ExtratoParseError("Arquivo de extrato vazio")
+    stream.seek(0)
+
+    head = first_line.strip()
+    if head.upper().startswith("OFXHEADER") or head.startswith("<?xml") or "<OFX>" in head.upper():
+        return OfxParser(stream)
+
+    size = len(first_line.rstrip("\r\n"))
+    if size == 240:
+        return Cnab240Parser(stream)
+    if size == 400:
+        return Cnab400Parser(stream)
+
+    raise ExtratoParseError("Formato de extrato não reconhecido (esperado OFX, CNAB 240 ou CNAB 400)")
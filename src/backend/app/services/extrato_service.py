@@ -0,0 +1,187 @@
+"""
+Serviço de Importação de Extratos Bancários (OFX/CNAB)
+"""
+import logging
+from datetime import datetime, date
+from typing import Callable, Dict, List, Optional, TextIO
+
+from sqlalchemy import select, insert, update
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.models.extrato import OfxFile, OfxDados
+from app.models.funcionario import TblFuncionarios
+from app.services.conta_service import ContaService
+from app.services.extrato_parser import ExtratoParseError, detect_parser
+
+logger = logging.getLogger(__name__)
+
+# Callback de progresso: (linhas lidas do arquivo, transações importadas, duplicadas)
+ProgressCallback = Callable[[int, int, int], None]
+
+
+class ExtratoService:
+    """Serviço para importação de extratos em streaming"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def importar(
+        self,
+        stream: TextIO,
+        nome_arquivo: str,
+        current_user: TblFuncionarios,
+        conta_id: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        progresso: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """
+        Importa um extrato OFX/CNAB para tbl_OfxFile/tbl_OfxDados.
+
+        O arquivo é lido em streaming e as transações são gravadas em lotes de
+        `chunk_size` com INSERT em lote, dentro de uma única transação. Linhas
+        cujo FITID/documento já foi importado para a mesma conta são ignoradas,
+        o que torna a reimportação do mesmo arquivo idempotente.
+        """
+        chunk_size = chunk_size or settings.EXTRATO_IMPORT_CHUNK_SIZE
+
+        try:
+            parser = detect_parser(stream)
+        except ExtratoParseError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        arquivo: Optional[OfxFile] = None
+        importadas = 0
+        duplicadas = 0
+        chunk: List[Dict] = []
+
+        try:
+            for row in parser:
+                if arquivo is None:
+                    arquivo = self._create_arquivo(parser, nome_arquivo, current_user, conta_id)
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    novas = self._insert_chunk(arquivo, chunk, current_user)
+                    importadas += novas
+                    duplicadas += len(chunk) - novas
+                    chunk = []
+                    if progresso:
+                        progresso(parser.linhas_lidas, importadas, duplicadas)
+
+            if chunk:
+                novas = self._insert_chunk(arquivo, chunk, current_user)
+                importadas += novas
+                duplicadas += len(chunk) - novas
+                if progresso:
+                    progresso(parser.linhas_lidas, importadas, duplicadas)
+
+            if arquivo is None:
+                raise ExtratoParseError("Nenhuma transação encontrada no extrato")
+
+            # Período final conhecido só após a leitura completa
+            self.db.execute(
+                update(OfxFile)
+                .where(OfxFile.IdOfxFile == arquivo.IdOfxFile)
+                .values(
+                    InitialDate=parser.data_inicial or arquivo.InitialDate,
+                    FinalDate=parser.data_final or arquivo.FinalDate
+                )
+            )
+            self.db.commit()
+        except ExtratoParseError as e:
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except HTTPException:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao importar extrato: {str(e)}"
+            )
+
+        logger.info(
+            f"Extrato {nome_arquivo} importado: {importadas} transações, "
+            f"{duplicadas} duplicadas, {parser.linhas_lidas} linhas lidas"
+        )
+
+        return {
+            "IdOfxFile": arquivo.IdOfxFile,
+            "idConta": arquivo.IdBankAccount,
+            "formato": parser.formato,
+            "data_inicial": parser.data_inicial,
+            "data_final": parser.data_final,
+            "linhas_lidas": parser.linhas_lidas,
+            "importadas": importadas,
+            "duplicadas": duplicadas
+        }
+
+    def _create_arquivo(
+        self,
+        parser,
+        nome_arquivo: str,
+        current_user: TblFuncionarios,
+        conta_id: Optional[int]
+    ) -> OfxFile:
+        """Resolve a conta pelos dados do cabeçalho e registra o arquivo"""
+        conta_service = ContaService(self.db)
+        if conta_id:
+            conta = conta_service.get_conta_by_id(conta_id)
+        else:
+            conta = conta_service.find_conta_by_dados_bancarios(parser.banco, parser.agencia, parser.conta)
+            if conta is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=(
+                        f"Conta não encontrada para banco {parser.banco}, "
+                        f"agência {parser.agencia}, conta {parser.conta}"
+                    )
+                )
+
+        hoje = date.today()
+        arquivo = OfxFile(
+            FileName=(nome_arquivo or "extrato")[:100],
+            IdBankAccount=conta.idConta,
+            InitialDate=parser.data_inicial or hoje,
+            FinalDate=parser.data_final or hoje,
+            IdUserCreate=current_user.CodFuncionario,
+            DateCreate=datetime.utcnow()
+        )
+        self.db.add(arquivo)
+        self.db.flush()
+        return arquivo
+
+    def _insert_chunk(self, arquivo: OfxFile, chunk: List[Dict], current_user: TblFuncionarios) -> int:
+        """Grava um lote ignorando FITIDs já importados para a conta; retorna o total inserido"""
+        fit_ids = {row["FitId"] for row in chunk}
+
+        existentes = set(self.db.execute(
+            select(OfxDados.FitId)
+            .join(OfxFile, OfxFile.IdOfxFile == OfxDados.IdOfxFile)
+            .where(
+                OfxFile.IdBankAccount == arquivo.IdBankAccount,
+                OfxDados.FitId.in_(fit_ids)
+            )
+        ).scalars())
+
+        now = datetime.utcnow()
+        rows = []
+        for row in chunk:
+            if row["FitId"] in existentes:
+                continue
+            # Repetições dentro do próprio lote
+            existentes.add(row["FitId"])
+            rows.append({
+                **row,
+                "IdOfxFile": arquivo.IdOfxFile,
+                "IsValidated": False,
+                "IdUserCreate": current_user.CodFuncionario,
+                "DateCreate": now
+            })
+
+        if rows:
+            self.db.execute(insert(OfxDados), rows)
+
+        return len(rows)
@@ -5,11 +5,12 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from fastapi import HTTPException, status
-import re
 
 from app.models.favorecido import Favorecido
 from app.models.funcionario import TblFuncionarios
 from app.schemas.favorecido import FavorecidoCreate, FavorecidoUpdate
+from app.services.autocomplete_service import autocomplete_cache
+from app.services.documento_service import DocumentoIndexService, documento_from_term
 
 
 class FavorecidoService:
@@ -33,7 +34,12 @@ class FavorecidoService:
 
         try:
             self.db.add(favorecido)
+            self.db.flush()
+            DocumentoIndexService(self.db).sync(
+                "favorecido", favorecido.CodFavorecido, [favorecido.CPF, favorecido.CNPJ]
+            )
             self.db.commit()
+            autocomplete_cache.invalidate("favorecidos")
             self.db.refresh(favorecido)
             return favorecido
         except Exception as e:
@@ -91,11 +97,16 @@ class FavorecidoService:
         # if ativos_apenas:
         #     query = query.filter(Favorecido.FlgAtivo == 'S')
         
-        # Search by term
-        if search_term:
+        # Search by term (documento completo usa o índice normalizado)
+        doc_digits = documento_from_term(search_term)
+        if doc_digits:
+            codigos = DocumentoIndexService(self.db).lookup("favorecido", doc_digits)
+            query = query.filter(Favorecido.CodFavorecido.in_(codigos))
+        elif search_term:
             search_filter = or_(
                 Favorecido.DesFavorecido.ilike(f"%{search_term}%"),
-                Favorecido.CPF_CNPJ.ilike(f"%{search_term}%"),
+                Favorecido.CPF.ilike(f"%{search_term}%"),
+                Favorecido.CNPJ.ilike(f"%{search_term}%"),
                 Favorecido.Email.ilike(f"%{search_term}%")
             )
             query = query.filter(search_filter)
@@ -121,7 +132,7 @@ class FavorecidoService:
         update_data = favorecido_update.dict(exclude_unset=True)
         
         # Validate document uniqueness if documents are being updated
-        if 'CPF_CNPJ' in update_data:
+        if 'CPF' in update_data or 'CNPJ' in update_data:
             self._validate_document_unique(favorecido_update, favorecido_id)
         
         try:
@@ -132,7 +143,13 @@ class FavorecidoService:
             # Update audit fields
             favorecido.NomUsuario = current_user.Login
             
+            if 'CPF' in update_data or 'CNPJ' in update_data:
+                DocumentoIndexService(self.db).sync(
+                    "favorecido", favorecido.CodFavorecido, [favorecido.CPF, favorecido.CNPJ]
+                )
+            
             self.db.commit()
+            autocomplete_cache.invalidate("favorecidos")
             self.db.refresh(favorecido)
             return favorecido
             
@@ -161,6 +178,7 @@ class FavorecidoService:
             favorecido.NomUsuario = current_user.Login
             
             self.db.commit()
+            autocomplete_cache.invalidate("favorecidos")
         except Exception as e:
             self.db.rollback()
             raise HTTPException(
@@ -178,6 +196,7 @@ class FavorecidoService:
             favorecido.NomUsuario = current_user.Login
             
             self.db.commit()
+            autocomplete_cache.invalidate("favorecidos")
             self.db.refresh(favorecido)
             return favorecido
             
@@ -189,26 +208,14 @@ class FavorecidoService:
             )
 
     def _validate_document_unique(self, favorecido_data: FavorecidoCreate, exclude_id: Optional[int] = None) -> None:
-        """Validate document uniqueness (CPF or CNPJ)"""
-        
-        if not favorecido_data.CPF_CNPJ:
-            return
-            
-        query = self.db.query(Favorecido)
-        # .filter(Favorecido.FlgAtivo == 'S') - removido pois FlgAtivo não existe na tabela
-        
-        # Exclude current favorecido if updating
-        if exclude_id:
-            query = query.filter(Favorecido.CodFavorecido != exclude_id)
-        
-        # Validate document uniqueness
-        doc_digits = re.sub(r'\D', '', favorecido_data.CPF_CNPJ)
-        existing = query.filter(Favorecido.CPF_CNPJ == doc_digits).first()
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Já existe um favorecido com este CPF/CNPJ"
-            )
+        """Validate document uniqueness (CPF or CNPJ) against the normalized index"""
+        
+        DocumentoIndexService(self.db).validate_unique(
+            "favorecido",
+            [favorecido_data.CPF, favorecido_data.CNPJ],
+            exclude_id,
+            detail="Já existe um favorecido com este CPF/CNPJ"
+        )
 
     def _has_related_records(self, favorecido_id: int) -> bool:
         """Check if favorecido has related records"""
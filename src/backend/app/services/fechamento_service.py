@@ -0,0 +1,303 @@
+"""
+Serviço de fechamento mensal de lançamentos
+"""
+import calendar
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, insert, delete, func, extract, literal, union_all, or_, String
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.models.lancamento import Lancamento
+from app.models.fechamento import PeriodoFechado, FechamentoTotal
+from app.models.dre import DREMes, DREMensal
+from app.models.funcionario import TblFuncionarios
+from app.services.dre_service import Mes, meses_entre, deslocar_mes
+
+# Dimensão do fechamento -> coluna do lançamento usada como referência
+DIMENSOES = {
+    "categoria": Lancamento.CodCategoria,
+    "favorecido": Lancamento.CodFavorecido,
+    "conta": Lancamento.CodConta,
+    "empresa": Lancamento.CodEmpresa,
+}
+
+
+def ultimo_dia(mes: Mes) -> date:
+    """Último dia do (ano, mês)"""
+    return date(mes[0], mes[1], calendar.monthrange(mes[0], mes[1])[1])
+
+
+def _como_data(valor) -> date:
+    return valor.date() if isinstance(valor, datetime) else valor
+
+
+class FechamentoService:
+    """
+    Fechamento de meses.
+
+    Fechar um mês grava os totais dos lançamentos confirmados por categoria,
+    favorecido, conta e empresa em tbl_FINFechamentoTotal e bloqueia a
+    inclusão, alteração, exclusão e (des)confirmação de lançamentos com data
+    no período. As consultas históricas passam a ler esses totais para os
+    meses fechados e só consultam tbl_FINLancamentos no período aberto.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def listar(self) -> List[PeriodoFechado]:
+        """Meses fechados, do mais recente para o mais antigo"""
+        return self.db.execute(
+            select(PeriodoFechado).order_by(PeriodoFechado.Ano.desc(), PeriodoFechado.Mes.desc())
+        ).scalars().all()
+
+    def ultimo_mes_fechado(self) -> Optional[Mes]:
+        """(ano, mês) do último mês fechado, ou None se nenhum mês foi fechado"""
+        indice = self.db.execute(
+            select(func.max(PeriodoFechado.Ano * 12 + PeriodoFechado.Mes - 1))
+        ).scalar()
+        if indice is None:
+            return None
+        return int(indice) // 12, int(indice) % 12 + 1
+
+    def data_fechamento(self) -> Optional[date]:
+        """Último dia do período fechado (lançamentos até essa data estão bloqueados)"""
+        ultimo = self.ultimo_mes_fechado()
+        return ultimo_dia(ultimo) if ultimo else None
+
+    def verificar_aberto(self, *datas) -> None:
+        """Impede operações em lançamentos com data no período fechado"""
+        fechamento = self.data_fechamento()
+        if fechamento is None:
+            return
+        for data in datas:
+            if data is not None and _como_data(data) <= fechamento:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Período fechado até {fechamento.strftime('%m/%Y')}: lançamento não pode ser alterado"
+                )
+
+    def fechar(self, ano: int, mes: int, current_user: TblFuncionarios, hoje: Optional[date] = None) -> List[PeriodoFechado]:
+        """
+        Fecha o mês e os meses anteriores ainda abertos.
+
+        Os totais de todos os meses fechados nesta operação são gravados com
+        um INSERT ... SELECT agrupado por dimensão. Retorna os meses fechados.
+        """
+        hoje = hoje or date.today()
+        alvo = (ano, mes)
+        if alvo >= (hoje.year, hoje.month):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Só é possível fechar meses já encerrados"
+            )
+
+        ultimo = self.ultimo_mes_fechado()
+        if ultimo and alvo <= ultimo:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Mês já fechado"
+            )
+
+        primeiro = deslocar_mes(ultimo, 1) if ultimo else self._primeiro_mes(alvo)
+        inicio = date(primeiro[0], primeiro[1], 1)
+        fim = ultimo_dia(alvo)
+
+        pendentes = self.db.execute(
+            select(func.count()).select_from(Lancamento).where(
+                Lancamento.Data >= inicio,
+                Lancamento.Data <= fim,
+                or_(Lancamento.flg_confirmacao == False, Lancamento.flg_confirmacao.is_(None))
+            )
+        ).scalar() or 0
+        if pendentes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Existem {pendentes} lançamentos não confirmados no período"
+            )
+
+        meses = meses_entre(primeiro, alvo)
+        now = datetime.now()
+        try:
+            for dimensao in DIMENSOES:
+                self._gravar_totais(dimensao, inicio, fim)
+            periodos = [
+                PeriodoFechado(Ano=a, Mes=m, DatFechamento=now, NomUsuario=current_user.Login)
+                for a, m in meses
+            ]
+            self.db.add_all(periodos)
+            self.db.commit()
+            return periodos
+        except IntegrityError:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Período sendo fechado por outro usuário"
+            )
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao fechar período: {str(e)}"
+            )
+
+    def reabrir(self, ano: int, mes: int) -> None:
+        """Reabre o último mês fechado, descartando os seus totais"""
+        if self.ultimo_mes_fechado() != (ano, mes):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Apenas o último mês fechado pode ser reaberto"
+            )
+
+        try:
+            self.db.execute(delete(FechamentoTotal).where(FechamentoTotal.Ano == ano, FechamentoTotal.Mes == mes))
+            self.db.execute(delete(PeriodoFechado).where(PeriodoFechado.Ano == ano, PeriodoFechado.Mes == mes))
+            # Os lançamentos do mês voltam a poder mudar: a DRE de caixa do mês é recalculada
+            self.db.execute(delete(DREMensal).where(DREMensal.Regime == "caixa", DREMensal.Ano == ano, DREMensal.Mes == mes))
+            self.db.execute(delete(DREMes).where(DREMes.Regime == "caixa", DREMes.Ano == ano, DREMes.Mes == mes))
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao reabrir período: {str(e)}"
+            )
+
+    def totais(self, ano: int, mes: int, dimensao: str, empresa_id: Optional[int] = None) -> List[Dict]:
+        """Totais gravados no fechamento do mês para uma dimensão"""
+        query = select(FechamentoTotal).where(
+            FechamentoTotal.Dimensao == dimensao,
+            FechamentoTotal.Ano == ano,
+            FechamentoTotal.Mes == mes
+        )
+        if empresa_id:
+            query = query.where(FechamentoTotal.CodEmpresa == empresa_id)
+
+        return [
+            {
+                "empresa_id": row.CodEmpresa,
+                "referencia": row.CodReferencia,
+                "entrada": row.IndMov,
+                "valor": float(row.Valor or 0),
+                "quantidade": row.Quantidade,
+            }
+            for row in self.db.execute(
+                query.order_by(FechamentoTotal.CodEmpresa, FechamentoTotal.CodReferencia, FechamentoTotal.IndMov)
+            ).scalars()
+        ]
+
+    def fonte(
+        self,
+        dimensao: str,
+        ind_mov: bool,
+        empresa_id: Optional[int] = None,
+        inicio=None,
+        fim=None
+    ):
+        """
+        Subconsulta (ano, mes, referencia, valor) dos lançamentos confirmados.
+
+        Os meses fechados inteiramente contidos no intervalo vêm dos totais do
+        fechamento; o restante (período aberto e meses parciais nas pontas)
+        vem de tbl_FINLancamentos.
+        """
+        referencia = DIMENSOES[dimensao]
+        lancamentos = select(
+            extract('year', Lancamento.Data).label('ano'),
+            extract('month', Lancamento.Data).label('mes'),
+            referencia.label('referencia'),
+            Lancamento.Valor.label('valor')
+        ).where(
+            Lancamento.IndMov == ind_mov,
+            Lancamento.flg_confirmacao == True
+        )
+        if empresa_id:
+            lancamentos = lancamentos.where(Lancamento.CodEmpresa == empresa_id)
+        if inicio is not None:
+            lancamentos = lancamentos.where(Lancamento.Data >= inicio)
+        if fim is not None:
+            lancamentos = lancamentos.where(Lancamento.Data <= fim)
+
+        fechados = self._meses_fechados(inicio, fim)
+        if fechados is None:
+            return lancamentos.subquery()
+
+        primeiro, ultimo = fechados
+        fora = Lancamento.Data > ultimo_dia(ultimo)
+        if primeiro is not None:
+            fora = or_(Lancamento.Data < date(primeiro[0], primeiro[1], 1), fora)
+
+        indice = FechamentoTotal.Ano * 12 + FechamentoTotal.Mes
+        totais = select(
+            FechamentoTotal.Ano.label('ano'),
+            FechamentoTotal.Mes.label('mes'),
+            FechamentoTotal.CodReferencia.label('referencia'),
+            FechamentoTotal.Valor.label('valor')
+        ).where(
+            FechamentoTotal.Dimensao == literal(dimensao, String),
+            FechamentoTotal.IndMov == ind_mov,
+            indice <= ultimo[0] * 12 + ultimo[1]
+        )
+        if primeiro is not None:
+            totais = totais.where(indice >= primeiro[0] * 12 + primeiro[1])
+        if empresa_id:
+            totais = totais.where(FechamentoTotal.CodEmpresa == empresa_id)
+
+        return union_all(totais, lancamentos.where(fora)).subquery()
+
+    def _meses_fechados(self, inicio, fim) -> Optional[Tuple[Optional[Mes], Mes]]:
+        """Primeiro e último mês fechado inteiramente dentro do intervalo (primeiro None = sem limite)"""
+        ultimo = self.ultimo_mes_fechado()
+        if ultimo is None:
+            return None
+
+        if fim is not None:
+            fim = _como_data(fim)
+            mes_fim = (fim.year, fim.month)
+            if fim < ultimo_dia(mes_fim):
+                mes_fim = deslocar_mes(mes_fim, -1)
+            ultimo = min(ultimo, mes_fim)
+
+        primeiro = None
+        if inicio is not None:
+            # Um datetime após a meia-noite do dia 1 não cobre o mês inteiro
+            inteiro = inicio.day == 1 and (not isinstance(inicio, datetime) or inicio.time() == datetime.min.time())
+            primeiro = (inicio.year, inicio.month) if inteiro else deslocar_mes((inicio.year, inicio.month), 1)
+            if primeiro > ultimo:
+                return None
+        return primeiro, ultimo
+
+    def _primeiro_mes(self, alvo: Mes) -> Mes:
+        primeira_data = self.db.execute(select(func.min(Lancamento.Data))).scalar()
+        if primeira_data is None:
+            return alvo
+        return min((primeira_data.year, primeira_data.month), alvo)
+
+    def _gravar_totais(self, dimensao: str, inicio: date, fim: date) -> None:
+        ano = extract('year', Lancamento.Data)
+        mes = extract('month', Lancamento.Data)
+        referencia = DIMENSOES[dimensao]
+        origem = select(
+            ano,
+            mes,
+            literal(dimensao, String),
+            Lancamento.CodEmpresa,
+            referencia,
+            Lancamento.IndMov,
+            func.sum(Lancamento.Valor),
+            func.count()
+        ).where(
+            Lancamento.Data >= inicio,
+            Lancamento.Data <= fim,
+            Lancamento.flg_confirmacao == True
+        ).group_by(ano, mes, Lancamento.CodEmpresa, referencia, Lancamento.IndMov)
+
+        self.db.execute(
+            insert(FechamentoTotal).from_select(
+                ["Ano", "Mes", "Dimensao", "CodEmpresa", "CodReferencia", "IndMov", "Valor", "Quantidade"],
+                origem
+            )
+        )
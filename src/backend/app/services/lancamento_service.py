@@ -2,7 +2,7 @@
 Serviço de Lançamentos Financeiros
 """
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from decimal import Decimal
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, desc, asc
@@ -10,6 +10,16 @@ from fastapi import HTTPException, status
 
 from app.models.lancamento import Lancamento
 from app.models.funcionario import TblFuncionarios
+from app.models.favorecido import Favorecido
+from app.models.categoria import Categoria
+from app.models.conta import Conta
+from app.models.forma_pagamento import FormaPagamento
+from app.models.empresa import Empresa
+from app.services.saldo_service import SaldoService
+from app.services.parcelamento_service import ParcelamentoService
+from app.services.fechamento_service import FechamentoService
+from app.core.config import settings
+from app.core.singleflight import single_flight
 from app.schemas.lancamento import (
     LancamentoCreate, 
     LancamentoUpdate, 
@@ -29,6 +39,7 @@ class LancamentoService:
         """Criar novo lançamento com validações e auditoria"""
         
         # Validações de negócio
+        FechamentoService(self.db).verificar_aberto(lancamento_create.Data)
         self._validate_lancamento_data(lancamento_create)
         
         # Preparar dados
@@ -75,6 +86,8 @@ class LancamentoService:
     ) -> List[Lancamento]:
         """Listar lançamentos com filtros e paginação"""
         
+        self._materializar_recorrencias(filtros)
+        
         query = self.db.query(Lancamento).options(
             joinedload(Lancamento.favorecido),
             joinedload(Lancamento.categoria)
@@ -142,6 +155,8 @@ class LancamentoService:
     ) -> LancamentosPaginatedResponse:
         """Listar lançamentos com filtros, paginação e total count"""
         
+        self._materializar_recorrencias(filtros)
+        
         query = self.db.query(Lancamento).options(
             joinedload(Lancamento.favorecido),
             joinedload(Lancamento.categoria)
@@ -214,6 +229,48 @@ class LancamentoService:
             limit=limit
         )
         
+    @single_flight
+    def get_filtro_opcoes(self) -> dict:
+        """
+        Opções dos filtros de lançamentos (favorecidos, categorias, contas,
+        formas de pagamento e empresas).
+
+        Aberturas simultâneas da tela compartilham a mesma consulta.
+        """
+        # Buscar favorecidos
+        favorecidos = self.db.query(Favorecido).all()
+        favorecidos_opcoes = [{'value': f.CodFavorecido, 'label': f.DesFavorecido} for f in favorecidos]
+
+        # Buscar categorias
+        categorias = self.db.query(Categoria).filter(Categoria.FlgAtivo == 'S').all()
+        categorias_opcoes = [{'value': c.CodCategoria, 'label': c.DesCategoria} for c in categorias]
+
+        # Buscar contas
+        contas = self.db.query(Conta).all()  # Assumindo que não há campo FlgAtivo em Conta
+        contas_opcoes = [{'value': c.idConta, 'label': getattr(c, 'Nome', f'Conta {c.idConta}')} for c in contas]
+
+        # Buscar formas de pagamento
+        try:
+            formas_pagamento = self.db.query(FormaPagamento).all()
+            formas_pagamento_opcoes = [{'value': fp.CodFormaPagto, 'label': getattr(fp, 'NomFormaPagto', f'Forma {fp.CodFormaPagto}')} for fp in formas_pagamento]
+        except:
+            formas_pagamento_opcoes = []
+
+        # Buscar empresas
+        try:
+            empresas = self.db.query(Empresa).all()
+            empresas_opcoes = [{'value': e.CodEmpresa, 'label': getattr(e, 'NomEmpresa', f'Empresa {e.CodEmpresa}')} for e in empresas]
+        except:
+            empresas_opcoes = []
+
+        return {
+            'favorecidos': favorecidos_opcoes,
+            'categorias': categorias_opcoes,
+            'contas': contas_opcoes,
+            'formas_pagamento': formas_pagamento_opcoes,
+            'empresas': empresas_opcoes
+        }
+    
     def update_lancamento(
         self, 
         lancamento_id: int, 
@@ -236,6 +293,7 @@ class LancamentoService:
         update_data = lancamento_update.dict(exclude_unset=True)
         
         # Validar dados se fornecidos
+        FechamentoService(self.db).verificar_aberto(lancamento.Data, update_data.get('Data'))
         if update_data:
             self._validate_lancamento_update(update_data, lancamento)
         
@@ -270,6 +328,7 @@ class LancamentoService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Não é possível excluir lançamento já confirmado"
             )
+        FechamentoService(self.db).verificar_aberto(lancamento.Data)
         
         try:
             self.db.delete(lancamento)
@@ -293,13 +352,15 @@ class LancamentoService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Lançamento já está confirmado"
             )
+        FechamentoService(self.db).verificar_aberto(lancamento.Data)
         
         try:
             # Confirmar
             lancamento.flg_confirmacao = True
             lancamento.NomUsuario = current_user.Login
             
-            # TODO: Aqui seria o local para atualizar saldos, gerar movimentações, etc.
+            # Atualizar saldo da conta e snapshots diários
+            SaldoService(self.db).apply_lancamento(lancamento)
             
             self.db.commit()
             self.db.refresh(lancamento)
@@ -324,13 +385,15 @@ class LancamentoService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Lançamento não está confirmado"
             )
+        FechamentoService(self.db).verificar_aberto(lancamento.Data)
         
         try:
             # Desconfirmar
             lancamento.flg_confirmacao = False
             lancamento.NomUsuario = current_user.Login
             
-            # TODO: Aqui seria o local para reverter saldos, estornar movimentações, etc.
+            # Estornar saldo da conta e snapshots diários
+            SaldoService(self.db).apply_lancamento(lancamento, estorno=True)
             
             self.db.commit()
             self.db.refresh(lancamento)
@@ -375,6 +438,16 @@ class LancamentoService:
         
         return receitas - despesas
     
+    def _materializar_recorrencias(self, filtros: Optional[LancamentoFilter]) -> None:
+        """Grava sob demanda as recorrências além do horizonte já materializado"""
+        if not filtros or not filtros.data_fim:
+            return
+        
+        data_fim = filtros.data_fim.date() if isinstance(filtros.data_fim, datetime) else filtros.data_fim
+        horizonte = date.today() + timedelta(days=settings.LANCAMENTO_RECORRENCIA_HORIZONTE_DIAS)
+        if data_fim > horizonte:
+            ParcelamentoService(self.db).materializar_recorrencias(data_fim)
+    
     def _validate_lancamento_data(self, lancamento_data) -> None:
         """Validações de negócio para lançamento"""
         
@@ -0,0 +1,267 @@
+"""
+Serviço de Parcelamento e Recorrência de Lançamentos
+"""
+import calendar
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_DOWN
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, insert, func, or_
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.models.lancamento import Lancamento
+from app.models.funcionario import TblFuncionarios
+from app.schemas.lancamento import LancamentoSerieCreate
+from app.services.fechamento_service import FechamentoService
+
+
+# Códigos de FlgFrequencia: (unidade, quantidade)
+FREQUENCIAS = {
+    1: ("dias", 7),      # Semanal
+    2: ("dias", 15),     # Quinzenal
+    3: ("meses", 1),     # Mensal
+    4: ("meses", 2),     # Bimestral
+    5: ("meses", 3),     # Trimestral
+    6: ("meses", 6),     # Semestral
+    7: ("meses", 12),    # Anual
+}
+
+# Campos copiados do lançamento de origem para as demais ocorrências
+CAMPOS_SERIE = (
+    "CodEmpresa", "CodConta", "CodFavorecido", "CodCategoria", "NumDocto", "data_emissao",
+    "IndMov", "Comentario", "flg_frequencia", "qtd_parcelas", "cod_forma_pagto"
+)
+
+
+def data_ocorrencia(inicio: date, frequencia: int, indice: int, ajustar_dia_util: bool = False) -> date:
+    """
+    Data da ocorrência `indice` (0 = inicio) de uma série.
+
+    Séries mensais mantêm o dia do início e usam o último dia do mês quando
+    ele não existe (31/01 -> 29/02 -> 31/03).
+    """
+    unidade, quantidade = FREQUENCIAS[frequencia]
+    if unidade == "dias":
+        resultado = inicio + timedelta(days=quantidade * indice)
+    else:
+        meses = inicio.month - 1 + quantidade * indice
+        ano = inicio.year + meses // 12
+        mes = meses % 12 + 1
+        resultado = date(ano, mes, min(inicio.day, calendar.monthrange(ano, mes)[1]))
+
+    if ajustar_dia_util:
+        while resultado.weekday() >= 5:
+            resultado += timedelta(days=1)
+    return resultado
+
+
+def dividir_valor(total: Decimal, parcelas: int) -> List[Decimal]:
+    """Divide o total em parcelas iguais em centavos; a última absorve a diferença"""
+    total = Decimal(str(total)).quantize(Decimal("0.01"))
+    base = (total / parcelas).quantize(Decimal("0.01"), rounding=ROUND_DOWN)
+    return [base] * (parcelas - 1) + [total - base * (parcelas - 1)]
+
+
+class ParcelamentoService:
+    """
+    Geração de séries de lançamentos (parcelas ou recorrências).
+
+    O primeiro lançamento é a origem da série (parcela_atual = 1); os demais
+    apontam para ele em cod_lancamento_anterior. Parcelamentos são gravados
+    completos; recorrências são gravadas apenas até o horizonte configurado e
+    materializadas sob demanda conforme as datas consultadas avançam.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def criar_serie(self, serie: LancamentoSerieCreate, current_user: TblFuncionarios) -> Dict:
+        """Cria a série e grava as ocorrências em um único INSERT em lote"""
+        self._validate_serie(serie)
+        FechamentoService(self.db).verificar_aberto(serie.Data)
+
+        parcelado = serie.tipo == 'parcelado'
+        qtd = serie.qtd_parcelas
+        if parcelado:
+            valores = dividir_valor(Decimal(str(serie.Valor)), qtd)
+            limite = qtd
+        else:
+            valores = None
+            limite = qtd or settings.LANCAMENTO_MAX_PARCELAS
+        horizonte = None if parcelado else date.today() + timedelta(days=settings.LANCAMENTO_RECORRENCIA_HORIZONTE_DIAS)
+
+        now = datetime.now()
+        origem = Lancamento(
+            CodEmpresa=serie.CodEmpresa,
+            CodConta=serie.CodConta,
+            CodFavorecido=serie.CodFavorecido,
+            CodCategoria=serie.CodCategoria,
+            NumDocto=serie.NumDocto,
+            data_emissao=serie.DataEmissao,
+            Data=data_ocorrencia(serie.Data, serie.FlgFrequencia, 0, serie.ajustar_dia_util),
+            IndMov=serie.IndMov,
+            Valor=valores[0] if parcelado else Decimal(str(serie.Valor)),
+            flg_confirmacao=False,
+            Comentario=serie.Observacao,
+            flg_frequencia=serie.FlgFrequencia,
+            qtd_parcelas=qtd,
+            parcela_atual=1,
+            cod_forma_pagto=serie.CodFormaPagto,
+            DatCadastro=now,
+            NomUsuario=current_user.Login
+        )
+
+        try:
+            self.db.add(origem)
+            self.db.flush()
+
+            rows = self._build_rows(
+                origem, serie.Data, range(1, limite), horizonte, serie.ajustar_dia_util,
+                current_user.Login, now, valores
+            )
+            if rows:
+                self.db.execute(insert(Lancamento), rows)
+
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao gerar lançamentos: {str(e)}"
+            )
+
+        return {
+            "CodLancamentoOrigem": origem.CodLancamento,
+            "gerados": len(rows) + 1,
+            "datas": [origem.Data] + [row["Data"] for row in rows]
+        }
+
+    def materializar_recorrencias(self, ate: date, current_user_login: str = "sistema") -> int:
+        """Grava as ocorrências de recorrências ainda não materializadas até a data; retorna o total"""
+        origens = self._recorrencias_pendentes()
+
+        now = datetime.now()
+        rows: List[Dict] = []
+        for origem, ultima in origens:
+            limite = origem.qtd_parcelas or settings.LANCAMENTO_MAX_PARCELAS
+            rows.extend(self._build_rows(
+                origem, origem.Data, range(ultima, limite), ate, False, current_user_login, now, None
+            ))
+
+        if not rows:
+            return 0
+
+        try:
+            self.db.execute(insert(Lancamento), rows)
+            self.db.commit()
+            return len(rows)
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao materializar recorrências: {str(e)}"
+            )
+
+    def projetar_recorrencias(self, ate: date, empresa_id: Optional[int] = None) -> List[Dict]:
+        """Ocorrências futuras ainda não gravadas até a data, sem gravá-las (usado na previsão de caixa)"""
+        now = datetime.now()
+        rows: List[Dict] = []
+        for origem, ultima in self._recorrencias_pendentes(empresa_id):
+            limite = origem.qtd_parcelas or settings.LANCAMENTO_MAX_PARCELAS
+            rows.extend(self._build_rows(
+                origem, origem.Data, range(ultima, limite), ate, False, "", now, None
+            ))
+        return rows
+
+    def _recorrencias_pendentes(self, empresa_id: Optional[int] = None) -> List:
+        """Origens de recorrências com ocorrências a gerar e o número da última já gravada"""
+        ultimas = select(
+            Lancamento.cod_lancamento_anterior.label("origem"),
+            func.max(Lancamento.parcela_atual).label("ultima")
+        ).where(
+            Lancamento.cod_lancamento_anterior.isnot(None)
+        ).group_by(Lancamento.cod_lancamento_anterior).subquery()
+
+        query = select(Lancamento, func.coalesce(ultimas.c.ultima, 1)).outerjoin(
+            ultimas, ultimas.c.origem == Lancamento.CodLancamento
+        ).where(
+            Lancamento.flg_frequencia.in_(list(FREQUENCIAS)),
+            Lancamento.cod_lancamento_anterior.is_(None),
+            Lancamento.parcela_atual == 1,
+            or_(Lancamento.qtd_parcelas.is_(None), Lancamento.qtd_parcelas > func.coalesce(ultimas.c.ultima, 1))
+        )
+        if empresa_id:
+            query = query.where(Lancamento.CodEmpresa == empresa_id)
+
+        return self.db.execute(query).all()
+
+    def _build_rows(
+        self,
+        origem: Lancamento,
+        inicio: date,
+        indices: range,
+        ate: Optional[date],
+        ajustar_dia_util: bool,
+        login: str,
+        now: datetime,
+        valores: Optional[List[Decimal]]
+    ) -> List[Dict]:
+        """Linhas das ocorrências `indices` (base 0) até a data limite"""
+        rows = []
+        for indice in indices:
+            data = data_ocorrencia(inicio, origem.flg_frequencia, indice, ajustar_dia_util)
+            if ate is not None and data > ate:
+                break
+            row = {campo: getattr(origem, campo) for campo in CAMPOS_SERIE}
+            row.update({
+                "Data": data,
+                "Valor": valores[indice] if valores else origem.Valor,
+                "flg_confirmacao": False,
+                "parcela_atual": indice + 1,
+                "cod_lancamento_anterior": origem.CodLancamento,
+                "DatCadastro": now,
+                "NomUsuario": login
+            })
+            rows.append(row)
+        return rows
+
+    def _validate_serie(self, serie: LancamentoSerieCreate) -> None:
+        """Validações de negócio da série"""
+        if serie.FlgFrequencia not in FREQUENCIAS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Frequência inválida. Valores aceitos: {', '.join(str(f) for f in FREQUENCIAS)}"
+            )
+
+        if serie.tipo == 'recorrente' and serie.ajustar_dia_util:
+            # Recorrências são materializadas depois a partir da data de origem
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Ajuste para dia útil disponível apenas para parcelamentos"
+            )
+
+        if serie.Valor <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Valor deve ser maior que zero"
+            )
+
+        if serie.tipo == 'parcelado' and (not serie.qtd_parcelas or serie.qtd_parcelas < 2):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Parcelamento exige ao menos 2 parcelas"
+            )
+
+        if serie.qtd_parcelas and serie.qtd_parcelas > settings.LANCAMENTO_MAX_PARCELAS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Quantidade máxima de parcelas é {settings.LANCAMENTO_MAX_PARCELAS}"
+            )
+
+        if serie.tipo == 'parcelado' and Decimal(str(serie.Valor)) < Decimal("0.01") * serie.qtd_parcelas:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Valor insuficiente para a quantidade de parcelas"
+            )
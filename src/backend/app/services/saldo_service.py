@@ -0,0 +1,195 @@
+"""
+Serviço de Saldos de Contas (razão de saldos diários)
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, insert, update, delete, case, func
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.models.conta import Conta
+from app.models.lancamento import Lancamento
+from app.models.saldo_dia import SaldoDia
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+class SaldoService:
+    """
+    Mantém os saldos das contas de forma incremental.
+
+    Cada confirmação (ou estorno) de lançamento aplica um delta no snapshot do
+    dia e desloca os snapshots posteriores com um único UPDATE, de modo que o
+    saldo em uma data é sempre o SaldoFinal do último snapshot até a data.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_lancamento(self, lancamento: Lancamento, estorno: bool = False) -> None:
+        """Aplica (ou estorna) um lançamento confirmado no saldo da conta (não faz commit)"""
+        if not lancamento.CodConta:
+            return
+
+        delta = Decimal(str(lancamento.Valor or 0))
+        if not lancamento.IndMov:
+            delta = -delta
+        if estorno:
+            delta = -delta
+
+        self.apply_delta(lancamento.CodConta, lancamento.Data, delta)
+
+    def apply_delta(self, conta_id: int, data, delta: Decimal) -> None:
+        """Aplica um delta no snapshot do dia e nos dias seguintes (não faz commit)"""
+        if not delta:
+            return
+
+        data = _as_date(data)
+        now = datetime.utcnow()
+
+        # Atualizar a conta primeiro: o bloqueio da linha serializa
+        # confirmações concorrentes na mesma conta
+        self.db.execute(
+            update(Conta)
+            .where(Conta.idConta == conta_id)
+            .values(Saldo=func.coalesce(Conta.Saldo, 0) + delta)
+        )
+
+        result = self.db.execute(
+            update(SaldoDia)
+            .where(SaldoDia.idConta == conta_id, SaldoDia.Data == data)
+            .values(
+                SaldoDia=SaldoDia.SaldoDia + delta,
+                SaldoFinal=SaldoDia.SaldoFinal + delta,
+                DatProcessamento=now
+            )
+        )
+
+        if result.rowcount == 0:
+            saldo_anterior = self._saldo_final_ate(conta_id, data, inclusive=False)
+            self.db.execute(
+                insert(SaldoDia).values(
+                    idConta=conta_id,
+                    Data=data,
+                    SaldoInicial=saldo_anterior,
+                    SaldoDia=delta,
+                    SaldoFinal=saldo_anterior + delta,
+                    DatProcessamento=now
+                )
+            )
+
+        self.db.execute(
+            update(SaldoDia)
+            .where(SaldoDia.idConta == conta_id, SaldoDia.Data > data)
+            .values(
+                SaldoInicial=SaldoDia.SaldoInicial + delta,
+                SaldoFinal=SaldoDia.SaldoFinal + delta,
+                DatProcessamento=now
+            )
+        )
+
+    def get_saldo(self, conta_id: int, data: Optional[date] = None) -> Decimal:
+        """Saldo da conta ao final da data informada (padrão: hoje)"""
+        return self._saldo_final_ate(conta_id, _as_date(data or date.today()), inclusive=True)
+
+    def get_historico(self, conta_id: int, data_inicio: date, data_fim: date) -> Dict:
+        """Saldo inicial, final e snapshots dos dias com movimento no período"""
+        data_inicio = _as_date(data_inicio)
+        data_fim = _as_date(data_fim)
+
+        if data_inicio > data_fim:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Data inicial não pode ser posterior à data final"
+            )
+
+        rows = self.db.execute(
+            select(SaldoDia.Data, SaldoDia.SaldoInicial, SaldoDia.SaldoDia, SaldoDia.SaldoFinal)
+            .where(
+                SaldoDia.idConta == conta_id,
+                SaldoDia.Data >= data_inicio,
+                SaldoDia.Data <= data_fim
+            )
+            .order_by(SaldoDia.Data)
+        ).all()
+
+        saldo_inicial = self._saldo_final_ate(conta_id, data_inicio, inclusive=False)
+        dias: List[Dict] = [
+            {
+                "data": row[0],
+                "saldo_inicial": row[1],
+                "movimento": row[2],
+                "saldo_final": row[3]
+            }
+            for row in rows
+        ]
+
+        return {
+            "idConta": conta_id,
+            "data_inicio": data_inicio,
+            "data_fim": data_fim,
+            "saldo_inicial": saldo_inicial,
+            "saldo_final": dias[-1]["saldo_final"] if dias else saldo_inicial,
+            "dias": dias
+        }
+
+    def rebuild(self, conta_id: int, saldo_abertura: Decimal = Decimal("0")) -> Decimal:
+        """
+        Recalcula todos os snapshots da conta a partir dos lançamentos confirmados.
+
+        A soma é feita no banco por dia; o saldo acumulado é calculado em memória
+        sobre os totais diários. Retorna o saldo atual da conta.
+        """
+        totais = self.db.execute(
+            select(
+                Lancamento.Data,
+                func.sum(case((Lancamento.IndMov == True, Lancamento.Valor), else_=-Lancamento.Valor))
+            )
+            .where(Lancamento.CodConta == conta_id, Lancamento.flg_confirmacao == True)
+            .group_by(Lancamento.Data)
+            .order_by(Lancamento.Data)
+        ).all()
+
+        now = datetime.utcnow()
+        saldo = Decimal(str(saldo_abertura))
+        rows = []
+        for data, movimento in totais:
+            movimento = Decimal(str(movimento or 0))
+            rows.append({
+                "idConta": conta_id,
+                "Data": data,
+                "SaldoInicial": saldo,
+                "SaldoDia": movimento,
+                "SaldoFinal": saldo + movimento,
+                "DatProcessamento": now
+            })
+            saldo += movimento
+
+        try:
+            self.db.execute(delete(SaldoDia).where(SaldoDia.idConta == conta_id))
+            if rows:
+                self.db.execute(insert(SaldoDia), rows)
+            self.db.execute(update(Conta).where(Conta.idConta == conta_id).values(Saldo=saldo))
+            self.db.commit()
+            return saldo
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao recalcular saldos da conta: {str(e)}"
+            )
+
+    def _saldo_final_ate(self, conta_id: int, data: date, inclusive: bool) -> Decimal:
+        """SaldoFinal do último snapshot até a data (busca pontual pelo índice idConta, Data)"""
+        criterio = SaldoDia.Data <= data if inclusive else SaldoDia.Data < data
+        saldo = self.db.execute(
+            select(SaldoDia.SaldoFinal)
+            .where(SaldoDia.idConta == conta_id, criterio)
+            .order_by(SaldoDia.Data.desc())
+            .limit(1)
+        ).scalar()
+        return Decimal(str(saldo)) if saldo is not None else Decimal("0")
@@ -0,0 +1,137 @@
+"""
+Serviço de manutenção da situação dos títulos a pagar/receber
+"""
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from sqlalchemy import select, delete, insert, func, case, cast, literal, text, Integer, Date, String, DateTime
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.accounts_payable import AccountsPayable
+from app.models.accounts_receivable import AccountsReceivable
+from app.models.situacao_titulo import SituacaoTitulo
+
+
+# Tipo de título -> modelo de origem
+TITULO_SOURCES = {
+    "pagar": AccountsPayable,
+    "receber": AccountsReceivable,
+}
+
+
+class StatusTituloService:
+    """Serviço para recalcular a situação (aberto/vencido) e os dias de atraso dos títulos"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def atualizar_todos(self, data_base: Optional[date] = None, chunk_size: Optional[int] = None) -> int:
+        """Atualiza contas a pagar e a receber; retorna o total de títulos em aberto"""
+        return sum(
+            self.atualizar(tipo, data_base, chunk_size)
+            for tipo in TITULO_SOURCES
+        )
+
+    def atualizar(self, tipo: str, data_base: Optional[date] = None, chunk_size: Optional[int] = None) -> int:
+        """
+        Recalcula a situação de todos os títulos em aberto de um tipo.
+
+        Os títulos são percorridos em faixas de chave primária (keyset) e cada
+        faixa é regravada com um DELETE e um INSERT ... SELECT, sem carregar os
+        títulos na aplicação. Cada faixa tem o seu commit, para não manter
+        bloqueios longos. Retorna o total de títulos em aberto.
+        """
+        model = TITULO_SOURCES[tipo]
+        data_base = data_base or date.today()
+        chunk_size = chunk_size or settings.STATUS_TITULOS_CHUNK_SIZE
+        last_id = 0
+        total = 0
+
+        while True:
+            ids = self.db.execute(
+                select(model.id).where(model.id > last_id).order_by(model.id).limit(chunk_size)
+            ).scalars().all()
+            if not ids:
+                break
+
+            total += self._atualizar_faixa(tipo, model, last_id, ids[-1], data_base)
+            last_id = ids[-1]
+
+        # Títulos excluídos depois do último id existente
+        self.db.execute(
+            delete(SituacaoTitulo).where(
+                SituacaoTitulo.Tipo == tipo,
+                SituacaoTitulo.IdTitulo > last_id
+            )
+        )
+        self.db.commit()
+        return total
+
+    def contar_vencidos(self, tipo: str) -> int:
+        """Quantidade de títulos vencidos segundo a última atualização"""
+        return self.db.execute(
+            select(func.count()).select_from(SituacaoTitulo).where(
+                SituacaoTitulo.Tipo == tipo,
+                SituacaoTitulo.Status == 'V'
+            )
+        ).scalar() or 0
+
+    def get_situacao(self, tipo: str, titulo_id: int) -> Optional[Dict]:
+        """Situação calculada de um título (None se pago ou ainda não processado)"""
+        situacao = self.db.execute(
+            select(SituacaoTitulo).where(
+                SituacaoTitulo.Tipo == tipo,
+                SituacaoTitulo.IdTitulo == titulo_id
+            )
+        ).scalar_one_or_none()
+        if situacao is None:
+            return None
+        return {
+            "status": situacao.Status,
+            "dias_atraso": situacao.DiasAtraso,
+            "data_base": situacao.DataBase,
+        }
+
+    def _atualizar_faixa(self, tipo: str, model, inicio: int, fim: int, data_base: date) -> int:
+        try:
+            self.db.execute(
+                delete(SituacaoTitulo).where(
+                    SituacaoTitulo.Tipo == tipo,
+                    SituacaoTitulo.IdTitulo > inicio,
+                    SituacaoTitulo.IdTitulo <= fim
+                )
+            )
+
+            base = literal(data_base, Date)
+            vencido = model.due_date < base
+            origem = select(
+                literal(tipo, String),
+                model.id,
+                case((vencido, 'V'), else_='A'),
+                case((vencido, self._dias_entre(model.due_date, base)), else_=0),
+                base,
+                literal(datetime.utcnow(), DateTime)
+            ).where(
+                model.id > inicio,
+                model.id <= fim,
+                model.payment_date.is_(None)
+            )
+
+            result = self.db.execute(
+                insert(SituacaoTitulo).from_select(
+                    ["Tipo", "IdTitulo", "Status", "DiasAtraso", "DataBase", "DatAtualizacao"],
+                    origem
+                )
+            )
+            self.db.commit()
+            return result.rowcount or 0
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def _dias_entre(self, inicio, fim):
+        # Diferença em dias calculada no próprio banco
+        if self.db.get_bind().dialect.name == "sqlite":
+            return cast(func.julianday(fim) - func.julianday(inicio), Integer)
+        return func.datediff(text("day"), inicio, fim)
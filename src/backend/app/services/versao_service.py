@@ -0,0 +1,151 @@
+"""
+Serviço de versões por tabela para requisições condicionais (ETag/Last-Modified)
+"""
+import hashlib
+import time
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.versao_tabela import VersaoTabela
+
+# Tabelas alteradas na transação corrente, em Session.info
+_ALTERADAS = "versao_tabelas_alteradas"
+
+
+def incrementar_versoes(executor, tabelas: Iterable[str], agora: Optional[datetime] = None) -> None:
+    """
+    Incrementa a versão das tabelas (executor: Session ou Connection).
+
+    As linhas são atualizadas em ordem alfabética para que transações
+    concorrentes travem os contadores sempre na mesma ordem.
+    """
+    agora = agora or datetime.utcnow()
+    for tabela in sorted(set(tabelas)):
+        atualizar = update(VersaoTabela).where(VersaoTabela.Tabela == tabela).values(
+            Versao=VersaoTabela.Versao + 1, DatAlteracao=agora
+        )
+        if executor.execute(atualizar).rowcount:
+            continue
+        try:
+            executor.execute(insert(VersaoTabela).values(Tabela=tabela, Versao=1, DatAlteracao=agora))
+        except IntegrityError:
+            # Outra transação criou o contador primeiro
+            executor.execute(atualizar)
+
+
+def _tabelas_alteradas(session: Session) -> set:
+    return session.info.setdefault(_ALTERADAS, set())
+
+
+def _apos_flush(session: Session, flush_context) -> None:
+    alteradas = _tabelas_alteradas(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tabela = getattr(obj, "__tablename__", None)
+        if tabela and tabela != VersaoTabela.__tablename__:
+            alteradas.add(tabela)
+
+
+def _apos_execucao_orm(orm_execute_state) -> None:
+    # UPDATE/DELETE/INSERT em lote (session.execute(update(...)), query.update(), INSERT ... SELECT)
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    tabela = getattr(orm_execute_state.statement.table, "name", None)
+    if tabela and tabela != VersaoTabela.__tablename__:
+        _tabelas_alteradas(orm_execute_state.session).add(tabela)
+
+
+def _antes_commit(session: Session) -> None:
+    # O commit ainda não fez o flush final: sem ele as alterações pendentes não seriam vistas
+    session.flush()
+    alteradas = session.info.pop(_ALTERADAS, None)
+    if alteradas:
+        incrementar_versoes(session, alteradas)
+
+
+def _descartar(session: Session, *args) -> None:
+    session.info.pop(_ALTERADAS, None)
+
+
+def registrar_versionamento(session_factory) -> None:
+    """Mantém as versões das tabelas alteradas pelas sessões da fábrica"""
+    event.listen(session_factory, "after_flush", _apos_flush)
+    event.listen(session_factory, "do_orm_execute", _apos_execucao_orm)
+    event.listen(session_factory, "before_commit", _antes_commit)
+    event.listen(session_factory, "after_rollback", _descartar)
+
+
+def _etag_corresponde(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Comparação fraca: W/"x" e "x" são equivalentes
+    valores = {valor.strip().removeprefix("W/") for valor in if_none_match.split(",")}
+    return etag.removeprefix("W/") in valores
+
+
+def nao_modificado(
+    etag: str,
+    ultima_alteracao: datetime,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str]
+) -> bool:
+    """Se a cópia do cliente ainda vale (If-None-Match tem precedência sobre If-Modified-Since)"""
+    if if_none_match:
+        return _etag_corresponde(if_none_match, etag)
+    if if_modified_since:
+        try:
+            desde = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if desde.tzinfo is None:
+            desde = desde.replace(tzinfo=timezone.utc)
+        return ultima_alteracao.replace(microsecond=0) <= desde
+    return False
+
+
+class VersaoService:
+    """Validadores HTTP calculados a partir das versões das tabelas"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def validadores(self, tabelas: Sequence[str], hoje: Optional[date] = None) -> Tuple[str, datetime]:
+        """
+        ETag e Last-Modified (UTC) do conjunto de tabelas.
+
+        Entram também a data do dia (rotas com padrão "hoje") e, se
+        ETAG_JANELA > 0, a janela de tempo corrente: alterações feitas fora da
+        API, que não incrementam as versões, ficam visíveis em no máximo
+        ETAG_JANELA segundos.
+        """
+        hoje = hoje or date.today()
+        versoes = dict.fromkeys(tabelas, (0, None))
+        for tabela, versao, alteracao in self.db.execute(
+            select(VersaoTabela.Tabela, VersaoTabela.Versao, VersaoTabela.DatAlteracao)
+            .where(VersaoTabela.Tabela.in_(tabelas))
+        ):
+            versoes[tabela] = (versao, alteracao)
+
+        limites = [datetime.combine(hoje, datetime.min.time()).astimezone(timezone.utc)]
+        partes = [hoje.isoformat()]
+        if settings.ETAG_JANELA > 0:
+            janela = int(time.time()) // settings.ETAG_JANELA
+            limites.append(datetime.fromtimestamp(janela * settings.ETAG_JANELA, timezone.utc))
+            partes.append(str(janela))
+        for tabela in sorted(versoes):
+            versao, alteracao = versoes[tabela]
+            partes.append(f"{tabela}:{versao}")
+            if alteracao is not None:
+                limites.append(alteracao.replace(tzinfo=timezone.utc))
+
+        etag = 'W/"' + hashlib.sha1("|".join(partes).encode()).hexdigest()[:20] + '"'
+        return etag, max(limites)
+
+    def incrementar(self, tabelas: Iterable[str]) -> None:
+        """Incrementa a versão das tabelas na transação corrente"""
+        incrementar_versoes(self.db, tabelas)
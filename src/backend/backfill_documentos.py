@@ -0,0 +1,44 @@
+import argparse
+
+from app.core.database import engine, SessionLocal
+from app.models.documento_indice import DocumentoIndice
+from app.services.documento_service import DocumentoIndexService, DOCUMENTO_SOURCES
+
+
+def backfill_documentos(entidades, batch_size):
+    try:
+        # Criar a tabela do índice se ainda não existir
+        DocumentoIndice.__table__.create(bind=engine, checkfirst=True)
+
+        db = SessionLocal()
+        try:
+            service = DocumentoIndexService(db)
+
+            for entidade in entidades:
+                print(f"=== INDEXANDO {entidade} ===")
+                total = service.backfill(entidade, batch_size=batch_size)
+                print(f"{total} registros processados")
+
+            print("\n=== DOCUMENTOS DUPLICADOS ===")
+            duplicados = [
+                item for entidade in entidades
+                for item in service.duplicate_report(entidade)
+            ]
+            for item in duplicados:
+                codigos = ", ".join(str(codigo) for codigo in item["codigos"])
+                print(f"{item['entidade']} {item['documento']}: {codigos}")
+            print(f"\nTotal de documentos duplicados: {len(duplicados)}")
+        finally:
+            db.close()
+
+    except Exception as e:
+        print(f"Erro ao indexar documentos: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Popula o índice de CPF/CNPJ normalizados")
+    parser.add_argument("--entidade", choices=sorted(DOCUMENTO_SOURCES), help="Indexar apenas uma entidade")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Registros por lote")
+    args = parser.parse_args()
+
+    backfill_documentos([args.entidade] if args.entidade else sorted(DOCUMENTO_SOURCES), args.batch_size)
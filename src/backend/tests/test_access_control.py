@@ -0,0 +1,107 @@
+"""
+Tests for token revocation and login rate limiting
+"""
+from datetime import datetime
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.core.config import settings
+from app.core.database import Base, get_db
+from app.core.security import HashUtil
+from app.core.access_control import MemoryBackend, access_backend
+from app.models.funcionario import TblFuncionarios
+
+LOGIN_URL = "/api/v1/auth/login"
+
+
+def test_sliding_window_and_bucket():
+    """Janela deslizante conta eventos recentes; o balde repõe fichas pela taxa"""
+    backend = MemoryBackend()
+    assert [backend.hit("k", 60) for _ in range(3)] == [1, 2, 3]
+    total, retry_after = backend.count("k", 60)
+    assert total == 3 and 59 < retry_after <= 60
+    assert backend.count("k", 0.000001) == (0, 0.0)
+    backend.reset("k")
+    assert backend.count("k", 60) == (0, 0.0)
+
+    assert [backend.take("ip", capacity=2, rate=0.5)[0] for _ in range(3)] == [True, True, False]
+    allowed, retry_after = backend.take("ip", capacity=2, rate=0.5)
+    assert not allowed and 1.9 < retry_after <= 2.0
+
+
+def test_revocation_expires_with_token():
+    """Token revogado só até o vencimento; vencidos saem da lista"""
+    backend = MemoryBackend(max_keys=10)
+    backend.revoke("velho", time.time() - 1)
+    backend.revoke("novo", time.time() + 60)
+    assert not backend.is_revoked("velho")
+    assert backend.is_revoked("novo")
+    assert list(backend._revoked) == ["novo"]
+
+
+@pytest.fixture
+def client():
+    """API com um funcionário ativo (senha 'segredo') e limites zerados"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[TblFuncionarios.__table__])
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        db.add(TblFuncionarios(
+            CodFuncionario=7, Login="teste", Nome="Teste", Senha=HashUtil.gera_hash("segredo"),
+            DatCadastro=datetime(2024, 1, 1), NomUsuario="teste"
+        ))
+        db.commit()
+
+    def _get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    access_backend.clear()
+    app.dependency_overrides[get_db] = _get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+    access_backend.clear()
+
+
+def test_failed_logins_are_limited_before_the_database(client):
+    """Após RATE_LIMIT_REQUESTS falhas o login é bloqueado, mesmo com a senha certa"""
+    for _ in range(settings.RATE_LIMIT_REQUESTS):
+        assert client.post(LOGIN_URL, json={"login": "teste", "senha": "errada"}).status_code == 401
+
+    response = client.post(LOGIN_URL, json={"login": "teste", "senha": "segredo"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # Outro login do mesmo IP não é afetado
+    assert client.post(LOGIN_URL, json={"login": "outro", "senha": "x"}).status_code == 401
+
+
+def test_successful_login_resets_failures(client):
+    """Login correto zera as falhas acumuladas"""
+    for _ in range(settings.RATE_LIMIT_REQUESTS - 1):
+        client.post(LOGIN_URL, json={"login": "teste", "senha": "errada"})
+    assert client.post(LOGIN_URL, json={"login": "teste", "senha": "segredo"}).status_code == 200
+    assert client.post(LOGIN_URL, json={"login": "teste", "senha": "errada"}).status_code == 401
+    assert client.post(LOGIN_URL, json={"login": "teste", "senha": "segredo"}).status_code == 200
+
+
+def test_logout_revokes_token(client):
+    """Depois do logout o token deixa de ser aceito; outros tokens continuam válidos"""
+    tokens = [client.post(LOGIN_URL, json={"login": "teste", "senha": "segredo"}).json()["access_token"] for _ in range(2)]
+    headers = [{"Authorization": f"Bearer {token}"} for token in tokens]
+
+    assert client.post("/api/v1/auth/logout", headers=headers[0]).status_code == 200
+
+    response = client.get("/api/v1/auth/me", headers=headers[0])
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token revogado"
+    assert client.get("/api/v1/auth/me", headers=headers[1]).status_code == 200
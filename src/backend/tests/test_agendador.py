@@ -0,0 +1,111 @@
+"""
+Tests for the scheduled status-maintenance job and the scheduler lease
+"""
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine, Column, MetaData, Table
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models.accounts_payable import AccountsPayable
+from app.models.accounts_receivable import AccountsReceivable
+from app.models.situacao_titulo import SituacaoTitulo
+from app.models.tarefa_agendada import TarefaAgendada
+from app.services.agendador_service import Agendador, Tarefa
+from app.services.status_titulo_service import StatusTituloService
+
+
+def _create_table(engine, table):
+    """Cria a tabela sem as chaves estrangeiras para tabelas legadas sem modelo"""
+    columns = [Column(c.name, c.type, primary_key=c.primary_key) for c in table.columns]
+    copia = Table(table.name, MetaData(), *columns)
+    copia.create(engine)
+    return copia
+
+
+@pytest.fixture
+def session_factory():
+    """Fábrica de sessões SQLite compartilhando o mesmo banco em memória"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    receber = _create_table(engine, AccountsReceivable.__table__)
+    _create_table(engine, AccountsPayable.__table__)
+    Base.metadata.create_all(engine, tables=[SituacaoTitulo.__table__, TarefaAgendada.__table__])
+
+    hoje = date(2024, 6, 30)
+    titulos = [
+        # (id, dias de atraso, data de pagamento)
+        (1, -10, None),
+        (2, 0, None),
+        (3, 5, None),
+        (4, 45, None),
+        (5, 45, hoje),
+    ]
+    with engine.begin() as conn:
+        conn.execute(receber.insert(), [
+            {
+                "IdAccountsReceivable": codigo, "Amount": 100, "IssuanceDate": hoje - timedelta(days=90),
+                "DueDate": hoje - timedelta(days=atraso), "PaymentDate": pagamento,
+                "IdDocumentType": 1, "IdUserCreate": 1, "DateCreate": datetime(2024, 1, 1)
+            }
+            for codigo, atraso, pagamento in titulos
+        ])
+    return sessionmaker(bind=engine)
+
+
+def test_status_titulos_in_chunks(session_factory):
+    """Situação e dias de atraso recalculados em lotes, sem títulos pagos"""
+    db = session_factory()
+    service = StatusTituloService(db)
+
+    assert service.atualizar("receber", data_base=date(2024, 6, 30), chunk_size=2) == 4
+    assert service.get_situacao("receber", 1)["status"] == "A"
+    assert service.get_situacao("receber", 2) == {"status": "A", "dias_atraso": 0, "data_base": date(2024, 6, 30)}
+    assert service.get_situacao("receber", 3)["dias_atraso"] == 5
+    assert service.get_situacao("receber", 4) == {"status": "V", "dias_atraso": 45, "data_base": date(2024, 6, 30)}
+    assert service.get_situacao("receber", 5) is None
+    assert service.contar_vencidos("receber") == 2
+
+    # Nova data base: títulos a vencer passam a vencidos
+    service.atualizar("receber", data_base=date(2024, 7, 15), chunk_size=3)
+    assert service.contar_vencidos("receber") == 4
+    assert service.get_situacao("receber", 1)["dias_atraso"] == 5
+    db.close()
+
+
+def test_agendador_single_leader(session_factory):
+    """Apenas um processo executa a tarefa; a execução fica registrada"""
+    execucoes = []
+    tarefa = Tarefa(nome="teste", descricao="Teste", intervalo=3600, executar=lambda db: execucoes.append(1) or 7)
+    worker_a = Agendador([tarefa], session_factory=session_factory, identidade="a")
+    worker_b = Agendador([tarefa], session_factory=session_factory, identidade="b")
+
+    resultado = worker_a.executar("teste")
+    assert resultado["registros"] == 7
+    assert resultado["sucesso"] is True
+    assert resultado["ultima_execucao"] is not None
+
+    # Tarefa ainda não vencida para os demais processos
+    assert worker_b.executar("teste") is None
+    assert len(execucoes) == 1
+
+    # Lease ativo de outro processo bloqueia até a execução forçada
+    db = session_factory()
+    db.query(TarefaAgendada).update({"Lider": "a", "LeaseAte": datetime.now() + timedelta(minutes=5)})
+    db.commit()
+    assert worker_b.executar("teste", forcar=True) is None
+    assert worker_a.executar("teste", forcar=True)["lider"] == "a"
+    assert len(execucoes) == 2
+
+    assert [t["nome"] for t in worker_b.listar(db)] == ["teste"]
+    db.close()
+
+
+def test_agendador_records_failure(session_factory):
+    """Erro da tarefa é registrado sem interromper o agendador"""
+    def falha(db):
+        raise RuntimeError("falhou")
+
+    worker = Agendador([Tarefa("falha", "Falha", 60, falha)], session_factory=session_factory, identidade="a")
+    resultado = worker.executar("falha")
+    assert resultado["sucesso"] is False
+    assert resultado["erro"] == "falhou"
@@ -0,0 +1,90 @@
+"""
+Tests for the accounts receivable/payable aging report
+"""
+import pytest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import create_engine, Column, MetaData, Table
+from sqlalchemy.orm import sessionmaker
+from app.models.accounts_receivable import AccountsReceivable
+from app.models.accounts_payable import AccountsPayable
+from app.models.favorecido import Favorecido
+from app.models.empresa import Empresa
+from app.services.dashboard_service import DashboardService
+
+
+def _create_table(engine, table):
+    """Cria a tabela sem as chaves estrangeiras para tabelas legadas sem modelo"""
+    columns = [Column(c.name, c.type, primary_key=c.primary_key) for c in table.columns]
+    copia = Table(table.name, MetaData(), *columns)
+    copia.create(engine)
+    return copia
+
+
+@pytest.fixture
+def session():
+    """Sessão SQLite com títulos em aberto em várias faixas de atraso"""
+    engine = create_engine("sqlite://")
+    receber = _create_table(engine, AccountsReceivable.__table__)
+    for model in (AccountsPayable, Favorecido, Empresa):
+        _create_table(engine, model.__table__)
+    db = sessionmaker(bind=engine)()
+
+    db.add_all([
+        Favorecido(CodFavorecido=1, DesFavorecido="Cliente A"),
+        Favorecido(CodFavorecido=2, DesFavorecido="Cliente B"),
+    ])
+
+    hoje = date(2024, 6, 30)
+    titulos = [
+        # (cliente, dias de atraso, valor, pago, data de pagamento)
+        (1, -5, "100.00", None, None),
+        (1, 1, "200.00", "50.00", None),
+        (1, 30, "10.00", None, None),
+        (2, 31, "300.00", None, None),
+        (2, 75, "400.00", None, None),
+        (2, 120, "500.00", None, None),
+        (2, 120, "999.00", "999.00", hoje),
+    ]
+    db.execute(receber.insert(), [
+        {
+            "IdAccountsReceivable": codigo, "IdCompany": 1, "Amount": Decimal(valor),
+            "PaidAmount": Decimal(pago) if pago else None,
+            "IssuanceDate": hoje - timedelta(days=200), "DueDate": hoje - timedelta(days=atraso),
+            "PaymentDate": pagamento, "IdCustomer": cliente, "IdDocumentType": 1,
+            "IdUserCreate": 1, "DateCreate": datetime(2024, 1, 1)
+        }
+        for codigo, (cliente, atraso, valor, pago, pagamento) in enumerate(titulos, start=1)
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+def test_aging_report_by_customer(session):
+    """Valores em aberto e quantidades por faixa, por cliente"""
+    report = DashboardService(session).get_aging_report('receivable', data_base=date(2024, 6, 30))
+
+    assert report["faixas"] == ["a_vencer", "1_30", "31_60", "61_90", "90_mais"]
+    assert report["totais"]["1_30"] == {"valor": 160.0, "quantidade": 2}
+    assert report["totais"]["90_mais"] == {"valor": 500.0, "quantidade": 1}
+
+    cliente_a, cliente_b = report["grupos"]
+    assert cliente_a["nome"] == "Cliente A"
+    assert cliente_a["faixas"]["a_vencer"] == {"valor": 100.0, "quantidade": 1}
+    assert cliente_a["total_quantidade"] == 3
+    assert cliente_b["faixas"]["31_60"] == {"valor": 300.0, "quantidade": 1}
+    assert cliente_b["faixas"]["61_90"] == {"valor": 400.0, "quantidade": 1}
+    assert cliente_b["total_valor"] == 1200.0
+
+
+def test_aging_report_by_empresa_and_payables(session):
+    """Agrupamento por empresa e relatório vazio de contas a pagar"""
+    service = DashboardService(session)
+    por_empresa = service.get_aging_report('receivable', agrupar_por="empresa", data_base=date(2024, 6, 30))
+    assert len(por_empresa["grupos"]) == 1
+    assert por_empresa["grupos"][0]["total_quantidade"] == 6
+
+    pagar = service.get_aging_report('payable', data_base=date(2024, 6, 30))
+    assert pagar["grupos"] == []
+    assert pagar["totais"]["a_vencer"] == {"valor": 0.0, "quantidade": 0}
@@ -0,0 +1,67 @@
+"""
+Tests for the slim login/token queries on tbl_Funcionarios
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.security import HashUtil
+from app.core.access_control import access_backend
+from app.models.funcionario import TblFuncionarios, with_blobs
+from app.schemas.auth import LoginRequest
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture
+def session():
+    """Funcionário com foto, assinatura e configurações preenchidas"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[TblFuncionarios.__table__])
+    db = sessionmaker(bind=engine)()
+    db.add(TblFuncionarios(
+        CodFuncionario=7, Login="teste", Nome="Teste", Senha=HashUtil.gera_hash("segredo"),
+        Foto="F" * 100_000, AssinaturaDigitalizada="A" * 50_000, Settings="{}",
+        DatCadastro=datetime(2024, 1, 1), NomUsuario="teste"
+    ))
+    db.commit()
+    db.expunge_all()
+
+    consultas = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: consultas.append(sql))
+    db.info["consultas"] = consultas
+    access_backend.clear()
+    yield db
+    access_backend.clear()
+    db.close()
+
+
+def test_login_and_token_queries_skip_blobs(session):
+    """Login e validação do token não leem as colunas grandes; só o login lê a senha"""
+    service = AuthService(session)
+    resposta = asyncio.run(service.authenticate_user(LoginRequest(login="teste", senha="segredo")))
+    session.expunge_all()
+    funcionario = service.get_current_user(resposta.access_token)
+
+    login_sql, token_sql = session.info["consultas"]
+    for coluna in ("Foto", "AssinaturaDigitalizada", "Settings", "Salario"):
+        assert coluna not in login_sql and coluna not in token_sql
+    assert "Senha" in login_sql and "Senha" not in token_sql
+    assert funcionario.Login == "teste" and funcionario.is_active()
+
+
+def test_blobs_only_with_explicit_option(session):
+    """Sem with_blobs o acesso às imagens gera erro; com a opção elas vêm na mesma consulta"""
+    funcionario = session.get(TblFuncionarios, 7)
+    with pytest.raises(InvalidRequestError):
+        funcionario.Foto
+    session.expunge_all()
+
+    funcionario = session.query(TblFuncionarios).options(with_blobs()).filter_by(CodFuncionario=7).one()
+    assert len(funcionario.Foto) == 100_000
+    assert funcionario.Settings == "{}"
+    assert len(session.info["consultas"]) == 2
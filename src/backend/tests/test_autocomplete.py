@@ -0,0 +1,75 @@
+"""
+Tests for autocomplete service and prefix cache
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.favorecido import Favorecido
+from app.services.autocomplete_service import AutocompleteService, PrefixCache, normalize_term
+
+
+@pytest.fixture
+def session():
+    """Sessão SQLite em memória apenas com a tabela de favorecidos"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Favorecido.__table__])
+    db = sessionmaker(bind=engine)()
+    for codigo, nome in enumerate(["Abacaxi Ltda", "Abc Materiais", "Abcd Serviços", "Zeta SA"], start=1):
+        db.add(Favorecido(CodFavorecido=codigo, DesFavorecido=nome))
+    db.commit()
+    yield db
+    db.close()
+
+
+def test_normalize_term():
+    """Normalização ignora acentos e maiúsculas"""
+    assert normalize_term("  João ") == "joao"
+    assert normalize_term(None) == ""
+
+
+def test_prefix_cache_refines_complete_entry():
+    """Prefixo maior é respondido a partir de um prefixo menor completo"""
+    cache = PrefixCache(max_entries=10, ttl_seconds=60)
+    cache.put("favorecidos", "ab", [(1, "Abacaxi", "abacaxi"), (2, "Abc", "abc")], complete=True)
+
+    assert cache.get("favorecidos", "abc") == [(2, "Abc", "abc")]
+    assert cache.refinements == 1
+    assert cache.get("favorecidos", "abc") == [(2, "Abc", "abc")]
+    assert cache.hits == 1
+
+
+def test_prefix_cache_ignores_incomplete_entry():
+    """Lista truncada não pode ser usada para refinamento"""
+    cache = PrefixCache(max_entries=10, ttl_seconds=60)
+    cache.put("favorecidos", "ab", [(1, "Abacaxi", "abacaxi")], complete=False)
+
+    assert cache.get("favorecidos", "abc") is None
+    assert cache.misses == 1
+
+
+def test_prefix_cache_invalidate_and_eviction():
+    """Invalidação por entidade e descarte LRU"""
+    cache = PrefixCache(max_entries=2, ttl_seconds=60)
+    cache.put("favorecidos", "a", [], complete=True)
+    cache.put("clientes", "a", [], complete=True)
+    cache.put("categorias", "a", [], complete=True)
+
+    assert cache.get("favorecidos", "a") is None
+    cache.invalidate("clientes")
+    assert cache.get("clientes", "a") is None
+    assert cache.get("categorias", "a") == []
+
+
+def test_autocomplete_service_search(session):
+    """Busca por prefixo retorna apenas id e label"""
+    service = AutocompleteService(session, cache=PrefixCache(max_entries=10, ttl_seconds=60))
+
+    assert service.search("favorecidos", "Ab") == [
+        {"id": 1, "label": "Abacaxi Ltda"},
+        {"id": 2, "label": "Abc Materiais"},
+        {"id": 3, "label": "Abcd Serviços"},
+    ]
+    assert service.search("favorecidos", "abc", limit=1) == [{"id": 2, "label": "Abc Materiais"}]
+    assert service.cache.refinements == 1
+    assert service.search("favorecidos", "   ") == []
@@ -0,0 +1,143 @@
+"""
+Tests for batch settlement of accounts payable and receivable
+"""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine, Column, MetaData, Table, select
+from sqlalchemy.orm import sessionmaker
+from app.models.accounts_payable import AccountsPayable, AccountsPayablePayment
+from app.models.accounts_receivable import AccountsReceivable, AccountsReceivablePayment
+from app.models.funcionario import TblFuncionarios
+from app.schemas.baixa_lote import BaixaLoteRequest
+from app.services.conta_pagar_service import ContaPagarService
+from app.services.conta_receber_service import ContaReceberService
+
+
+def _create_table(engine, table):
+    """Cria a tabela sem as chaves estrangeiras para tabelas legadas sem modelo"""
+    columns = [Column(c.name, c.type, primary_key=c.primary_key) for c in table.columns]
+    copia = Table(table.name, MetaData(), *columns)
+    copia.create(engine)
+    return copia
+
+
+@pytest.fixture
+def session():
+    """Sessão SQLite com três títulos a pagar, um deles já quitado"""
+    engine = create_engine("sqlite://")
+    pagar = _create_table(engine, AccountsPayable.__table__)
+    _create_table(engine, AccountsPayablePayment.__table__)
+    db = sessionmaker(bind=engine)()
+    db.execute(pagar.insert(), [
+        {
+            "IdAccountsPayable": codigo, "Amount": Decimal(valor), "PaidAmount": None,
+            "PaymentDate": pagamento, "IssuanceDate": date(2024, 5, 1), "DueDate": date(2024, 6, 1),
+            "IdBankAccount": 1, "IdUserCreate": 1, "DateCreate": datetime(2024, 5, 1)
+        }
+        for codigo, valor, pagamento in ((1, "100.00", None), (2, "250.00", None), (3, "80.00", date(2024, 5, 20)))
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def user():
+    return TblFuncionarios(CodFuncionario=7, Login="teste")
+
+
+def _lote(itens, **kwargs):
+    return BaixaLoteRequest(itens=itens, id_forma_pagamento=2, **kwargs)
+
+
+def test_pay_lote_settles_and_reports_per_item(session, user):
+    """Pagamentos válidos são gravados; inválidos retornam o motivo"""
+    resposta = ContaPagarService(session).pay_lote(_lote([
+        {"id": 1, "valor": "100.00", "data": "2024-06-01"},
+        {"id": 2, "valor": "50.00", "data": "2024-06-01", "id_conta": 5},
+        {"id": 2, "valor": "50.00", "data": "2024-06-03"},
+        {"id": 2, "valor": "500.00", "data": "2024-06-03"},
+        {"id": 3, "valor": "80.00", "data": "2024-06-01"},
+        {"id": 99, "valor": "10.00", "data": "2024-06-01"},
+    ]), user)
+
+    assert (resposta["processados"], resposta["rejeitados"]) == (3, 3)
+    mensagens = [item["mensagem"] for item in resposta["itens"]]
+    assert mensagens[3] == "Valor do pagamento excede o valor devido"
+    assert mensagens[4] == "Título já quitado"
+    assert mensagens[5] == "Título não encontrado"
+    assert resposta["itens"][0]["quitado"] is True
+    assert resposta["itens"][2]["saldo"] == Decimal("150.00")
+
+    titulos = {t.id: t for t in session.execute(select(AccountsPayable)).scalars()}
+    assert titulos[1].paid_amount == Decimal("100.00")
+    assert titulos[1].payment_date == date(2024, 6, 1)
+    assert titulos[2].paid_amount == Decimal("100.00")
+    assert titulos[2].payment_date is None
+    assert titulos[2].id_bank_account == 5
+
+    pagamentos = session.execute(select(AccountsPayablePayment).order_by(AccountsPayablePayment.id)).scalars().all()
+    assert [(p.id_accounts_payable, p.amount, p.id_payment_method) for p in pagamentos] == [
+        (1, Decimal("100.00"), 2), (2, Decimal("50.00"), 2), (2, Decimal("50.00"), 2)
+    ]
+    assert pagamentos[0].id_user_create == 7
+
+
+def test_pay_lote_all_or_nothing(session, user):
+    """Com tudo_ou_nada, nenhum pagamento é gravado se houver item inválido"""
+    resposta = ContaPagarService(session).pay_lote(_lote([
+        {"id": 1, "valor": "100.00", "data": "2024-06-01"},
+        {"id": 3, "valor": "80.00", "data": "2024-06-01"},
+    ], tudo_ou_nada=True), user)
+
+    assert resposta["processados"] == 0
+    assert session.execute(select(AccountsPayablePayment)).first() is None
+
+
+@pytest.fixture
+def session_receber():
+    """Sessão SQLite com dois títulos a receber de 1.000,00"""
+    engine = create_engine("sqlite://")
+    receber = _create_table(engine, AccountsReceivable.__table__)
+    _create_table(engine, AccountsReceivablePayment.__table__)
+    db = sessionmaker(bind=engine)()
+    db.execute(receber.insert(), [
+        {
+            "IdAccountsReceivable": codigo, "Amount": Decimal("1000.00"), "IssuanceDate": date(2024, 5, 1),
+            "DueDate": date(2024, 6, 1), "IdDocumentType": 1, "IdUserCreate": 1, "DateCreate": datetime(2024, 5, 1)
+        }
+        for codigo in (1, 2)
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+def test_receive_lote_with_fines_and_partial(session_receber, user):
+    """Multa/juros aumentam o devido; recebimento menor fica parcial"""
+    resposta = ContaReceberService(session_receber).receive_lote(_lote([
+        {"id": 1, "valor": "1030.00", "data": "2024-06-10", "multa": "20.00", "juros": "10.00"},
+        {"id": 2, "valor": "400.00", "data": "2024-06-10"},
+        {"id": 2, "valor": "700.00", "data": "2024-06-11"},
+        {"id": 2, "valor": "590.00", "data": "2024-06-12", "desconto": "10.00"},
+    ]), user)
+
+    assert [item["sucesso"] for item in resposta["itens"]] == [True, True, False, True]
+    titulos = {t["id"]: t for t in resposta["titulos"]}
+    assert titulos[1]["quitado"] is True
+    assert titulos[1]["valor_devido"] == Decimal("1030.00")
+    assert titulos[2] == {
+        "id": 2, "valor_devido": Decimal("990.00"), "valor_pago": Decimal("990.00"),
+        "saldo": Decimal("0.00"), "quitado": True
+    }
+    assert resposta["itens"][1]["quitado"] is False
+    assert resposta["itens"][1]["saldo"] == Decimal("600.00")
+
+    contas = {c.id: c for c in session_receber.execute(select(AccountsReceivable)).scalars()}
+    assert contas[1].fine_amount == Decimal("20.00")
+    assert contas[1].interest_amount == Decimal("10.00")
+    assert contas[1].payment_date == date(2024, 6, 10)
+    assert contas[2].discount_amount == Decimal("10.00")
+    assert contas[2].payment_date == date(2024, 6, 12)
+    assert len(session_receber.execute(select(AccountsReceivablePayment)).all()) == 3
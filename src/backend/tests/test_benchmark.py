@@ -0,0 +1,56 @@
+"""
+Tests for the benchmark harness
+"""
+from datetime import date
+from tools.benchmark import comparar, executar, _percentil
+from tools.synthetic_data import GeradorDados, criar_engine
+
+
+def _metricas(p95, consultas=3, alocacao=100.0):
+    return {"p50_ms": p95 / 2, "p95_ms": p95, "p99_ms": p95, "consultas": consultas, "alocacao_kb": alocacao}
+
+
+def test_percentile_interpolation():
+    """Percentis com interpolação linear entre as amostras"""
+    valores = [float(v) for v in range(1, 101)]
+    assert _percentil(valores, 50) == 50.5
+    assert _percentil(valores, 99) == 99.01
+    assert _percentil([7.0], 95) == 7.0
+
+
+def test_compare_against_baseline():
+    """Regressões de latência, consultas, memória e casos que passaram a falhar"""
+    baseline = {
+        "lista": _metricas(100), "resumo": _metricas(2), "busca": _metricas(10), "novo_erro": _metricas(5),
+    }
+    atual = {
+        "lista": _metricas(125, consultas=4),
+        "resumo": _metricas(2.9),  # +45%, mas abaixo da tolerância em ms
+        "busca": _metricas(11, alocacao=200.0),
+        "novo_erro": {"erro": "HTTP 500"},
+        "sem_baseline": _metricas(1000),
+    }
+
+    regressoes = comparar(atual, baseline, limite_latencia=20, limite_consultas=0, limite_alocacao=25)
+    assert regressoes == [
+        "lista: p95 100.0ms -> 125.0ms",
+        "lista: consultas 3 -> 4",
+        "busca: alocação 100KB -> 200KB",
+        "novo_erro: HTTP 500",
+    ]
+    assert comparar(atual, baseline, limite_latencia=30, limite_consultas=1, limite_alocacao=150) == ["novo_erro: HTTP 500"]
+
+
+def test_run_against_synthetic_dataset(tmp_path):
+    """Execução completa de alguns casos sobre uma massa mínima"""
+    url = f"sqlite:///{tmp_path / 'carga.db'}"
+    GeradorDados(criar_engine(url), escala=0.0001, data_base=date(2025, 6, 30), anos=1).executar(criar_tabelas=True)
+
+    registro = executar(url, "carga123", ["auth_login", "dashboard_resumo", "servico_resumo_*"], iteracoes=3, aquecimento=1, amostras_memoria=1)
+
+    assert registro["data_base"] == "2025-06-30"
+    assert set(registro["casos"]) == {"auth_login", "dashboard_resumo", "servico_resumo_financeiro"}
+    resumo = registro["casos"]["dashboard_resumo"]
+    assert resumo["iteracoes"] == 3
+    assert resumo["p50_ms"] <= resumo["p95_ms"] <= resumo["p99_ms"]
+    assert resumo["consultas"] > 0 and resumo["alocacao_kb"] > 0
@@ -0,0 +1,96 @@
+"""
+Tests for response compression (gzip/brotli)
+"""
+import asyncio
+import gzip
+import zlib
+
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compressao
+from app.core.compressao import CompressaoMiddleware, MetricasCompressao, escolher_codificacao
+
+LINHAS = [f'{{"id": {i}, "historico": "Pagamento fornecedor {i % 7}"}}\n' for i in range(200)]
+
+
+def _app(metricas):
+    app = FastAPI()
+    app.add_middleware(CompressaoMiddleware, minimo=500, metricas=metricas)
+
+    @app.get("/grande")
+    def grande():
+        return [{"id": i, "historico": "Aluguel sala comercial"} for i in range(100)]
+
+    @app.get("/pequena")
+    def pequena():
+        return {"status": "ok"}
+
+    @app.get("/imagem")
+    def imagem():
+        return Response(b"\x89PNG" + b"0" * 5000, media_type="image/png")
+
+    return app
+
+
+def test_negotiation():
+    """Maior q vence; q=0 e codificações desconhecidas são ignoradas"""
+    preferida = "br" if compressao.brotli is not None else "gzip"
+    assert escolher_codificacao("gzip, deflate, br") == preferida
+    assert escolher_codificacao("br;q=0.5, gzip;q=0.9") == "gzip"
+    assert escolher_codificacao("*") == preferida
+    assert escolher_codificacao("gzip;q=0, deflate") is None
+    assert escolher_codificacao("") is None
+
+
+def test_threshold_and_content_type():
+    """Só JSON acima do mínimo é comprimido; bytes economizados entram nas métricas"""
+    metricas = MetricasCompressao()
+    client = TestClient(_app(metricas))
+    headers = {"Accept-Encoding": "gzip"}
+
+    response = client.get("/grande", headers=headers)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert len(response.json()) == 100
+    assert int(response.headers["Content-Length"]) < len(response.content)
+
+    assert "Content-Encoding" not in client.get("/pequena", headers=headers).headers
+    assert "Content-Encoding" not in client.get("/imagem", headers=headers).headers
+    assert "Content-Encoding" not in client.get("/grande", headers={"Accept-Encoding": "identity"}).headers
+
+    resumo = metricas.como_dict()
+    assert resumo["ignoradas"] == 2
+    assert resumo["codificacoes"]["gzip"]["respostas"] == 1
+    assert resumo["bytes_economizados"] == len(response.content) - int(response.headers["Content-Length"]) > 0
+
+
+def test_streaming_parts_are_flushed():
+    """Cada parte de uma StreamingResponse sai comprimida e decodificável na hora"""
+    metricas = MetricasCompressao()
+    middleware = CompressaoMiddleware(StreamingResponse(iter(LINHAS), media_type="application/x-ndjson"), minimo=10_000, metricas=metricas)
+    mensagens = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        mensagens.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(middleware(scope, receive, send))
+
+    inicio, *corpos = mensagens
+    headers = dict(inicio["headers"])
+    assert headers[b"content-encoding"] == b"gzip" and b"content-length" not in headers
+
+    descompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for linha, mensagem in zip(LINHAS, corpos):
+        assert descompressor.decompress(mensagem["body"]).decode() == linha
+    assert corpos[-1]["more_body"] is False
+    assert gzip.decompress(b"".join(m["body"] for m in corpos)).decode() == "".join(LINHAS)
+
+    contadores = metricas.como_dict()["codificacoes"]["gzip"]
+    assert contadores["bytes_originais"] == len("".join(LINHAS).encode())
+    assert contadores["bytes_enviados"] == sum(len(m["body"]) for m in corpos)
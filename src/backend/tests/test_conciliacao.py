@@ -0,0 +1,99 @@
+"""
+Tests for the bank reconciliation engine
+"""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.conta import Conta
+from app.models.favorecido import Favorecido
+from app.models.lancamento import Lancamento
+from app.models.saldo_dia import SaldoDia
+from app.models.extrato import OfxFile, OfxDados
+from app.models.funcionario import TblFuncionarios
+from app.services.conciliacao_service import ConciliacaoService
+from app.services.saldo_service import SaldoService
+
+
+@pytest.fixture
+def session():
+    """Sessão SQLite com lançamentos em aberto e um extrato importado"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        Conta.__table__, Favorecido.__table__, Lancamento.__table__,
+        SaldoDia.__table__, OfxFile.__table__, OfxDados.__table__
+    ])
+    db = sessionmaker(bind=engine)()
+    db.add(Conta(idConta=1, NomConta="Conta", Saldo=0))
+    db.add_all([
+        Favorecido(CodFavorecido=1, DesFavorecido="Energia Elétrica SA"),
+        Favorecido(CodFavorecido=2, DesFavorecido="Papelaria Central"),
+    ])
+
+    def lancamento(codigo, dia, valor, entrada, favorecido, documento=None):
+        return Lancamento(
+            CodLancamento=codigo, CodConta=1, CodFavorecido=favorecido, CodCategoria=1,
+            NumDocto=documento, Data=date(2024, 3, dia), IndMov=entrada, Valor=Decimal(valor),
+            flg_confirmacao=False, DatCadastro=datetime(2024, 3, 1), NomUsuario="teste"
+        )
+
+    db.add_all([
+        lancamento(1, 10, "150.00", False, 1, "123"),
+        lancamento(2, 11, "150.00", False, 2),
+        lancamento(3, 20, "500.00", True, 2),
+    ])
+    db.add(OfxFile(IdOfxFile=1, FileName="marco.ofx", IdBankAccount=1, InitialDate=date(2024, 3, 1),
+                   FinalDate=date(2024, 3, 31), IdUserCreate=1, DateCreate=datetime(2024, 4, 1)))
+
+    def linha(codigo, dia, valor, memo, cheque=None):
+        return OfxDados(
+            IdOfxDados=codigo, IdOfxFile=1, DatePosted=datetime(2024, 3, dia), Amount=Decimal(valor),
+            FitId=f"F{codigo}", ChequeNumber=cheque, Memo=memo, IdUserCreate=1, DateCreate=datetime(2024, 4, 1)
+        )
+
+    db.add_all([
+        linha(1, 10, "-150.00", "PAGTO ENERGIA ELETRICA", cheque="000123"),
+        linha(2, 12, "-150.00", "PAGAMENTO DIVERSOS"),
+        linha(3, 25, "500.00", "TED RECEBIDA"),
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def usuario():
+    return TblFuncionarios(CodFuncionario=1, Login="teste")
+
+
+def test_conciliar_confirms_strong_and_proposes_weak_matches(session, usuario):
+    """Par com documento e favorecido é confirmado; par só por valor/data fica proposto"""
+    resultado = ConciliacaoService(session).conciliar(date(2024, 3, 1), date(2024, 3, 31), usuario)
+
+    assert (resultado["confirmados"], resultado["propostos"], resultado["sem_correspondencia"]) == (1, 1, 1)
+    pares = {par["IdOfxDados"]: par for par in resultado["pares"]}
+    assert pares[1]["CodLancamento"] == 1 and pares[1]["confirmado"]
+    assert pares[2]["CodLancamento"] == 2 and not pares[2]["confirmado"]
+
+    session.expire_all()
+    assert session.get(Lancamento, 1).flg_confirmacao is True
+    assert session.get(Lancamento, 2).flg_confirmacao is False
+    assert session.get(OfxDados, 2).IdEntry == 2
+    assert SaldoService(session).get_saldo(1, date(2024, 3, 31)) == Decimal("-150")
+
+
+def test_confirmar_proposals_and_skip_reconciled(session, usuario):
+    """Confirmação posterior aplica o saldo; nova execução não repete pares"""
+    service = ConciliacaoService(session)
+    service.conciliar(date(2024, 3, 1), date(2024, 3, 31), usuario)
+
+    assert service.confirmar([2, 3], usuario) == 1
+    session.expire_all()
+    assert session.get(OfxDados, 2).IsValidated is True
+    assert SaldoService(session).get_saldo(1, date(2024, 3, 31)) == Decimal("-300")
+
+    novamente = service.conciliar(date(2024, 3, 1), date(2024, 3, 31), usuario, tolerancia_dias=5)
+    assert novamente["linhas_analisadas"] == 1
+    assert novamente["pares"][0]["CodLancamento"] == 3
@@ -0,0 +1,76 @@
+"""
+Tests for the normalized CPF/CNPJ document index
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.favorecido import Favorecido
+from app.models.documento_indice import DocumentoIndice
+from app.services.documento_service import DocumentoIndexService, normalize_documento, documento_from_term
+
+
+@pytest.fixture
+def session():
+    """Sessão SQLite em memória com favorecidos em formatos mistos"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Favorecido.__table__, DocumentoIndice.__table__])
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        Favorecido(CodFavorecido=1, DesFavorecido="Alfa", CNPJ="12.345.678/0001-90"),
+        Favorecido(CodFavorecido=2, DesFavorecido="Beta", CPF="123.456.789-09"),
+        Favorecido(CodFavorecido=3, DesFavorecido="Gama", CNPJ="12345678000190"),
+        Favorecido(CodFavorecido=4, DesFavorecido="Delta"),
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+def test_normalize_documento():
+    """Normalização mantém apenas dígitos"""
+    assert normalize_documento("123.456.789-09") == "12345678909"
+    assert normalize_documento(" - ") is None
+    assert normalize_documento(None) is None
+    assert documento_from_term("12.345.678/0001-90") == "12345678000190"
+    assert documento_from_term("Alfa 123") is None
+    assert documento_from_term("1234") is None
+
+
+def test_backfill_and_lookup(session):
+    """Backfill em lotes indexa documentos mascarados e sem máscara"""
+    service = DocumentoIndexService(session)
+
+    assert service.backfill("favorecido", batch_size=2) == 4
+    assert service.lookup("favorecido", "12345678000190") == [1, 3]
+    assert service.lookup("favorecido", "12345678909") == [2]
+    assert session.query(DocumentoIndice).count() == 3
+
+
+def test_duplicate_report(session):
+    """Relatório agrupa os registros com o mesmo documento"""
+    service = DocumentoIndexService(session)
+    service.backfill("favorecido")
+
+    assert service.duplicate_report() == [
+        {"entidade": "favorecido", "documento": "12345678000190", "codigos": [1, 3]}
+    ]
+    assert service.duplicate_report("cliente") == []
+
+
+def test_validate_unique_and_sync(session):
+    """Validação usa o índice e sync regrava as entradas do registro"""
+    service = DocumentoIndexService(session)
+    service.backfill("favorecido")
+
+    with pytest.raises(HTTPException) as exc:
+        service.validate_unique("favorecido", [None, "123.456.789-09"])
+    assert exc.value.status_code == 400
+
+    service.validate_unique("favorecido", ["12345678909"], exclude_id=2)
+
+    service.sync("favorecido", 2, ["987.654.321-00", None])
+    session.commit()
+    assert service.lookup("favorecido", "12345678909") == []
+    assert service.lookup("favorecido", "98765432100") == [2]
@@ -0,0 +1,103 @@
+"""
+Tests for the DRE (income statement) engine
+"""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.categoria import Categoria
+from app.models.lancamento import Lancamento
+from app.models.plano_contas import ChartOfAccounts, CostCenter
+from app.models.dre import DREMes, DREMensal
+from app.services.dre_service import DREService, deslocar_mes, meses_entre
+
+
+def _lancamento(codigo, data, valor, categoria, entrada=True):
+    return Lancamento(
+        CodLancamento=codigo, CodEmpresa=1, CodConta=1, CodFavorecido=1, CodCategoria=categoria,
+        Data=data, IndMov=entrada, Valor=Decimal(valor), flg_confirmacao=True,
+        DatCadastro=datetime(2024, 1, 1), NomUsuario="teste"
+    )
+
+
+@pytest.fixture
+def session():
+    """Plano de contas com receitas/despesas, categorias classificadas e lançamentos confirmados"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        Categoria.__table__, Lancamento.__table__, ChartOfAccounts.__table__,
+        CostCenter.__table__, DREMes.__table__, DREMensal.__table__
+    ])
+    db = sessionmaker(bind=engine)()
+
+    contas = [(1, None, "Receitas"), (2, 1, "Vendas"), (3, None, "Despesas"), (4, 3, "Aluguel"), (5, 3, "Salários")]
+    db.add_all([
+        ChartOfAccounts(id=codigo, parent_id=pai, account_name=nome, id_company=1, id_user_create=1)
+        for codigo, pai, nome in contas
+    ])
+    db.add_all([
+        CostCenter(id=10, name="Loja", id_company=1, id_user_create=1),
+        CostCenter(id=20, name="Escritório", id_company=1, id_user_create=1),
+    ])
+    db.add_all([
+        Categoria(CodCategoria=1, DesCategoria="Vendas", idChartsOfAccount=2, idCostCenter=10),
+        Categoria(CodCategoria=2, DesCategoria="Aluguel", idChartsOfAccount=4, idCostCenter=20),
+        Categoria(CodCategoria=3, DesCategoria="Outros"),
+    ])
+    db.add_all([
+        _lancamento(1, date(2024, 1, 10), "1000", 1),
+        _lancamento(2, date(2024, 1, 15), "300", 2, entrada=False),
+        _lancamento(3, date(2024, 2, 10), "1500", 1),
+        _lancamento(4, date(2024, 2, 20), "50", 3, entrada=False),
+        _lancamento(5, date(2023, 2, 10), "800", 1),
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+def test_month_helpers():
+    """Intervalo de meses e deslocamento entre anos"""
+    assert meses_entre((2023, 11), (2024, 2)) == [(2023, 11), (2023, 12), (2024, 1), (2024, 2)]
+    assert deslocar_mes((2024, 1), -1) == (2023, 12)
+    assert deslocar_mes((2024, 1), -12) == (2023, 1)
+
+
+def test_dre_tree_and_comparison(session):
+    """Valores por conta com subtotais dos pais e comparação com o ano anterior"""
+    dre = DREService(session).relatorio((2024, 1), (2024, 2), comparar="ano_anterior", hoje=date(2024, 3, 5))
+
+    linhas = {linha["nome"]: linha for linha in dre["linhas"]}
+    assert [linha["nome"] for linha in dre["linhas"]] == ["Despesas", "Aluguel", "Receitas", "Vendas", "Sem plano de contas"]
+    assert linhas["Receitas"]["valores"] == {"2024-01": 1000.0, "2024-02": 1500.0}
+    assert linhas["Vendas"]["nivel"] == 1
+    assert linhas["Despesas"]["total"] == -300.0
+    assert linhas["Sem plano de contas"]["total"] == -50.0
+    assert linhas["Vendas"]["total_comparativo"] == 800.0
+    assert linhas["Vendas"]["variacao_percentual"] == pytest.approx(212.5)
+
+    assert dre["totais"]["receitas"] == 2500.0
+    assert dre["totais"]["resultado"] == 2150.0
+    assert dre["totais"]["comparativo"]["resultado"] == 800.0
+    centros = {centro["nome"]: centro["total"] for centro in dre["centros_custo"]}
+    assert centros == {"Escritório": -300.0, "Loja": 2500.0, "Sem centro de custo": -50.0}
+
+
+def test_closed_months_are_cached(session):
+    """Meses fechados são gravados uma vez; o mês corrente é sempre recalculado"""
+    service = DREService(session)
+    service.relatorio((2024, 1), (2024, 3), hoje=date(2024, 3, 5))
+    assert session.query(DREMes).count() == 2
+
+    session.add_all([
+        _lancamento(6, date(2024, 1, 20), "999", 1),
+        _lancamento(7, date(2024, 3, 1), "200", 1),
+    ])
+    session.commit()
+
+    dre = service.relatorio((2024, 1), (2024, 3), centro_custo_id=10, hoje=date(2024, 3, 5))
+    assert dre["totais"]["por_mes"]["2024-01"]["receitas"] == 1000.0
+    assert dre["totais"]["por_mes"]["2024-03"]["receitas"] == 200.0
+    assert session.query(DREMes).count() == 2
@@ -0,0 +1,133 @@
+"""
+Tests for streaming OFX/CNAB statement import
+"""
+import io
+import pytest
+from datetime import date
+from decimal import Decimal
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.conta import Conta
+from app.models.extrato import OfxFile, OfxDados
+from app.models.funcionario import TblFuncionarios
+from app.services.extrato_parser import OfxParser, Cnab240Parser, detect_parser
+from app.services.extrato_service import ExtratoService
+
+
+OFX_SGML = """OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><CURDEF>BRL
+<BANKACCTFROM><BANKID>341<BRANCHID>0123<ACCTID>45678-9</BANKACCTFROM>
+<BANKTRANLIST><DTSTART>20240101<DTEND>20240131
+{transacoes}
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+STMTTRN = "<STMTTRN><TRNTYPE>{tipo}<DTPOSTED>202401{dia:02d}120000[-3:BRT]<TRNAMT>{valor}<FITID>{fitid}<MEMO>{memo}</STMTTRN>"
+
+
+def _ofx(quantidade: int) -> str:
+    transacoes = "\n".join(
+        STMTTRN.format(
+            tipo="CREDIT" if i % 2 else "DEBIT",
+            dia=(i % 28) + 1,
+            valor=f"{'' if i % 2 else '-'}{i}.50",
+            fitid=f"F{i:06d}",
+            memo=f"Movimento {i}"
+        )
+        for i in range(1, quantidade + 1)
+    )
+    return OFX_SGML.format(transacoes=transacoes)
+
+
+def _cnab240_segmento_e(seq: int, valor_centavos: int, tipo: str, documento: str) -> str:
+    line = (
+        "341" + "0001" + "3" + f"{seq:05d}" + "E" + " " * 3 + "2" + "12345678000190" + " " * 20
+        + "00123" + "0" + "000000045678" + "9" + " " + "EMPRESA TESTE".ljust(30) + " " * 6
+        + "DPV" + "  " + " " * 20 + " " + "15012024" + "15012024"
+        + f"{valor_centavos:018d}" + tipo + "101" + "0001" + "TARIFA BANCARIA".ljust(25)
+        + documento.ljust(39)
+    )
+    assert len(line) == 240
+    return line
+
+
+@pytest.fixture
+def session():
+    """Sessão SQLite em memória com uma conta cadastrada"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Conta.__table__, OfxFile.__table__, OfxDados.__table__])
+    db = sessionmaker(bind=engine)()
+    db.add(Conta(idConta=7, Banco=341, Agencia="123", Conta="45678", ContaDigito="9", NomConta="Itaú"))
+    db.commit()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def usuario():
+    return TblFuncionarios(CodFuncionario=1, Login="teste")
+
+
+def test_ofx_parser_single_line_file():
+    """OFX com todas as tags em uma única linha é lido em blocos"""
+    parser = OfxParser(io.StringIO(_ofx(3).replace("\n", "")))
+    parser.BLOCK_SIZE = 16
+    rows = list(parser)
+
+    assert [row["FitId"] for row in rows] == ["F000001", "F000002", "F000003"]
+    assert rows[1]["Amount"] == Decimal("-2.50")
+    assert rows[1]["MovimentType"] == 2
+    assert (parser.banco, parser.agencia, parser.conta) == ("341", "0123", "45678-9")
+    assert (parser.data_inicial, parser.data_final) == (date(2024, 1, 1), date(2024, 1, 31))
+
+
+def test_cnab240_parser():
+    """Segmento E gera transação com sinal pelo tipo D/C"""
+    header_arquivo = "341" + "0000" + "0" + " " * 232
+    conteudo = "\n".join([
+        header_arquivo,
+        _cnab240_segmento_e(1, 1590, "D", "DOC1"),
+        _cnab240_segmento_e(2, 100000, "C", ""),
+    ])
+    parser = detect_parser(io.StringIO(conteudo))
+    assert isinstance(parser, Cnab240Parser)
+
+    rows = list(parser)
+    assert [row["Amount"] for row in rows] == [Decimal("-15.90"), Decimal("1000.00")]
+    assert rows[0]["FitId"] == "DOC1"
+    assert rows[1]["FitId"].startswith("H")
+    assert (parser.banco, parser.agencia, parser.conta) == ("341", "00123", "000000045678")
+
+
+def test_import_is_chunked_and_idempotent(session, usuario):
+    """Reimportar o mesmo arquivo não duplica transações"""
+    service = ExtratoService(session)
+    progresso = []
+
+    resultado = service.importar(
+        io.StringIO(_ofx(25)), "janeiro.ofx", usuario,
+        chunk_size=10, progresso=lambda *args: progresso.append(args)
+    )
+
+    assert resultado["idConta"] == 7
+    assert resultado["importadas"] == 25
+    assert [item[1] for item in progresso] == [10, 20, 25]
+    assert session.query(OfxDados).count() == 25
+
+    novamente = service.importar(io.StringIO(_ofx(30)), "janeiro.ofx", usuario, chunk_size=10)
+    assert (novamente["importadas"], novamente["duplicadas"]) == (5, 25)
+    assert session.query(OfxDados).count() == 30
+
+
+def test_import_unknown_account(session, usuario):
+    """Extrato de conta não cadastrada é rejeitado"""
+    conteudo = _ofx(1).replace("<ACCTID>45678-9", "<ACCTID>99999-9")
+    with pytest.raises(HTTPException) as exc:
+        ExtratoService(session).importar(io.StringIO(conteudo), "x.ofx", usuario)
+    assert exc.value.status_code == 404
+    assert session.query(OfxFile).count() == 0
@@ -0,0 +1,143 @@
+"""
+Tests for monthly period closing
+"""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi import HTTPException
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.categoria import Categoria
+from app.models.favorecido import Favorecido
+from app.models.lancamento import Lancamento
+from app.models.funcionario import TblFuncionarios
+from app.models.fechamento import PeriodoFechado, FechamentoTotal
+from app.models.dre import DREMes, DREMensal
+from app.schemas.lancamento import LancamentoUpdate
+from app.services.dashboard_service import DashboardService
+from app.services.fechamento_service import FechamentoService
+from app.services.lancamento_service import LancamentoService
+
+USUARIO = TblFuncionarios(CodFuncionario=7, Login="teste")
+HOJE = date(2024, 4, 10)
+
+
+def _lancamento(codigo, data, valor, categoria, entrada=True, confirmado=True):
+    return Lancamento(
+        CodLancamento=codigo, CodEmpresa=1, CodConta=1, CodFavorecido=1, CodCategoria=categoria,
+        Data=data, IndMov=entrada, Valor=Decimal(valor), flg_confirmacao=confirmado,
+        DatCadastro=datetime(2024, 1, 1), NomUsuario="teste"
+    )
+
+
+@pytest.fixture
+def session():
+    """Lançamentos confirmados de janeiro a março e um pendente em abril"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        Categoria.__table__, Favorecido.__table__, Lancamento.__table__, PeriodoFechado.__table__,
+        FechamentoTotal.__table__, DREMes.__table__, DREMensal.__table__
+    ])
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        Categoria(CodCategoria=1, DesCategoria="Vendas"),
+        Categoria(CodCategoria=2, DesCategoria="Serviços"),
+    ])
+    db.add_all([
+        _lancamento(1, date(2024, 1, 10), "100", 1),
+        _lancamento(2, date(2024, 1, 20), "50", 2),
+        _lancamento(3, date(2024, 2, 5), "200", 1),
+        _lancamento(4, date(2024, 2, 8), "30", 1, entrada=False),
+        _lancamento(5, date(2024, 3, 15), "400", 2),
+        _lancamento(6, date(2024, 4, 2), "70", 1, confirmado=False),
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+def test_close_writes_totals_for_all_previous_months(session):
+    """Fechar fevereiro também fecha janeiro e grava os totais de cada dimensão"""
+    fechados = FechamentoService(session).fechar(2024, 2, USUARIO, hoje=HOJE)
+
+    assert [(p.Ano, p.Mes) for p in fechados] == [(2024, 1), (2024, 2)]
+    totais = FechamentoService(session).totais(2024, 2, "categoria")
+    assert totais == [
+        {"empresa_id": 1, "referencia": 1, "entrada": False, "valor": 30.0, "quantidade": 1},
+        {"empresa_id": 1, "referencia": 1, "entrada": True, "valor": 200.0, "quantidade": 1},
+    ]
+    assert session.query(FechamentoTotal).filter_by(Dimensao="empresa", Ano=2024, Mes=1).one().Valor == 150
+
+
+def test_close_validations(session):
+    """Não fecha o mês corrente, meses já fechados nem períodos com lançamentos pendentes"""
+    service = FechamentoService(session)
+    with pytest.raises(HTTPException) as exc:
+        service.fechar(2024, 4, USUARIO, hoje=HOJE)
+    assert exc.value.status_code == 400
+
+    service.fechar(2024, 1, USUARIO, hoje=HOJE)
+    with pytest.raises(HTTPException):
+        service.fechar(2024, 1, USUARIO, hoje=HOJE)
+
+    session.add(_lancamento(7, date(2024, 2, 28), "10", 1, confirmado=False))
+    session.commit()
+    with pytest.raises(HTTPException) as exc:
+        service.fechar(2024, 2, USUARIO, hoje=HOJE)
+    assert "não confirmados" in exc.value.detail
+
+
+def test_closed_period_locks_lancamentos(session):
+    """Lançamentos do período fechado não podem ser alterados nem desconfirmados; os do período aberto sim"""
+    FechamentoService(session).fechar(2024, 2, USUARIO, hoje=HOJE)
+    service = LancamentoService(session)
+
+    for operacao in (
+        lambda: service.unconfirm_lancamento(3, USUARIO),
+        lambda: service.update_lancamento(6, LancamentoUpdate(Data=date(2024, 2, 29)), USUARIO),
+    ):
+        with pytest.raises(HTTPException) as exc:
+            operacao()
+        assert exc.value.status_code == 400
+        assert "Período fechado" in exc.value.detail
+
+    service.delete_lancamento(6, USUARIO)
+    assert session.get(Lancamento, 6) is None
+
+
+def test_reopen_only_last_month(session):
+    """Só o último mês fechado pode ser reaberto; os seus totais são descartados"""
+    service = FechamentoService(session)
+    service.fechar(2024, 2, USUARIO, hoje=HOJE)
+
+    with pytest.raises(HTTPException):
+        service.reabrir(2024, 1)
+
+    service.reabrir(2024, 2)
+    assert service.ultimo_mes_fechado() == (2024, 1)
+    assert session.query(FechamentoTotal).filter_by(Mes=2).count() == 0
+
+
+def test_historical_queries_read_closing_totals(session):
+    """Meses fechados vêm dos totais gravados; o período aberto continua vindo dos lançamentos"""
+    FechamentoService(session).fechar(2024, 2, USUARIO, hoje=HOJE)
+
+    # Alteração direta no banco não afeta os meses fechados
+    session.execute(update(Lancamento).where(Lancamento.CodLancamento == 1).values(Valor=Decimal("999")))
+    session.commit()
+
+    dashboard = DashboardService(session)
+    assert dashboard.get_category_summary(True) == [
+        {"categoria": "Serviços", "valor": 450.0},
+        {"categoria": "Vendas", "valor": 300.0},
+    ]
+    assert dashboard._get_total_lancamentos(True) == Decimal("750")
+
+    # Janeiro começa no dia 15: o mês parcial é lido dos lançamentos
+    mensal = dashboard._get_monthly_totals(True, datetime(2024, 1, 15), datetime(2024, 3, 31))
+    assert mensal == [
+        {"mes_ano": "01/2024", "valor": 50.0},
+        {"mes_ano": "02/2024", "valor": 200.0},
+        {"mes_ano": "03/2024", "valor": 400.0},
+    ]
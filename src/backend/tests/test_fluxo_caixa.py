@@ -0,0 +1,104 @@
+"""
+Tests for the cash-flow forecast
+"""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine, Column, MetaData, Table
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.conta import Conta
+from app.models.lancamento import Lancamento
+from app.models.accounts_payable import AccountsPayable
+from app.models.accounts_receivable import AccountsReceivable
+from app.services.dashboard_service import DashboardService, inicio_periodo
+
+
+def _create_table(engine, table):
+    """Cria a tabela sem as chaves estrangeiras para tabelas legadas sem modelo"""
+    columns = [Column(c.name, c.type, primary_key=c.primary_key) for c in table.columns]
+    copia = Table(table.name, MetaData(), *columns)
+    copia.create(engine)
+    return copia
+
+
+def _lancamento(codigo, data, valor, entrada=True, confirmado=False, **kwargs):
+    return Lancamento(
+        CodLancamento=codigo, CodConta=1, CodFavorecido=1, CodCategoria=1,
+        Data=data, IndMov=entrada, Valor=Decimal(valor), flg_confirmacao=confirmado,
+        DatCadastro=datetime(2024, 1, 1), NomUsuario="teste", **kwargs
+    )
+
+
+@pytest.fixture
+def session():
+    """Conta com saldo 1.000, histórico confirmado, lançamentos e títulos em aberto e uma recorrência"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Conta.__table__, Lancamento.__table__])
+    receber = _create_table(engine, AccountsReceivable.__table__)
+    pagar = _create_table(engine, AccountsPayable.__table__)
+    db = sessionmaker(bind=engine)()
+
+    db.add(Conta(idConta=1, NomConta="Conta Teste", Saldo=Decimal("1000")))
+    db.add_all([
+        _lancamento(1, date(2024, 5, 10), "300", confirmado=True),
+        _lancamento(2, date(2024, 6, 5), "100", entrada=False, confirmado=True),
+        _lancamento(3, date(2024, 6, 1), "40", entrada=False),  # em aberto e vencido
+        _lancamento(4, date(2024, 7, 20), "200"),
+        # Recorrência mensal de 50 com apenas a origem gravada
+        _lancamento(5, date(2024, 6, 25), "50", entrada=False, flg_frequencia=3, parcela_atual=1),
+    ])
+    comum = {"IssuanceDate": date(2024, 5, 1), "IdUserCreate": 1, "DateCreate": datetime(2024, 5, 1), "IdBankAccount": 1}
+    db.execute(receber.insert(), [
+        {"IdAccountsReceivable": 1, "Amount": Decimal("500"), "PaidAmount": Decimal("100"), "PaymentDate": None, "DueDate": date(2024, 7, 15), "IdDocumentType": 1, **comum},
+        {"IdAccountsReceivable": 2, "Amount": Decimal("999"), "PaidAmount": None, "PaymentDate": date(2024, 6, 1), "DueDate": date(2024, 6, 1), "IdDocumentType": 1, **comum},
+    ])
+    db.execute(pagar.insert(), [
+        {"IdAccountsPayable": 1, "Amount": Decimal("250"), "DueDate": date(2024, 8, 10), **comum},
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+def test_inicio_periodo():
+    """Semanas começam na segunda e meses no dia 1"""
+    assert inicio_periodo(date(2024, 6, 15), "semanal") == date(2024, 6, 10)
+    assert inicio_periodo(date(2024, 6, 15), "mensal") == date(2024, 6, 1)
+    assert inicio_periodo(date(2024, 6, 15), "diario") == date(2024, 6, 15)
+
+
+def test_cash_flow_forecast_monthly(session):
+    """Realizado, previsto e saldo projetado por mês"""
+    previsao = DashboardService(session).get_cash_flow_forecast(
+        meses=3, meses_historico=1, data_base=date(2024, 6, 15)
+    )
+
+    assert (previsao["inicio"], previsao["fim"]) == ("2024-05-01", "2024-09-15")
+    conta = previsao["contas"][0]
+    assert conta["saldo_atual"] == 1000.0
+    periodos = {p["periodo"]: p for p in conta["periodos"]}
+
+    assert periodos["2024-05-01"]["realizado_entradas"] == 300.0
+    assert periodos["2024-05-01"]["saldo_final"] == 1100.0
+    # Vencido em aberto entra no período atual, junto com a recorrência de junho
+    assert periodos["2024-06-01"]["realizado_saidas"] == 100.0
+    assert periodos["2024-06-01"]["previsto_saidas"] == 90.0
+    assert periodos["2024-06-01"]["saldo_final"] == 910.0
+    assert periodos["2024-07-01"]["previsto_entradas"] == 600.0
+    assert periodos["2024-07-01"]["previsto_saidas"] == 50.0
+    assert periodos["2024-08-01"]["previsto_saidas"] == 300.0
+    assert periodos["2024-09-01"]["saldo_final"] == 1160.0
+    assert previsao["consolidado"][-1]["saldo_final"] == 1160.0
+
+
+def test_cash_flow_forecast_weekly_filtered(session):
+    """Granularidade semanal e filtro por conta"""
+    previsao = DashboardService(session).get_cash_flow_forecast(
+        meses=1, meses_historico=0, granularidade="semanal", conta_id=1, data_base=date(2024, 6, 15)
+    )
+    periodos = {p["periodo"]: p for p in previsao["contas"][0]["periodos"]}
+    assert previsao["inicio"] == "2024-06-10"
+    assert periodos["2024-06-10"]["previsto_saidas"] == 40.0
+    assert periodos["2024-06-24"]["previsto_saidas"] == 50.0
+    assert periodos["2024-07-15"]["previsto_entradas"] == 400.0
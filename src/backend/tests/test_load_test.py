@@ -0,0 +1,80 @@
+"""
+Tests for the load generator
+"""
+import asyncio
+from datetime import date
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.core.database import get_db
+from tools.load_test import Coletor, _mix, executar_carga
+from tools.synthetic_data import GeradorDados, criar_engine
+
+
+def test_collector_summary():
+    """Vazão, taxa de erro e status agregados por operação e no total"""
+    coletor = Coletor()
+    for latencia in (10.0, 20.0, 30.0, 40.0):
+        coletor.registrar("busca", latencia)
+    coletor.registrar("pagar", 50.0, "500")
+    coletor.registrar("pagar", 70.0)
+    coletor.descartadas = 3
+
+    resumo = coletor.resumo(duracao=2.0)
+    assert resumo["acoes"]["busca"] == {
+        "requisicoes": 4, "erros": 0, "taxa_erro": 0.0, "vazao_rps": 2.0,
+        "p50_ms": 25.0, "p95_ms": 38.5, "p99_ms": 39.7, "max_ms": 40.0,
+    }
+    assert resumo["acoes"]["pagar"]["status"] == {"500": 1}
+    assert resumo["total"]["requisicoes"] == 6
+    assert resumo["total"]["taxa_erro"] == round(1 / 6, 4)
+    assert resumo["total"]["descartadas"] == 3
+
+
+def test_mix_selection():
+    """Pesos informados e exclusão das operações de escrita"""
+    acoes = _mix(["busca=5", "confirmar"], somente_leitura=False)
+    assert [(acao.nome, acao.peso) for acao in acoes] == [("busca", 5.0), ("confirmar", 1.0)]
+    assert [acao.nome for acao in _mix(["busca=5", "confirmar"], somente_leitura=True)] == ["busca"]
+    assert all(not acao.escrita for acao in _mix(None, somente_leitura=True))
+
+
+def test_load_against_synthetic_dataset(tmp_path):
+    """Carga curta em processo sobre uma massa mínima"""
+    engine = criar_engine(f"sqlite:///{tmp_path / 'carga.db'}")
+    GeradorDados(engine, escala=0.0001, data_base=date(2025, 6, 30), anos=1).executar(criar_tabelas=True)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    def _get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        resultado = asyncio.run(executar_carga(
+            "http://teste",
+            "carga123",
+            rps=40,
+            duracao=0.5,
+            aquecimento=0.1,
+            usuarios=2,
+            # Em processo as requisições dividem o event loop: abaixo do tamanho do pool
+            max_em_voo=2,
+            acoes=_mix(["lancamentos_dia", "lancamentos_lista", "dashboard"], somente_leitura=True),
+            transport=httpx.ASGITransport(app=app),
+        ))
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+    assert resultado["data_base"] == "2025-06-30"
+    total = resultado["total"]
+    assert total["requisicoes"] + total["descartadas"] == 20
+    assert total["erros"] == 0
+    assert set(resultado["acoes"]) <= {"lancamentos_dia", "lancamentos_lista", "dashboard"}
+    assert total["p50_ms"] <= total["p95_ms"] <= total["p99_ms"]
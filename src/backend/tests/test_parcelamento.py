@@ -0,0 +1,93 @@
+"""
+Tests for installment and recurrence generation
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.lancamento import Lancamento
+from app.models.funcionario import TblFuncionarios
+from app.models.fechamento import PeriodoFechado
+from app.schemas.lancamento import LancamentoSerieCreate
+from app.services.parcelamento_service import ParcelamentoService, data_ocorrencia, dividir_valor
+
+
+@pytest.fixture
+def session():
+    """Sessão SQLite em memória apenas com a tabela de lançamentos"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Lancamento.__table__, PeriodoFechado.__table__])
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def usuario():
+    return TblFuncionarios(CodFuncionario=1, Login="teste")
+
+
+def _serie(**kwargs):
+    dados = dict(
+        Data=date(2024, 1, 31), CodEmpresa=1, CodConta=1, CodFavorecido=1, CodCategoria=1,
+        Valor=100.0, IndMov=False, tipo="parcelado", FlgFrequencia=3, qtd_parcelas=3
+    )
+    dados.update(kwargs)
+    return LancamentoSerieCreate(**dados)
+
+
+def test_dividir_valor_last_parcel_absorbs_rounding():
+    """Soma das parcelas é exatamente o total"""
+    assert dividir_valor(Decimal("100"), 3) == [Decimal("33.33"), Decimal("33.33"), Decimal("33.34")]
+    assert sum(dividir_valor(Decimal("0.05"), 4)) == Decimal("0.05")
+
+
+def test_data_ocorrencia_calendar_rules():
+    """Séries mensais mantêm o dia original e respeitam o fim do mês"""
+    inicio = date(2024, 1, 31)
+    assert [data_ocorrencia(inicio, 3, i) for i in range(4)] == [
+        date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)
+    ]
+    assert data_ocorrencia(date(2024, 1, 6), 1, 1) == date(2024, 1, 13)
+    # 31/08/2024 é sábado
+    assert data_ocorrencia(date(2024, 8, 31), 3, 0, ajustar_dia_util=True) == date(2024, 9, 2)
+
+
+def test_criar_parcelamento(session, usuario):
+    """Parcelamento grava todas as parcelas ligadas à origem"""
+    resultado = ParcelamentoService(session).criar_serie(_serie(), usuario)
+
+    assert resultado["gerados"] == 3
+    parcelas = session.query(Lancamento).order_by(Lancamento.parcela_atual).all()
+    assert [p.Valor for p in parcelas] == [Decimal("33.33"), Decimal("33.33"), Decimal("33.34")]
+    assert [p.Data for p in parcelas] == [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31)]
+    assert {p.cod_lancamento_anterior for p in parcelas[1:]} == {resultado["CodLancamentoOrigem"]}
+    assert all(p.qtd_parcelas == 3 for p in parcelas)
+
+
+def test_recorrencia_materializada_sob_demanda(session, usuario):
+    """Recorrência grava apenas até o horizonte e completa depois"""
+    inicio = date.today().replace(day=1)
+    service = ParcelamentoService(session)
+    resultado = service.criar_serie(_serie(Data=inicio, tipo="recorrente", qtd_parcelas=None), usuario)
+
+    gravados = session.query(Lancamento).count()
+    assert gravados == resultado["gerados"]
+    assert max(resultado["datas"]) <= date.today() + timedelta(days=90)
+
+    ate = date(inicio.year + 2, inicio.month, 1)
+    assert service.materializar_recorrencias(ate) == 25 - gravados
+    assert service.materializar_recorrencias(ate) == 0
+    assert session.query(Lancamento).filter(Lancamento.Valor == Decimal("100")).count() == 25
+
+
+def test_parcelamento_validations(session, usuario):
+    """Frequência desconhecida e parcelamento sem parcelas são rejeitados"""
+    service = ParcelamentoService(session)
+    with pytest.raises(HTTPException):
+        service.criar_serie(_serie(FlgFrequencia=99), usuario)
+    with pytest.raises(HTTPException):
+        service.criar_serie(_serie(qtd_parcelas=1), usuario)
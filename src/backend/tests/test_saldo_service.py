@@ -0,0 +1,85 @@
+"""
+Tests for the account balance ledger
+"""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.conta import Conta
+from app.models.lancamento import Lancamento
+from app.models.saldo_dia import SaldoDia
+from app.services.saldo_service import SaldoService
+
+
+@pytest.fixture
+def session():
+    """Sessão SQLite em memória com uma conta e lançamentos"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Conta.__table__, Lancamento.__table__, SaldoDia.__table__])
+    db = sessionmaker(bind=engine)()
+    db.add(Conta(idConta=1, NomConta="Conta Teste", Saldo=0))
+    db.commit()
+    yield db
+    db.close()
+
+
+def _lancamento(codigo, data, valor, entrada=True, confirmado=False):
+    return Lancamento(
+        CodLancamento=codigo, CodConta=1, CodFavorecido=1, CodCategoria=1,
+        Data=data, IndMov=entrada, Valor=Decimal(valor), flg_confirmacao=confirmado,
+        DatCadastro=datetime(2024, 1, 1), NomUsuario="teste"
+    )
+
+
+def test_apply_out_of_order_updates_later_snapshots(session):
+    """Lançamento retroativo desloca os snapshots posteriores"""
+    service = SaldoService(session)
+    service.apply_lancamento(_lancamento(1, date(2024, 1, 10), "100"))
+    service.apply_lancamento(_lancamento(2, date(2024, 1, 20), "50", entrada=False))
+    service.apply_lancamento(_lancamento(3, date(2024, 1, 5), "30"))
+    service.apply_lancamento(_lancamento(4, date(2024, 1, 10), "20"))
+    session.commit()
+
+    assert service.get_saldo(1, date(2024, 1, 4)) == 0
+    assert service.get_saldo(1, date(2024, 1, 5)) == 30
+    assert service.get_saldo(1, date(2024, 1, 15)) == 150
+    assert service.get_saldo(1, date(2024, 2, 1)) == 100
+    assert session.get(Conta, 1).Saldo == 100
+
+    historico = service.get_historico(1, date(2024, 1, 6), date(2024, 1, 31))
+    assert historico["saldo_inicial"] == 30
+    assert historico["saldo_final"] == 100
+    assert [(dia["data"], dia["movimento"]) for dia in historico["dias"]] == [
+        (date(2024, 1, 10), 120),
+        (date(2024, 1, 20), -50),
+    ]
+
+
+def test_estorno_reverts_balance(session):
+    """Estorno devolve o saldo ao valor anterior"""
+    service = SaldoService(session)
+    lancamento = _lancamento(1, date(2024, 1, 10), "80")
+    service.apply_lancamento(lancamento)
+    service.apply_lancamento(lancamento, estorno=True)
+    session.commit()
+
+    assert service.get_saldo(1, date(2024, 1, 10)) == 0
+    assert session.get(Conta, 1).Saldo == 0
+
+
+def test_rebuild_from_confirmed_lancamentos(session):
+    """Recalcular considera apenas lançamentos confirmados"""
+    session.add_all([
+        _lancamento(1, date(2024, 1, 10), "100", confirmado=True),
+        _lancamento(2, date(2024, 1, 10), "40", entrada=False, confirmado=True),
+        _lancamento(3, date(2024, 1, 12), "25", confirmado=True),
+        _lancamento(4, date(2024, 1, 13), "999"),
+    ])
+    session.commit()
+
+    service = SaldoService(session)
+    assert service.rebuild(1, saldo_abertura=Decimal("10")) == 95
+    assert service.get_saldo(1, date(2024, 1, 11)) == 70
+    assert session.query(SaldoDia).count() == 2
@@ -0,0 +1,93 @@
+"""
+Tests for single-flight request coalescing
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.singleflight import SingleFlight, single_flight, grupos
+from app.services.dashboard_service import DashboardService
+
+
+def test_concurrent_calls_share_one_execution():
+    """Chamadas simultâneas com a mesma chave executam uma vez e recebem o mesmo resultado"""
+    grupo = SingleFlight("teste")
+    liberar = threading.Event()
+    execucoes = []
+
+    def lenta():
+        execucoes.append(1)
+        liberar.wait(5)
+        return {"total": 42}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futuros = [pool.submit(grupo.executar, "resumo", lenta) for _ in range(5)]
+        while grupo.metricas()["chamadas"] < 5:
+            time.sleep(0.001)
+        liberar.set()
+        resultados = [futuro.result() for futuro in futuros]
+
+    assert len(execucoes) == 1
+    assert all(resultado is resultados[0] for resultado in resultados)
+    assert grupo.metricas() == {"chamadas": 5, "execucoes": 1, "coalescidas": 4, "em_andamento": 0}
+
+    # Terminada a execução, a próxima chamada calcula de novo
+    assert grupo.executar("resumo", lambda: {"total": 43}) == {"total": 43}
+
+
+def test_error_is_shared_and_not_cached():
+    """A exceção da execução chega a todas as chamadas coalescidas"""
+    grupo = SingleFlight("erro")
+    liberar = threading.Event()
+
+    def falha():
+        liberar.wait(5)
+        raise ValueError("banco indisponível")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futuros = [pool.submit(grupo.executar, 1, falha) for _ in range(3)]
+        while grupo.metricas()["chamadas"] < 3:
+            time.sleep(0.001)
+        liberar.set()
+        for futuro in futuros:
+            with pytest.raises(ValueError, match="banco indisponível"):
+                futuro.result()
+
+    assert grupo.executar(1, lambda: "ok") == "ok"
+
+
+def test_decorator_keys_on_arguments_without_self():
+    """Instâncias diferentes (sessões diferentes) com os mesmos argumentos são coalescidas"""
+    liberar = threading.Event()
+
+    class Servico:
+        def __init__(self, db):
+            self.db = db
+
+        @single_flight
+        def resumo(self, empresa_id=None):
+            liberar.wait(5)
+            return {"empresa": empresa_id, "db": self.db}
+
+    grupo = Servico.resumo.single_flight
+    assert grupos[grupo.nome] is grupo
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futuros = [pool.submit(Servico(db).resumo, empresa_id=empresa) for db, empresa in ((1, 1), (2, 1), (3, 2))]
+        while grupo.metricas()["chamadas"] < 3:
+            time.sleep(0.001)
+        liberar.set()
+        resultados = [futuro.result() for futuro in futuros]
+
+    assert resultados[0] == resultados[1] == {"empresa": 1, "db": 1}
+    assert resultados[2] == {"empresa": 2, "db": 3}
+    assert grupo.metricas()["coalescidas"] == 1
+
+    # Argumentos não hasheáveis executam sem coalescência
+    assert Servico(4).resumo(empresa_id=[1]) == {"empresa": [1], "db": 4}
+
+
+def test_dashboard_summary_is_coalesced():
+    """O resumo financeiro do dashboard usa single-flight"""
+    assert DashboardService.get_financial_summary.single_flight.nome == "DashboardService.get_financial_summary"
@@ -0,0 +1,56 @@
+"""
+Tests for the synthetic dataset generator
+"""
+import random
+import pytest
+from datetime import date
+from sqlalchemy import select, func
+from tools.synthetic_data import GeradorDados, criar_engine, gerar_cpf, gerar_cnpj, _digito
+
+
+def _carregar(caminho, **kwargs):
+    gerador = GeradorDados(
+        criar_engine(f"sqlite:///{caminho}"), escala=0.0001, data_base=date(2025, 6, 30), anos=1, batch_size=200, **kwargs
+    )
+    return gerador, gerador.executar(criar_tabelas=True)
+
+
+def test_documents_have_valid_check_digits():
+    """CPF e CNPJ gerados têm dígitos verificadores válidos"""
+    rng = random.Random(1)
+    for _ in range(50):
+        cpf = [int(d) for d in gerar_cpf(rng)]
+        assert cpf[9] == _digito(cpf[:9], list(range(10, 1, -1)))
+        assert cpf[10] == _digito(cpf[:10], list(range(11, 1, -1)))
+        cnpj = gerar_cnpj(rng)
+        assert len(cnpj) == 14 and cnpj[8:12] == "0001"
+
+
+def test_load_volumes_and_determinism(tmp_path):
+    """A mesma semente gera os mesmos registros; os volumes respeitam os mínimos"""
+    gerador, gravadas = _carregar(tmp_path / "a.db")
+    _, outra = _carregar(tmp_path / "b.db")
+
+    assert gravadas == outra
+    assert gravadas["tbl_FINLancamentos"] == 500
+    assert gravadas["tbl_AccountsPayable"] == 100
+    assert 0 < gravadas["tbl_AccountsPayablePayment"] <= 100
+
+    lancamentos = gerador.tabelas["tbl_FINLancamentos"]
+    consulta = select(lancamentos).order_by(lancamentos.c.CodLancamento)
+    with gerador.engine.connect() as a, criar_engine(f"sqlite:///{tmp_path / 'b.db'}").connect() as b:
+        assert a.execute(consulta).all() == b.execute(consulta).all()
+        futuros = a.execute(
+            select(func.count()).select_from(lancamentos).where(
+                lancamentos.c.Data > date(2025, 6, 30), lancamentos.c.FlgConfirmacao == True
+            )
+        ).scalar()
+    assert futuros == 0
+
+
+def test_refuses_to_load_into_populated_tables(tmp_path):
+    """Sem --limpar a carga não mistura dados com registros existentes"""
+    gerador, _ = _carregar(tmp_path / "a.db")
+    with pytest.raises(SystemExit):
+        gerador.executar()
+    assert gerador.executar(limpar=True)["tbl_FINLancamentos"] == 500
@@ -0,0 +1,133 @@
+"""
+Tests for per-table version counters and conditional GETs (ETag/Last-Modified)
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.core.database import Base, get_db
+from app.core.security import HashUtil
+from app.core.access_control import access_backend
+from app.models import Banco, Conta, Empresa, TblFuncionarios, VersaoTabela
+from app.services.versao_service import VersaoService, nao_modificado, registrar_versionamento
+
+TABELAS = [Empresa.__table__, Banco.__table__, Conta.__table__, TblFuncionarios.__table__, VersaoTabela.__table__]
+
+
+@pytest.fixture
+def session_factory():
+    """Fábrica de sessões com versionamento, sobre um banco em memória compartilhado"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=TABELAS)
+    fabrica = sessionmaker(bind=engine)
+    registrar_versionamento(fabrica)
+    return fabrica
+
+
+def _versoes(fabrica):
+    with fabrica() as db:
+        return {linha.Tabela: linha.Versao for linha in db.query(VersaoTabela)}
+
+
+def test_commits_bump_changed_tables(session_factory):
+    """ORM e UPDATE em lote incrementam a versão no commit; rollback não"""
+    with session_factory() as db:
+        db.add(Banco(Codigo=1, Nome="Banco A"))
+        db.commit()
+        assert _versoes(session_factory) == {"tbl_Banco": 1}
+
+        db.get(Banco, 1).Nome = "Banco B"
+        db.commit()
+        db.execute(update(Banco).values(Digito="0"))
+        db.commit()
+        assert _versoes(session_factory) == {"tbl_Banco": 3}
+
+        db.add(Banco(Codigo=2, Nome="Descartado"))
+        db.flush()
+        db.rollback()
+        db.query(Banco).all()
+        db.commit()
+        assert _versoes(session_factory) == {"tbl_Banco": 3}
+
+
+def test_validators_follow_versions(session_factory):
+    """O ETag muda com a versão de qualquer tabela do conjunto e com o dia"""
+    with session_factory() as db:
+        service = VersaoService(db)
+        etag, ultima = service.validadores(["tbl_Banco", "tbl_Funcionarios"])
+        assert etag.startswith('W/"') and ultima.tzinfo is not None
+        assert service.validadores(["tbl_Banco", "tbl_Funcionarios"])[0] == etag
+        assert service.validadores(["tbl_Banco"], hoje=datetime(2020, 1, 1).date())[0] != service.validadores(["tbl_Banco"])[0]
+
+        service.incrementar(["tbl_Funcionarios"])
+        db.commit()
+        assert service.validadores(["tbl_Banco", "tbl_Funcionarios"])[0] != etag
+
+
+def test_not_modified_rules():
+    """If-None-Match usa comparação fraca e tem precedência sobre If-Modified-Since"""
+    alteracao = datetime(2025, 6, 30, 12, 0, 0, 500, tzinfo=timezone.utc)
+    assert nao_modificado('W/"abc"', alteracao, '"abc"', None)
+    assert nao_modificado('W/"abc"', alteracao, '"x", W/"abc"', None)
+    assert nao_modificado('W/"abc"', alteracao, "*", None)
+    assert not nao_modificado('W/"abc"', alteracao, '"x"', format_datetime(alteracao, usegmt=True))
+
+    assert nao_modificado('W/"abc"', alteracao, None, format_datetime(alteracao, usegmt=True))
+    assert not nao_modificado('W/"abc"', alteracao, None, "Mon, 30 Jun 2025 11:59:59 GMT")
+    assert not nao_modificado('W/"abc"', alteracao, None, "ontem")
+
+
+def test_conditional_get_returns_304_until_write(session_factory):
+    """Repetir a leitura com o ETag devolve 304 sem corpo; depois de uma escrita, 200"""
+    with session_factory() as db:
+        db.add(TblFuncionarios(
+            CodFuncionario=7, Login="teste", Nome="Teste", Senha=HashUtil.gera_hash("segredo"),
+            DatCadastro=datetime(2024, 1, 1), NomUsuario="teste"
+        ))
+        db.commit()
+
+    def _get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    access_backend.clear()
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        client = TestClient(app)
+        token = client.post("/api/v1/auth/login", json={"login": "teste", "senha": "segredo"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = client.get("/api/v1/bancos/", headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        response = client.get("/api/v1/bancos/", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+        # A requisição condicional continua exigindo autenticação
+        assert client.get("/api/v1/bancos/", headers={"If-None-Match": etag}).status_code in (401, 403)
+
+        with session_factory() as db:
+            db.add(Banco(Codigo=1, Nome="Banco A"))
+            db.commit()
+            db.delete(db.get(Banco, 1))
+            db.commit()
+
+        response = client.get("/api/v1/bancos/", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        access_backend.clear()
@@ -0,0 +1,3 @@
+"""
+Ferramentas de linha de comando para massa de dados, benchmarks e testes de carga
+"""
@@ -0,0 +1,351 @@
+"""
+Benchmark dos endpoints e serviços mais usados, com histórico e baseline
+
+Cada caso é executado em processo (TestClient ou chamada direta ao serviço)
+contra um banco gerado por tools.synthetic_data, sem rede. Para cada caso
+são medidos os percentis de latência (p50/p95/p99), as consultas SQL por
+execução e o pico de memória alocada (tracemalloc, em execuções separadas
+para não distorcer a latência).
+
+Uso (a partir de src/backend, com DATABASE_URI apontando para a massa):
+
+    python -m tools.benchmark --senha carga123
+    python -m tools.benchmark --casos "dashboard_*" --iteracoes 50
+    python -m tools.benchmark --salvar-baseline benchmark_baseline.json
+    python -m tools.benchmark --baseline benchmark_baseline.json --limite-latencia 15
+
+Cada execução é acrescentada ao arquivo de histórico. Com --baseline, o
+processo termina com código 1 se algum caso piorar além dos limites.
+"""
+import argparse
+import fnmatch
+import json
+import statistics
+import subprocess
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.lancamento import Lancamento
+from tools.synthetic_data import LOGIN_CARGA
+
+API = settings.API_V1_STR
+
+
+@dataclass
+class Contexto:
+    """Recursos compartilhados pelos casos de uma execução"""
+    client: Any
+    headers: Dict[str, str]
+    session_factory: Callable[[], Session]
+    data_base: date
+    senha: str
+
+
+@dataclass
+class Caso:
+    """Operação medida: recebe o contexto e executa uma vez"""
+    nome: str
+    executar: Callable[[Contexto], Any]
+
+
+def _get(caminho: str) -> Callable[[Contexto], Any]:
+    def executar(ctx: Contexto):
+        response = ctx.client.get(f"{API}{caminho.format(data_base=ctx.data_base)}", headers=ctx.headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {caminho}: HTTP {response.status_code} {response.text[:200]}")
+        return response
+    return executar
+
+
+def _servico(chamada: Callable[[Session, date], Any]) -> Callable[[Contexto], Any]:
+    def executar(ctx: Contexto):
+        db = ctx.session_factory()
+        try:
+            return chamada(db, ctx.data_base)
+        finally:
+            db.close()
+    return executar
+
+
+def _login(ctx: Contexto):
+    response = ctx.client.post(f"{API}/auth/login", json={"login": LOGIN_CARGA, "senha": ctx.senha})
+    if response.status_code != 200:
+        raise RuntimeError(f"Login: HTTP {response.status_code} {response.text[:200]}")
+    return response
+
+
+def casos_padrao() -> List[Caso]:
+    """Endpoints e métodos de serviço medidos por padrão"""
+    from app.services.dashboard_service import DashboardService
+    from app.services.lancamento_service import LancamentoService
+    from app.services.saldo_service import SaldoService
+    from app.services.autocomplete_service import AutocompleteService
+    from app.services.dre_service import DREService
+
+    return [
+        Caso("auth_login", _login),
+        Caso("lancamentos_lista", _get("/lancamentos/?skip=0&limit=100")),
+        Caso("lancamentos_pagina_profunda", _get("/lancamentos/?skip=20000&limit=100")),
+        Caso("lancamentos_dia", _get("/lancamentos/dia?data={data_base}")),
+        Caso("contas_pagar_lista", _get("/contas-pagar/?limit=100")),
+        Caso("contas_receber_lista", _get("/contas-receber/?limit=100")),
+        Caso("autocomplete_favorecidos", _get("/autocomplete/favorecidos?q=Silva")),
+        Caso("favorecidos_busca", _get("/favorecidos/search?search=Silva")),
+        Caso("clientes_busca", _get("/clientes/search?search=Costa")),
+        Caso("dashboard_resumo", _get("/dashboard/resumo")),
+        Caso("dashboard_fluxo_caixa", _get("/dashboard/fluxo-caixa")),
+        Caso("dashboard_previsao", _get("/dashboard/fluxo-caixa/previsao?data_base={data_base}")),
+        Caso("dashboard_categorias", _get("/dashboard/categorias")),
+        Caso("dashboard_aging", _get("/dashboard/aging?data_base={data_base}")),
+        Caso("dashboard_favorecidos", _get("/dashboard/favorecidos")),
+        Caso("servico_resumo_financeiro", _servico(lambda db, _: DashboardService(db).get_financial_summary())),
+        Caso("servico_lancamentos_paginados", _servico(
+            lambda db, _: LancamentoService(db).list_lancamentos_paginated(skip=0, limit=100)
+        )),
+        Caso("servico_aging", _servico(
+            lambda db, data_base: DashboardService(db).get_aging_report("receber", data_base=data_base)
+        )),
+        Caso("servico_saldo_historico", _servico(
+            lambda db, data_base: SaldoService(db).get_historico(1, data_base - timedelta(days=90), data_base)
+        )),
+        Caso("servico_autocomplete", _servico(lambda db, _: AutocompleteService(db).search("favorecidos", "Sil", 10))),
+        Caso("servico_dre_ano", _servico(
+            lambda db, data_base: DREService(db).relatorio(
+                (data_base.year - 1, data_base.month), (data_base.year, data_base.month), hoje=data_base
+            )
+        )),
+    ]
+
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * percentil / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+class ContadorConsultas:
+    """Conta os comandos SQL enviados pelo engine"""
+
+    def __init__(self, engine):
+        self.total = 0
+        event.listen(engine, "before_cursor_execute", self._contar)
+
+    def _contar(self, *args, **kwargs):
+        self.total += 1
+
+
+def medir(caso: Caso, ctx: Contexto, contador: ContadorConsultas, iteracoes: int, aquecimento: int, amostras_memoria: int) -> Dict:
+    """Executa o caso e retorna as métricas (latência em ms, consultas e KB alocados por execução)"""
+    for _ in range(aquecimento):
+        caso.executar(ctx)
+
+    tempos = []
+    consultas = []
+    for _ in range(iteracoes):
+        antes = contador.total
+        inicio = time.perf_counter()
+        caso.executar(ctx)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        consultas.append(contador.total - antes)
+
+    picos = []
+    for _ in range(amostras_memoria):
+        tracemalloc.start()
+        try:
+            caso.executar(ctx)
+            picos.append(tracemalloc.get_traced_memory()[1] / 1024)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "iteracoes": iteracoes,
+        "p50_ms": round(_percentil(tempos, 50), 3),
+        "p95_ms": round(_percentil(tempos, 95), 3),
+        "p99_ms": round(_percentil(tempos, 99), 3),
+        "media_ms": round(statistics.mean(tempos), 3),
+        "consultas": statistics.median(consultas),
+        "alocacao_kb": round(statistics.median(picos), 1) if picos else None,
+    }
+
+
+def comparar(
+    atual: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    limite_latencia: float = 20.0,
+    limite_consultas: int = 0,
+    limite_alocacao: float = 25.0,
+    tolerancia_ms: float = 1.0
+) -> List[str]:
+    """
+    Regressões dos casos em relação à baseline.
+
+    Latência (p95) e alocação são comparadas em percentual; diferenças de
+    latência menores que tolerancia_ms são ignoradas (ruído). Consultas por
+    execução são comparadas em valor absoluto.
+    """
+    regressoes = []
+    for nome, metricas in atual.items():
+        base = baseline.get(nome)
+        if "erro" in metricas:
+            if base and "erro" not in base:
+                regressoes.append(f"{nome}: {metricas['erro'][:100]}")
+            continue
+        if not base or "erro" in base:
+            continue
+
+        p95, p95_base = metricas["p95_ms"], base["p95_ms"]
+        if p95 - p95_base > tolerancia_ms and p95 > p95_base * (1 + limite_latencia / 100):
+            regressoes.append(f"{nome}: p95 {p95_base:.1f}ms -> {p95:.1f}ms")
+
+        if metricas["consultas"] > base["consultas"] + limite_consultas:
+            regressoes.append(f"{nome}: consultas {base['consultas']} -> {metricas['consultas']}")
+
+        alocacao, alocacao_base = metricas.get("alocacao_kb"), base.get("alocacao_kb")
+        if alocacao and alocacao_base and alocacao > alocacao_base * (1 + limite_alocacao / 100):
+            regressoes.append(f"{nome}: alocação {alocacao_base:.0f}KB -> {alocacao:.0f}KB")
+    return regressoes
+
+
+def _versao() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar(
+    url: str,
+    senha: str,
+    filtros: Optional[List[str]] = None,
+    iteracoes: int = 30,
+    aquecimento: int = 2,
+    amostras_memoria: int = 3,
+    data_base: Optional[date] = None,
+    casos: Optional[List[Caso]] = None
+) -> Dict:
+    """Executa os casos selecionados e retorna o registro da execução"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.core.database import get_db
+
+    engine = create_engine(url)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    contador = ContadorConsultas(engine)
+
+    def _get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    casos = casos if casos is not None else casos_padrao()
+    if filtros:
+        casos = [caso for caso in casos if any(fnmatch.fnmatch(caso.nome, filtro) for filtro in filtros)]
+
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        client = TestClient(app, raise_server_exceptions=False)
+        if data_base is None:
+            with session_factory() as db:
+                data_base = db.execute(
+                    select(func.max(Lancamento.Data)).where(Lancamento.flg_confirmacao == True)
+                ).scalar() or date.today()
+
+        ctx = Contexto(client=client, headers={}, session_factory=session_factory, data_base=data_base, senha=senha)
+        token = _login(ctx).json()["access_token"]
+        ctx.headers = {"Authorization": f"Bearer {token}"}
+
+        resultados = {}
+        for caso in casos:
+            try:
+                metricas = medir(caso, ctx, contador, iteracoes, aquecimento, amostras_memoria)
+            except Exception as e:
+                # Um caso com erro não interrompe os demais; fica registrado no histórico
+                resultados[caso.nome] = {"erro": str(e)[:500]}
+                print(f"{caso.nome:32} ERRO: {str(e)[:150]}")
+                continue
+            resultados[caso.nome] = metricas
+            print(
+                f"{caso.nome:32} p50 {metricas['p50_ms']:9.2f}ms  p95 {metricas['p95_ms']:9.2f}ms  "
+                f"p99 {metricas['p99_ms']:9.2f}ms  consultas {metricas['consultas']:5}  "
+                f"alocação {metricas['alocacao_kb'] or 0:9.0f}KB"
+            )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "versao": _versao(),
+        "banco": engine.url.render_as_string(hide_password=True),
+        "data_base": data_base.isoformat(),
+        "iteracoes": iteracoes,
+        "casos": resultados,
+    }
+
+
+def _ler_json(caminho: Path, padrao):
+    return json.loads(caminho.read_text(encoding="utf-8")) if caminho.exists() else padrao
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark dos endpoints e serviços com histórico e baseline")
+    parser.add_argument("--url", default=settings.DATABASE_URI, help="URL do banco com a massa sintética (padrão: DATABASE_URI)")
+    parser.add_argument("--senha", default="carga123", help=f"Senha do usuário '{LOGIN_CARGA}'")
+    parser.add_argument("--casos", nargs="*", help="Padrões dos casos a executar (ex.: 'dashboard_*')")
+    parser.add_argument("--iteracoes", type=int, default=30, help="Execuções medidas por caso")
+    parser.add_argument("--aquecimento", type=int, default=2, help="Execuções descartadas por caso")
+    parser.add_argument("--amostras-memoria", type=int, default=3, help="Execuções com tracemalloc por caso (0 desativa)")
+    parser.add_argument("--data-base", type=date.fromisoformat, default=None, help="Data de referência (padrão: último lançamento confirmado)")
+    parser.add_argument("--historico", type=Path, default=Path("benchmark_historico.json"), help="Arquivo de histórico")
+    parser.add_argument("--baseline", type=Path, help="Execução de referência para detectar regressões")
+    parser.add_argument("--salvar-baseline", type=Path, help="Gravar esta execução como baseline")
+    parser.add_argument("--limite-latencia", type=float, default=20.0, help="Aumento máximo do p95, em %%")
+    parser.add_argument("--limite-consultas", type=int, default=0, help="Aumento máximo de consultas por execução")
+    parser.add_argument("--limite-alocacao", type=float, default=25.0, help="Aumento máximo da memória alocada, em %%")
+    parser.add_argument("--tolerancia-ms", type=float, default=1.0, help="Diferença de p95 ignorada como ruído")
+    args = parser.parse_args(argv)
+
+    registro = executar(
+        args.url, args.senha, args.casos, args.iteracoes, args.aquecimento, args.amostras_memoria, args.data_base
+    )
+
+    historico = _ler_json(args.historico, [])
+    historico.append(registro)
+    args.historico.write_text(json.dumps(historico, indent=2, ensure_ascii=False), encoding="utf-8")
+    if args.salvar_baseline:
+        args.salvar_baseline.write_text(json.dumps(registro, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.baseline:
+        baseline = _ler_json(args.baseline, None)
+        if baseline is None:
+            print(f"Baseline {args.baseline} não encontrada")
+            return 1
+        regressoes = comparar(
+            registro["casos"], baseline["casos"],
+            args.limite_latencia, args.limite_consultas, args.limite_alocacao, args.tolerancia_ms
+        )
+        if regressoes:
+            print("\nRegressões em relação à baseline:")
+            for regressao in regressoes:
+                print(f"  {regressao}")
+            return 1
+        print("\nSem regressões em relação à baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,406 @@
+"""
+Teste de carga com sessões simuladas de usuários do financeiro
+
+Cada usuário virtual faz login em /auth/login e passa a disparar uma mistura
+de operações típicas do dia (abrir o dashboard, lançamentos do dia, listas
+paginadas, buscas, confirmações e pagamentos) contra um servidor em execução,
+com a massa gerada por tools.synthetic_data.
+
+A carga é aberta: as requisições são agendadas a uma taxa fixa (--rps),
+independente do tempo de resposta, e a latência é medida a partir do
+instante agendado. Assim a fila formada quando o servidor não acompanha a
+taxa aparece nos percentis, em vez de reduzir a carga gerada.
+
+Uso (a partir de src/backend, com o servidor em execução):
+
+    uvicorn app.main:app --port 8000
+    python -m tools.load_test --rps 50 --duracao 60 --usuarios 20
+    python -m tools.load_test --rps 200 --somente-leitura --saida carga.json
+    python -m tools.load_test --mix dashboard=1 lancamentos_dia=3
+
+As operações de escrita alteram a massa: confirmações alternam o status de
+lançamentos pendentes e pagamentos registram baixas parciais de contas a
+pagar em aberto.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from tools.benchmark import _percentil
+from tools.synthetic_data import LOGIN_CARGA, NOMES
+
+API = settings.API_V1_STR
+
+
+class ErroRequisicao(Exception):
+    """Resposta com status de erro em uma operação"""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.status_code = response.status_code
+
+
+@dataclass
+class Massa:
+    """Registros da massa usados pelas operações, descobertos no início da execução"""
+    data_base: date
+    total_lancamentos: int = 0
+    pendentes: Dict[int, bool] = field(default_factory=dict)  # lançamento -> confirmado
+    titulos: Dict[int, float] = field(default_factory=dict)   # conta a pagar -> saldo em aberto
+
+
+@dataclass
+class Sessao:
+    """Usuário virtual: cliente HTTP, token e gerador aleatório próprios"""
+    client: httpx.AsyncClient
+    headers: Dict[str, str]
+    massa: Massa
+    rng: random.Random
+
+    async def get(self, caminho: str, **params) -> httpx.Response:
+        return _verificar(await self.client.get(f"{API}{caminho}", params=params, headers=self.headers))
+
+
+@dataclass
+class Acao:
+    """Operação da mistura: peso relativo e corrotina executada por uma sessão"""
+    nome: str
+    peso: float
+    executar: Callable[[Sessao], Awaitable[None]]
+    escrita: bool = False
+
+
+def _verificar(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 400:
+        raise ErroRequisicao(response)
+    return response
+
+
+async def _dashboard(sessao: Sessao):
+    # A tela inicial dispara os painéis em paralelo; a operação termina com o último
+    await asyncio.gather(
+        sessao.get("/dashboard/resumo"),
+        sessao.get("/dashboard/fluxo-caixa"),
+        sessao.get("/dashboard/categorias"),
+        sessao.get("/dashboard/vencimentos"),
+        sessao.get("/dashboard/favorecidos"),
+    )
+
+
+async def _lancamentos_dia(sessao: Sessao):
+    await sessao.get("/lancamentos/dia", data=sessao.massa.data_base.isoformat())
+
+
+async def _lancamentos_lista(sessao: Sessao):
+    # Usuários navegam sobretudo pelas primeiras páginas
+    pagina = min(int(sessao.rng.expovariate(0.5)), max(sessao.massa.total_lancamentos // 100 - 1, 0))
+    await sessao.get("/lancamentos/", skip=pagina * 100, limit=100)
+
+
+async def _contas_pagar(sessao: Sessao):
+    await sessao.get("/contas-pagar/", status="A", limit=100)
+
+
+async def _contas_receber(sessao: Sessao):
+    await sessao.get("/contas-receber/", limit=100)
+
+
+async def _busca(sessao: Sessao):
+    # Autocomplete: uma requisição por letra digitada, a partir da segunda
+    nome = sessao.rng.choice(NOMES)
+    entidade = sessao.rng.choice(["favorecidos", "clientes"])
+    for tamanho in range(2, min(len(nome), 4) + 1):
+        await sessao.get(f"/autocomplete/{entidade}", q=nome[:tamanho])
+
+
+async def _filtro_opcoes(sessao: Sessao):
+    await sessao.get("/lancamentos/filtro-opcoes")
+
+
+async def _confirmar(sessao: Sessao):
+    pendentes = sessao.massa.pendentes
+    if not pendentes:
+        return
+    lancamento_id = sessao.rng.choice(list(pendentes))
+    confirmar = not pendentes[lancamento_id]
+    _verificar(await sessao.client.patch(
+        f"{API}/lancamentos/{lancamento_id}/confirmar", json={"confirmar": confirmar}, headers=sessao.headers
+    ))
+    pendentes[lancamento_id] = confirmar
+
+
+async def _pagar(sessao: Sessao):
+    titulos = sessao.massa.titulos
+    if not titulos:
+        return
+    titulo_id = sessao.rng.choice(list(titulos))
+    valor = round(min(titulos[titulo_id], sessao.rng.uniform(10, 200)), 2)
+    if titulos[titulo_id] - valor < 0.01:
+        titulos.pop(titulo_id)
+    else:
+        titulos[titulo_id] -= valor
+    _verificar(await sessao.client.post(
+        f"{API}/contas-pagar/{titulo_id}/pagar",
+        json={
+            "CodAccountsPayable": titulo_id,
+            "DataPagamento": f"{sessao.massa.data_base.isoformat()}T00:00:00",
+            "ValorPago": valor,
+        },
+        headers=sessao.headers
+    ))
+
+
+def acoes_padrao() -> List[Acao]:
+    """Mistura padrão de operações, com pesos relativos"""
+    return [
+        Acao("dashboard", 10, _dashboard),
+        Acao("lancamentos_dia", 20, _lancamentos_dia),
+        Acao("lancamentos_lista", 20, _lancamentos_lista),
+        Acao("contas_pagar", 10, _contas_pagar),
+        Acao("contas_receber", 5, _contas_receber),
+        Acao("busca", 15, _busca),
+        Acao("filtro_opcoes", 5, _filtro_opcoes),
+        Acao("confirmar", 10, _confirmar, escrita=True),
+        Acao("pagar", 5, _pagar, escrita=True),
+    ]
+
+
+class Coletor:
+    """Latências, erros e status por operação"""
+
+    def __init__(self):
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.erros: Dict[str, Counter] = defaultdict(Counter)
+        self.descartadas = 0
+
+    def registrar(self, nome: str, latencia_ms: float, erro: Optional[str] = None):
+        self.latencias[nome].append(latencia_ms)
+        if erro:
+            self.erros[nome][erro] += 1
+
+    def resumo(self, duracao: float) -> Dict:
+        """Vazão, taxa de erro e percentis (ms) por operação e no total"""
+        def _metricas(latencias: List[float], erros: Counter) -> Dict:
+            total = len(latencias)
+            falhas = sum(erros.values())
+            metricas = {
+                "requisicoes": total,
+                "erros": falhas,
+                "taxa_erro": round(falhas / total, 4) if total else 0.0,
+                "vazao_rps": round(total / duracao, 2) if duracao else 0.0,
+            }
+            if latencias:
+                metricas.update({
+                    "p50_ms": round(_percentil(latencias, 50), 2),
+                    "p95_ms": round(_percentil(latencias, 95), 2),
+                    "p99_ms": round(_percentil(latencias, 99), 2),
+                    "max_ms": round(max(latencias), 2),
+                })
+            if erros:
+                metricas["status"] = dict(erros)
+            return metricas
+
+        todas = [latencia for latencias in self.latencias.values() for latencia in latencias]
+        todos_erros = sum(self.erros.values(), Counter())
+        return {
+            "total": {**_metricas(todas, todos_erros), "descartadas": self.descartadas},
+            "acoes": {nome: _metricas(self.latencias[nome], self.erros[nome]) for nome in sorted(self.latencias)},
+        }
+
+
+async def _login(client: httpx.AsyncClient, login: str, senha: str) -> Dict[str, str]:
+    response = await client.post(f"{API}/auth/login", json={"login": login, "senha": senha})
+    if response.status_code != 200:
+        raise SystemExit(f"Login de '{login}' falhou: HTTP {response.status_code} {response.text[:200]}")
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _descobrir_massa(client: httpx.AsyncClient, headers: Dict[str, str], data_base: Optional[date]) -> Massa:
+    """Data do último lançamento confirmado, lançamentos pendentes e contas a pagar em aberto"""
+    async def _get(caminho: str, **params):
+        return _verificar(await client.get(f"{API}{caminho}", params=params, headers=headers)).json()
+
+    recentes = await _get("/lancamentos/", limit=1, order_by="data_desc", confirmado="true")
+    if data_base is None:
+        data_base = date.fromisoformat(recentes["data"][0]["Data"][:10]) if recentes["data"] else date.today()
+    massa = Massa(data_base=data_base, total_lancamentos=(await _get("/lancamentos/", limit=1))["total"])
+
+    pendentes = await _get("/lancamentos/", limit=500, confirmado="false")
+    massa.pendentes = {item["CodLancamento"]: False for item in pendentes["data"]}
+    for titulo in await _get("/contas-pagar/", status="A", limit=500):
+        saldo = float(titulo["Valor"]) - float(titulo["ValorPago"] or 0)
+        if saldo >= 0.01:
+            massa.titulos[titulo["CodAccountsPayable"]] = saldo
+    return massa
+
+
+async def _executar_acao(acao: Acao, sessao: Sessao, agendado: float, coletor: Coletor, registrar: bool):
+    erro = None
+    try:
+        await acao.executar(sessao)
+    except ErroRequisicao as e:
+        erro = str(e.status_code)
+    except httpx.HTTPError as e:
+        erro = type(e).__name__
+    if registrar:
+        coletor.registrar(acao.nome, (time.perf_counter() - agendado) * 1000, erro)
+
+
+async def executar_carga(
+    base_url: str,
+    senha: str,
+    rps: float = 20.0,
+    duracao: float = 30.0,
+    aquecimento: float = 5.0,
+    usuarios: int = 10,
+    max_em_voo: int = 200,
+    acoes: Optional[List[Acao]] = None,
+    semente: int = 42,
+    timeout: float = 30.0,
+    data_base: Optional[date] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    login: str = LOGIN_CARGA
+) -> Dict:
+    """
+    Executa a carga e retorna o resumo da execução.
+
+    Requisições agendadas quando já há max_em_voo em andamento não são
+    enviadas e contam como descartadas: indicam que o servidor não sustenta
+    a taxa pedida. O período de aquecimento não entra nas métricas.
+    """
+    acoes = acoes if acoes is not None else acoes_padrao()
+    rng = random.Random(semente)
+    coletor = Coletor()
+    limites = httpx.Limits(max_connections=max_em_voo, max_keepalive_connections=max_em_voo)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limites, transport=transport) as client:
+        cabecalhos = [await _login(client, login, senha) for _ in range(usuarios)]
+        massa = await _descobrir_massa(client, cabecalhos[0], data_base)
+        sessoes = [
+            Sessao(client=client, headers=headers, massa=massa, rng=random.Random(rng.random()))
+            for headers in cabecalhos
+        ]
+
+        pesos = [acao.peso for acao in acoes]
+        intervalo = 1.0 / rps
+        inicio = time.perf_counter()
+        inicio_medicao = inicio + aquecimento
+        total = int((aquecimento + duracao) * rps)
+        em_voo = set()
+
+        for indice in range(total):
+            agendado = inicio + indice * intervalo
+            espera = agendado - time.perf_counter()
+            if espera > 0:
+                await asyncio.sleep(espera)
+            registrar = agendado >= inicio_medicao
+            if len(em_voo) >= max_em_voo:
+                if registrar:
+                    coletor.descartadas += 1
+                continue
+
+            acao = rng.choices(acoes, weights=pesos)[0]
+            tarefa = asyncio.create_task(_executar_acao(acao, sessoes[indice % usuarios], agendado, coletor, registrar))
+            em_voo.add(tarefa)
+            tarefa.add_done_callback(em_voo.discard)
+
+        if em_voo:
+            await asyncio.gather(*em_voo)
+        duracao_real = max(time.perf_counter() - inicio_medicao, 0.0)
+
+    return {
+        "base_url": base_url,
+        "rps_alvo": rps,
+        "duracao_s": round(duracao_real, 2),
+        "usuarios": usuarios,
+        "data_base": massa.data_base.isoformat(),
+        **coletor.resumo(duracao_real),
+    }
+
+
+def _mix(argumentos: Optional[List[str]], somente_leitura: bool) -> List[Acao]:
+    acoes = acoes_padrao()
+    if argumentos:
+        pesos = {}
+        for argumento in argumentos:
+            nome, _, peso = argumento.partition("=")
+            pesos[nome] = float(peso or 1)
+        desconhecidas = set(pesos) - {acao.nome for acao in acoes}
+        if desconhecidas:
+            raise SystemExit(f"Operações desconhecidas: {', '.join(sorted(desconhecidas))}")
+        acoes = [Acao(acao.nome, pesos[acao.nome], acao.executar, acao.escrita) for acao in acoes if acao.nome in pesos]
+    if somente_leitura:
+        acoes = [acao for acao in acoes if not acao.escrita]
+    return acoes
+
+
+def _imprimir(resultado: Dict) -> None:
+    def _linha(nome: str, metricas: Dict) -> str:
+        return (
+            f"{nome:20} {metricas['requisicoes']:8} {metricas['vazao_rps']:9.1f} "
+            f"{metricas.get('p50_ms', 0):9.1f} {metricas.get('p95_ms', 0):9.1f} {metricas.get('p99_ms', 0):9.1f} "
+            f"{metricas['taxa_erro'] * 100:7.2f}%"
+        )
+
+    print(f"\n{'operação':20} {'req':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erros':>8}")
+    for nome, metricas in resultado["acoes"].items():
+        print(_linha(nome, metricas))
+    print(_linha("TOTAL", resultado["total"]))
+    if resultado["total"]["descartadas"]:
+        print(f"\n{resultado['total']['descartadas']} requisições descartadas: servidor não sustentou {resultado['rps_alvo']} req/s")
+    for nome, metricas in resultado["acoes"].items():
+        if metricas.get("status"):
+            print(f"{nome}: " + ", ".join(f"{status} x{total}" for status, total in metricas["status"].items()))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga com sessões simuladas de usuários do financeiro")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="URL base do servidor")
+    parser.add_argument("--login", default=LOGIN_CARGA, help="Login dos usuários virtuais")
+    parser.add_argument("--senha", default="carga123", help="Senha do login")
+    parser.add_argument("--rps", type=float, default=20.0, help="Taxa alvo de operações por segundo")
+    parser.add_argument("--duracao", type=float, default=30.0, help="Duração da medição, em segundos")
+    parser.add_argument("--aquecimento", type=float, default=5.0, help="Segundos iniciais fora das métricas")
+    parser.add_argument("--usuarios", type=int, default=10, help="Usuários virtuais (um login cada)")
+    parser.add_argument("--max-em-voo", type=int, default=200, help="Máximo de operações simultâneas")
+    parser.add_argument("--mix", nargs="*", help="Operações e pesos (ex.: dashboard=2 busca=5)")
+    parser.add_argument("--somente-leitura", action="store_true", help="Excluir confirmações e pagamentos")
+    parser.add_argument("--semente", type=int, default=42, help="Semente da sequência de operações")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Timeout por requisição, em segundos")
+    parser.add_argument("--data-base", type=date.fromisoformat, default=None, help="Data de referência (padrão: último lançamento confirmado)")
+    parser.add_argument("--saida", help="Gravar o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    resultado = asyncio.run(executar_carga(
+        args.url,
+        args.senha,
+        rps=args.rps,
+        duracao=args.duracao,
+        aquecimento=args.aquecimento,
+        usuarios=args.usuarios,
+        max_em_voo=args.max_em_voo,
+        acoes=_mix(args.mix, args.somente_leitura),
+        semente=args.semente,
+        timeout=args.timeout,
+        data_base=args.data_base,
+        login=args.login,
+    ))
+
+    _imprimir(resultado)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())